@@ -0,0 +1,55 @@
+"""Benchmark of the downsampling of the figures.
+
+Run with: python src/benchmarks/benchmark_downsampling.py
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from plotting.timeseries import TimeSeries  # noqa: E402
+
+
+if __name__ == "__main__":
+    # about 4 months of bars by minute
+    n_rows = 500_000
+    rng = np.random.default_rng(0)
+    index = pd.date_range(end="2023-09-01", periods=n_rows, freq="T")
+    pd_ts = pd.Series(100 + np.cumsum(rng.normal(0, 0.05, n_rows)), index=index)
+
+    print(f"{n_rows} bars")
+    for max_points, downsample in [
+        (None, "lttb"),
+        (5000, "lttb"),
+        (5000, "minmax"),
+        (2000, "lttb"),
+        (2000, "minmax"),
+    ]:
+
+        def build():
+            ts = TimeSeries(
+                pd_ts,
+                None,
+                "title",
+                "x",
+                "y",
+                "label",
+                "pound",
+                max_points=max_points,
+                downsample=downsample,
+            )
+            return ts, ts.fig.to_json()
+
+        seconds = min(timeit.repeat(build, number=1, repeat=3))
+        ts, _ = build()
+        size = ts.payload_size()
+        name = "full" if max_points is None else f"{downsample} {max_points}"
+        print(
+            f"{name:<12} {type(ts.fig.data[0]).__name__:<10} "
+            f"{size['points_drawn']:>7} points  {size['bytes'] / 1e6:6.2f} MB  "
+            f"{seconds:.3f}s"
+        )
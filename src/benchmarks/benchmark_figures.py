@@ -0,0 +1,93 @@
+"""Benchmark of the figures built per second.
+
+Run with: python src/benchmarks/benchmark_figures.py
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+import plotly.subplots as sp
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from plotting.cusum import Cusum  # noqa: E402
+from plotting.ewma import Ewma  # noqa: E402
+from plotting.figure_factory import default_layout, figures  # noqa: E402
+from plotting.shewhart import Shewhart  # noqa: E402
+from plotting.timeseries import TimeSeries  # noqa: E402
+
+
+def legacy_new(chart, y_format, title, xlab, ylab):
+    """Create a figure with its whole layout (previous implementation).
+
+    Each figure is built with make_subplots and its layout validated by plotly.
+
+    Args:
+        chart (str): type of chart: 'timeseries' or 'cusum'
+        y_format (str): format of the y axis: 'pct', 'pound','integer' or 'numeric'
+        title (str): Main title of plot
+        xlab (str): X-axis title
+        ylab (str): Y-axis title
+
+    Returns:
+        go.Figure: figure without traces
+    """
+    fig = sp.make_subplots(specs=[[{"secondary_y": True}]])
+    fig.update_layout(default_layout(chart, title, xlab, ylab))
+    if y_format == "pct":
+        fig.update_layout(yaxis_tickformat="~%")
+    elif y_format == "pound":
+        fig.update_layout(yaxis_tickprefix="£ ")
+    fig.update_layout(yaxis_tickformat="~s")
+    return fig
+
+
+def per_second(build):
+    """Get the number of figures built per second.
+
+    Args:
+        build (function): function building a figure
+
+    Returns:
+        float: figures built per second
+    """
+    number = 20
+    return number / min(timeit.repeat(build, number=number, repeat=3))
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    # dashboard: bars by minute, downsampled to 2000 points
+    live = pd.Series(
+        100 + np.cumsum(rng.normal(0, 0.05, 2000)),
+        index=pd.date_range(end="2023-09-01", periods=2000, freq="T"),
+    )
+    # report: daily history of a year
+    history = pd.Series(
+        100 + np.cumsum(rng.normal(0, 1, 250)),
+        index=pd.bdate_range(end="2023-09-01", periods=250),
+    )
+    args = ("title", "Date", "Price", "label", "pound")
+
+    charts = [
+        ("dashboard (TimeSeries, 2000 points)", [TimeSeries], live),
+        (
+            "report (Shewhart, EWMA and CUSUM, 250 days)",
+            [Shewhart, Ewma, Cusum],
+            history,
+        ),
+    ]
+    for title, classes, pd_ts in charts:
+        print(title)
+        for chart in classes:
+            # before: the figures are built as before the factory
+            figures.new = legacy_new
+            before = per_second(lambda: chart(pd_ts, None, *args).fig)
+            del figures.new
+            after = per_second(lambda: chart(pd_ts, None, *args).fig)
+            print(
+                f"  {chart.__name__:<10} before: {before:6.1f} figures/s  "
+                f"after: {after:6.1f} figures/s ({after / before:.1f}x)"
+            )
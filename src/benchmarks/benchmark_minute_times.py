@@ -0,0 +1,107 @@
+"""Benchmark of the loading of bars by minute, with their time columns.
+
+Run with: python src/benchmarks/benchmark_minute_times.py
+"""
+import os
+import sys
+import time
+import timeit
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from data.financial_data import FinancialData  # noqa: E402
+from data.providers import ReplayProvider, synthetic_bars  # noqa: E402
+
+
+def legacy_minute_times(live_data):
+    """Normalise the times of bars by minute, row by row (previous implementation).
+
+    Args:
+        live_data (pd.DataFrame): bars by minute, index dated
+
+    Returns:
+        pd.DataFrame: bars with the time columns
+    """
+    live_data["date_raw"] = pd.to_datetime(live_data.index)
+    live_data["date"] = live_data["date_raw"].dt.date
+    live_data["time"] = live_data["date_raw"].dt.time
+    live_data["second_full"] = (
+        live_data["date_raw"].dt.second
+        + live_data["date_raw"].dt.minute * 60
+        + live_data["date_raw"].dt.hour * 60 * 60
+    )
+
+    opening_time = live_data["time"].min()
+    closing_time = live_data["time"].max()
+
+    opening_time_secs = (
+        opening_time.hour * 3600 + opening_time.minute * 60 + opening_time.second
+    )
+    closing_time_secs = (
+        closing_time.hour * 3600 + closing_time.minute * 60 + closing_time.second
+    )
+
+    live_data["days_in_sec"] = live_data["date"].apply(
+        lambda x: time.mktime(x.timetuple())
+    )
+    live_data["corrected_second_full"] = (
+        np.floor(
+            (live_data["second_full"] - opening_time_secs)
+            / (closing_time_secs - opening_time_secs)
+            * 60
+            * 60
+            * 24
+        )
+        + live_data["days_in_sec"]
+    )
+    live_data["corrected_time"] = pd.to_datetime(
+        live_data["corrected_second_full"], unit="s"
+    )
+    return live_data
+
+
+def legacy_load_live(provider, name_company):
+    """Load the bars by minute with their time columns (previous implementation).
+
+    Args:
+        provider (DataProvider): provider of the data
+        name_company (str): name of the company
+
+    Returns:
+        pd.DataFrame: live data of company
+    """
+    live_data = legacy_minute_times(provider.get_live(name_company))
+    live_data["freq"] = live_data.index.to_period("T")
+    return live_data
+
+
+def load_live(provider, name_company):
+    """Load the bars by minute with their time columns.
+
+    Args:
+        provider (DataProvider): provider of the data
+        name_company (str): name of the company
+
+    Returns:
+        pd.DataFrame: live data of company
+    """
+    return FinancialData(name_company, provider=provider).live_data
+
+
+if __name__ == "__main__":
+    # about 1M bars: opening hours of 8:00 to 16:30, every minute of every business day
+    live = synthetic_bars(days=1957, freq="T")
+    provider = ReplayProvider(frames={"BENCH": {"info": {}, "live": live}})
+
+    legacy = min(
+        timeit.repeat(lambda: legacy_load_live(provider, "BENCH"), number=1, repeat=3)
+    )
+    vectorised = min(
+        timeit.repeat(lambda: load_live(provider, "BENCH"), number=1, repeat=3)
+    )
+    print(f"{len(live)} bars")
+    print(f"legacy:     {legacy:.3f}s")
+    print(f"vectorised: {vectorised:.3f}s ({legacy / vectorised:.0f}x faster)")
@@ -0,0 +1,303 @@
+import asyncio
+import threading
+
+import aiohttp
+import numpy as np
+import pandas as pd
+
+from .providers import DataProvider
+
+
+def parse_chart(result, interval):
+    """Parse a chart.
+
+    We convert a result of the Yahoo Finance chart API into bars, with the same columns
+    as yfinance: Ticker.history for daily bars and yf.download for bars by minute.
+
+    Args:
+        result (dict): result of the chart API
+        interval (str): '1d' or '1m'
+
+    Returns:
+        pd.DataFrame: bars, index dated in the time zone of the exchange
+    """
+    meta = result["meta"]
+    timestamps = result.get("timestamp", [])
+    quote = result["indicators"]["quote"][0] if timestamps else {}
+
+    index = pd.to_datetime(np.asarray(timestamps, dtype=np.int64), unit="s", utc=True)
+    index = index.tz_convert(meta.get("exchangeTimezoneName", "UTC"))
+    bars = pd.DataFrame(
+        {
+            column: np.asarray(quote.get(key, []), dtype=float)
+            for column, key in (
+                ("Open", "open"),
+                ("High", "high"),
+                ("Low", "low"),
+                ("Close", "close"),
+            )
+        },
+        index=index,
+    )
+    bars["Volume"] = np.asarray(quote.get("volume", []), dtype=float)
+
+    if interval == "1m":
+        bars.index.name = "Datetime"
+        bars.insert(4, "Adj Close", bars["Close"])
+        return bars.dropna(how="all")
+
+    # daily bars are adjusted for splits and dividends, like Ticker.history
+    bars.index = bars.index.normalize()
+    bars.index.name = "Date"
+    adjclose = result["indicators"].get("adjclose", [{}])[0].get("adjclose")
+    if adjclose is not None:
+        ratio = np.asarray(adjclose, dtype=float) / bars["Close"].to_numpy()
+        for column in ("Open", "High", "Low", "Close"):
+            bars[column] = bars[column] * ratio
+
+    events = result.get("events", {})
+    for column, key, field in (
+        ("Dividends", "dividends", "amount"),
+        ("Stock Splits", "splits", None),
+    ):
+        values = pd.Series(0.0, index=bars.index)
+        for event in events.get(key, {}).values():
+            date = pd.to_datetime(event["date"], unit="s", utc=True)
+            date = date.tz_convert(bars.index.tz).normalize()
+            if field is None:
+                value = event["numerator"] / event["denominator"]
+            else:
+                value = event[field]
+            if date in values.index:
+                values[date] = value
+        bars[column] = values
+    return bars.dropna(how="all", subset=["Open", "High", "Low", "Close"])
+
+
+class AsyncYahooProvider(DataProvider):
+    """Provider downloading the data from the Yahoo Finance chart API with asyncio.
+
+    All the calls share one HTTP session, with a pool of connections limited per host:
+    the session is kept in an event loop of the provider, running in its own thread, so the
+    connections are reused from one batch to the next. The information on a company is the
+    metadata of its chart. A company failing is reported in failures, without stopping the
+    others.
+    """
+
+    BASE_URL = "https://query2.finance.yahoo.com"
+    HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+    def __init__(self, base_url=BASE_URL, limit=64, limit_per_host=8, timeout=30):
+        """Initialisation.
+
+        Args:
+            base_url (str, optional): URL of the API, for example a local stub server. Defaults to BASE_URL.
+            limit (int, optional): maximum number of open connections. Defaults to 64.
+            limit_per_host (int, optional): maximum number of open connections to the same host. Defaults to 8.
+            timeout (int, optional): timeout of each call, in seconds. Defaults to 30.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.failures = {}
+        self._loop = None
+        self._session = None
+
+    def session(self):
+        """Create an HTTP session.
+
+        Returns:
+            aiohttp.ClientSession: session with a pool of connections
+        """
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.limit, limit_per_host=self.limit_per_host
+            ),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=self.HEADERS,
+        )
+
+    async def fetch_chart(
+        self, session, name_company, interval, start=None, period=None
+    ):
+        """Fetch a chart.
+
+        Args:
+            session (aiohttp.ClientSession): HTTP session
+            name_company (str): name of the company
+            interval (str): '1d' or '1m'
+            start (str, date or pd.Timestamp, optional): first date to download. Defaults to None (all bars available).
+            period (str, optional): period to download instead of a start date, for example '5d'. Defaults to None.
+
+        Returns:
+            dict: result of the chart API
+        """
+        params = {"interval": interval, "events": "div,splits"}
+        if period is not None:
+            params["range"] = period
+        elif start is None:
+            # the API gives at most 7 days of bars by minute
+            params["range"] = "max" if interval == "1d" else "7d"
+        else:
+            start = pd.Timestamp(start)
+            if start.tz is None:
+                start = start.tz_localize("UTC")
+            params["period1"] = str(int(start.timestamp()))
+            params["period2"] = str(int(pd.Timestamp.now(tz="UTC").timestamp()))
+
+        url = f"{self.base_url}/v8/finance/chart/{name_company}"
+        async with session.get(url, params=params) as response:
+            response.raise_for_status()
+            content = await response.json()
+        return content["chart"]["result"][0]
+
+    async def fetch_company(self, session, name_company, kinds, start=None):
+        """Fetch data of a company.
+
+        Args:
+            session (aiohttp.ClientSession): HTTP session
+            name_company (str): name of the company
+            kinds (list): data to fetch, among 'info', 'history' and 'live'
+            start (str, date or pd.Timestamp, optional): first date to download. Defaults to None.
+
+        Returns:
+            dict: data fetched, per kind
+        """
+        charts = {}
+        if "history" in kinds:
+            charts["1d"] = self.fetch_chart(session, name_company, "1d", start)
+        elif "info" in kinds:
+            # the information is in the metadata of any chart: we take a small one
+            charts["1d"] = self.fetch_chart(session, name_company, "1d", period="5d")
+        if "live" in kinds:
+            charts["1m"] = self.fetch_chart(session, name_company, "1m", start)
+        results = dict(zip(charts, await asyncio.gather(*charts.values())))
+
+        data = {}
+        if "info" in kinds:
+            data["info"] = results["1d"]["meta"]
+        if "history" in kinds:
+            data["history"] = parse_chart(results["1d"], "1d")
+        if "live" in kinds:
+            data["live"] = parse_chart(results["1m"], "1m")
+        return data
+
+    async def fetch_all(
+        self, names, kinds=("info", "history", "live"), start=None, session=None
+    ):
+        """Fetch data of several companies at once.
+
+        The companies failing are kept in failures, with their error.
+
+        Args:
+            names (list): names of the companies
+            kinds (tuple, optional): data to fetch. Defaults to ("info", "history", "live").
+            start (str, date or pd.Timestamp, optional): first date to download. Defaults to None.
+            session (aiohttp.ClientSession, optional): HTTP session. Defaults to None (a new session).
+
+        Returns:
+            dict: data fetched, per company fetched and per kind
+        """
+        if session is None:
+            async with self.session() as session:
+                return await self.fetch_all(names, kinds, start, session)
+
+        fetched = await asyncio.gather(
+            *[self.fetch_company(session, name, kinds, start) for name in names],
+            return_exceptions=True,
+        )
+        data, self.failures = {}, {}
+        for name, result in zip(names, fetched):
+            if isinstance(result, Exception):
+                self.failures[name] = f"{type(result).__name__}: {result}"
+            else:
+                data[name] = result
+        return data
+
+    async def _fetch_shared(self, names, kinds, start=None):
+        """Fetch data of several companies, with the session of the provider.
+
+        Args:
+            names (list): names of the companies
+            kinds (tuple): data to fetch
+            start (str, date or pd.Timestamp, optional): first date to download. Defaults to None.
+
+        Returns:
+            dict: data fetched, per company fetched and per kind
+        """
+        if self._session is None or self._session.closed:
+            self._session = self.session()
+        return await self.fetch_all(names, kinds, start, self._session)
+
+    def _run(self, coroutine):
+        """Run a coroutine from synchronous code, in the event loop of the provider.
+
+        Args:
+            coroutine (coroutine): coroutine to run
+
+        Returns:
+            object: result of the coroutine
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def close(self):
+        """Close the session and stop the event loop of the provider."""
+        if self._loop is None:
+            return
+        if self._session is not None:
+            self._run(self._session.close())
+            self._session = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _fetch_one(self, name_company, kinds, start=None):
+        """Fetch data of a company.
+
+        Args:
+            name_company (str): name of the company
+            kinds (tuple): data to fetch
+            start (str, date or pd.Timestamp, optional): first date to download. Defaults to None.
+
+        Returns:
+            dict: data fetched, per kind
+        """
+        fetched = self._run(self._fetch_shared([name_company], kinds, start))
+        if name_company not in fetched:
+            raise ValueError(
+                f"{name_company} could not be fetched ({self.failures[name_company]})"
+            )
+        return fetched[name_company]
+
+    def get_info(self, name_company):
+        return self._fetch_one(name_company, ("info",))["info"]
+
+    def get_history(self, name_company, start=None):
+        return self._fetch_one(name_company, ("history",), start)["history"]
+
+    def get_live(self, name_company, start=None):
+        return self._fetch_one(name_company, ("live",), start)["live"]
+
+    # max_workers is not used below: the calls are limited by limit_per_host
+    # the companies failing are missing from the results, and kept in failures
+
+    def get_infos(self, names, max_workers=None):
+        fetched = self._run(self._fetch_shared(names, ("info",)))
+        return {name: data["info"] for name, data in fetched.items()}
+
+    def get_histories(self, names, start=None, max_workers=None):
+        fetched = self._run(self._fetch_shared(names, ("history",), start))
+        return {name: data["history"] for name, data in fetched.items()}
+
+    def get_lives(self, names, start=None, max_workers=None):
+        fetched = self._run(self._fetch_shared(names, ("live",), start))
+        return {name: data["live"] for name, data in fetched.items()}
@@ -1,109 +1,418 @@
-import time
-
 import numpy as np
 import pandas as pd
 from datetime import datetime
-import yfinance as yf
 from tqdm import tqdm
 
+from .providers import YahooProvider
+
+SECONDS_IN_DAY = 24 * 60 * 60
+
+
+def normalise_minute_times(index, opening_hours=None):
+    """Normalise the times of bars by minute.
+
+    The opening hours of each day are stretched over the full day, so that the days
+    follow each other without gaps in the plots. All the computation is done on int64 arrays.
+
+    Args:
+        index (pd.DatetimeIndex): times of the bars, in the time zone of the exchange
+        opening_hours (tuple, optional): opening and closing times, in seconds since midnight.
+            Defaults to None (first and last times of the bars).
+
+    Returns:
+        dict: arrays 'second_full' (seconds since midnight), 'days_in_sec' (midnight in seconds since epoch),
+            'corrected_second_full' and 'corrected_time'
+    """
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        # we keep the wall time of the exchange
+        index = index.tz_localize(None)
+    seconds = index.asi8 // 10**9
+
+    second_full = seconds % SECONDS_IN_DAY
+    days_in_sec = seconds - second_full
+
+    if opening_hours is None:
+        opening_hours = (second_full.min(), second_full.max())
+    opening_time_secs, closing_time_secs = opening_hours
+    opening_duration = max(closing_time_secs - opening_time_secs, 1)
+
+    corrected_second_full = (
+        second_full - opening_time_secs
+    ) * SECONDS_IN_DAY // opening_duration + days_in_sec
+
+    return {
+        "second_full": second_full,
+        "days_in_sec": days_in_sec,
+        "corrected_second_full": corrected_second_full,
+        "corrected_time": corrected_second_full.astype("datetime64[s]"),
+    }
+
+
+def compact_bars(data):
+    """Compact bars.
+
+    We reduce the memory used by bars: prices in float32 and volumes in the smallest integer type.
+
+    Args:
+        data (pd.DataFrame): bars
+
+    Returns:
+        pd.DataFrame: compact bars
+    """
+    data = data.copy()
+    for column in data.columns:
+        if column == "Volume" and not data[column].isna().any():
+            data[column] = pd.to_numeric(data[column], downcast="integer")
+        elif data[column].dtype == np.float64:
+            data[column] = data[column].astype(np.float32)
+    return data
+
 
 class FinancialData:
     """Class for the financial data. One object contains all the details for a company."""
 
-    def __init__(self, name_company):
+    def __init__(
+        self,
+        name_company,
+        store=None,
+        provider=None,
+        compact=False,
+        info_cache=None,
+        minute_store=None,
+    ):
         """Initialisation.
 
         We initialise our data for a specific company name.
 
         Args:
             name_company (string): name of the company we will download
+            store (LocalStore, optional): local store of the bars. If given, only the bars
+                newer than the ones saved are downloaded. Defaults to None.
+            provider (DataProvider, optional): provider of the data. Defaults to None (YahooProvider).
+            compact (bool, optional): Choice if we keep the data in a compact layout: float32 prices,
+                integer volumes, categorical company and no time columns (see get_live_times).
+                Defaults to False.
+            info_cache (InfoCache, optional): cache of the information, shared between objects and runs.
+                Defaults to None.
+            minute_store (MinuteBarStore, optional): memory-mapped store where the bars by minute
+                downloaded are written, to be shared with other processes. Defaults to None.
         """
         self.name_company = name_company
-        self.ticker = yf.Ticker(self.name_company)
-        self.info = self.ticker.info
+        self.store = store
+        self.provider = YahooProvider() if provider is None else provider
+        self.compact = compact
+        self.info_cache = info_cache
+        self.minute_store = minute_store
+
+        # nothing is downloaded until it is used
+        self._info = None
+        self._history = None
+        self._live_data = None
+        # bars by minute appended by update_live_values, concatenated on next use
+        self._live_tail = []
+        self._opening_hours = None
+
+    @property
+    def info(self):
+        """Information on the company, downloaded on first use."""
+        if self._info is None and self.info_cache is not None:
+            self._info = self.info_cache.get(self.name_company)
+        if self._info is None:
+            self._info = self.provider.get_info(self.name_company)
+            if self.info_cache is not None:
+                self.info_cache.set(self.name_company, self._info)
+        return self._info
+
+    @property
+    def history(self):
+        """Daily history of the company, downloaded on first use."""
+        if self._history is None:
+            self._history = self._load_history()
+        return self._history
+
+    @property
+    def live_data(self):
+        """Bars by minute of the company, downloaded on first use."""
+        if self._live_data is None:
+            self._live_data = self._load_live()
+        if self._live_tail:
+            self._live_data = pd.concat([self._live_data, *self._live_tail])
+            self._live_tail = []
+        return self._live_data
+
+    def _load_history(self, new_data=None):
+        """Load history.
+
+        We download the daily history and add the company and frequency columns.
+
+        Args:
+            new_data (pd.DataFrame, optional): bars already downloaded. Defaults to None.
 
-        # get the historical data
-        history = self.ticker.history(period="max")
+        Returns:
+            pd.DataFrame: history of company
+        """
+        history = self._sync_history(new_data)
         history.index = pd.to_datetime(history.index)
+        if self.compact:
+            history = compact_bars(history)
+            history["Company"] = pd.Categorical([self.name_company] * len(history))
+            return history
+
         history["Company"] = self.name_company
         history["freq"] = history.index.to_period("D")
-        self.history = history
+        return history
+
+    def _load_live(self, new_data=None):
+        """Load live data.
 
-        # get the up to date data by minute
-        live_data = yf.download(tickers=self.name_company, period="max", interval="1m")
+        We download the bars by minute and add the time columns used by the plots.
+
+        Args:
+            new_data (pd.DataFrame, optional): bars already downloaded. Defaults to None.
+
+        Returns:
+            pd.DataFrame: live data of company
+        """
+        live_data = self._sync_live(new_data)
         if live_data.shape[0] > 0:
-            live_data["date_raw"] = pd.to_datetime(live_data.index)
-            live_data["date"] = live_data["date_raw"].dt.date
-            live_data["time"] = live_data["date_raw"].dt.time
-            live_data["second_full"] = (
-                live_data["date_raw"].dt.second
-                + live_data["date_raw"].dt.minute * 60
-                + live_data["date_raw"].dt.hour * 60 * 60
-            )
+            self._opening_hours = None
+            live_data = self._add_time_columns(live_data)
+        return live_data
 
-            opening_time = live_data["time"].min()
-            closing_time = live_data["time"].max()
+    def _add_time_columns(self, live_data, times=None):
+        """Add time columns.
 
-            print(opening_time)
+        We add the time columns used by the plots to bars by minute. The opening hours
+        found are kept, to process the next bars the same way.
 
-            opening_time_secs = (
-                opening_time.hour * 3600
-                + opening_time.minute * 60
-                + opening_time.second
-            )
-            closing_time_secs = (
-                closing_time.hour * 3600
-                + closing_time.minute * 60
-                + closing_time.second
-            )
+        Args:
+            live_data (pd.DataFrame): bars by minute
+            times (dict, optional): times already normalised. Defaults to None.
 
-            live_data["days_in_sec"] = live_data["date"].apply(
-                lambda x: time.mktime(x.timetuple())
-            )
-            live_data["corrected_second_full"] = (
-                np.floor(
-                    (live_data["second_full"] - opening_time_secs)
-                    / (closing_time_secs - opening_time_secs)
-                    * 60
-                    * 60
-                    * 24
-                )
-                + live_data["days_in_sec"]
+        Returns:
+            pd.DataFrame: bars by minute with the time columns
+        """
+        if times is None:
+            times = normalise_minute_times(live_data.index, self._opening_hours)
+        if self._opening_hours is None:
+            self._opening_hours = (
+                times["second_full"].min(),
+                times["second_full"].max(),
             )
-            live_data["corrected_time"] = pd.to_datetime(
-                live_data["corrected_second_full"], unit="s"
+        if self.compact:
+            return compact_bars(live_data)
+
+        # the day and time of day come from the int64 seconds: no Python objects per row
+        live_data["date"] = times["days_in_sec"].astype("datetime64[s]")
+        live_data["time"] = pd.to_timedelta(times["second_full"], unit="s")
+        for column, values in times.items():
+            live_data[column] = values
+        # give it a frequency by minute
+        live_data["freq"] = live_data.index.to_period("T")
+        return live_data
+
+    def get_live_times(self):
+        """Get time columns of live data.
+
+        We compute the time columns of the bars by minute, used by the plots.
+        In compact mode, they are not kept in live_data and are computed here on demand.
+
+        Returns:
+            pd.DataFrame: time columns, with the same index as live_data
+        """
+        live_data = self.live_data
+        times = normalise_minute_times(live_data.index, self._opening_hours)
+        return pd.DataFrame(times, index=live_data.index)
+
+    def memory_report(self):
+        """Get memory report.
+
+        We get the memory used by the data loaded.
+
+        Returns:
+            pd.DataFrame: rows, columns and bytes used by history and live_data
+        """
+        report = {}
+        live_data = None if self._live_data is None else self.live_data
+        for name, data in (("history", self._history), ("live_data", live_data)):
+            if data is not None:
+                report[name] = {
+                    "rows": data.shape[0],
+                    "columns": data.shape[1],
+                    "bytes": data.memory_usage(deep=True).sum(),
+                }
+        return pd.DataFrame.from_dict(
+            report, orient="index", columns=["rows", "columns", "bytes"]
+        )
+
+    def _sync_history(self, new_data=None):
+        """Synchronise history.
+
+        We download the daily history. With a store, we only download the bars from
+        the latest one saved and append them to the store.
+
+        Args:
+            new_data (pd.DataFrame, optional): bars already downloaded. Defaults to None.
+
+        Returns:
+            pd.DataFrame: full daily history
+        """
+        if new_data is not None:
+            if self.store is None:
+                return new_data
+            self.store.append(self.name_company, "1d", new_data)
+            return self.store.load(self.name_company, "1d")
+
+        if self.store is None:
+            return self.provider.get_history(self.name_company)
+
+        last_saved = self.store.last_timestamp(self.name_company, "1d")
+        if last_saved is None:
+            new_data = self.provider.get_history(self.name_company)
+        else:
+            # the latest bar saved is downloaded again, as it may have changed since
+            new_data = self.provider.get_history(
+                self.name_company, start=last_saved.date()
             )
-            # give it a frequency by minute
-            live_data["freq"] = live_data.index.to_period("T")
-        self.live_data = live_data
+        self.store.append(self.name_company, "1d", new_data)
+        return self.store.load(self.name_company, "1d")
+
+    def _sync_live(self, new_data=None):
+        """Synchronise live data.
+
+        We download the bars by minute. With a store, we only download the bars from
+        the latest one saved and append them to the store.
+
+        Args:
+            new_data (pd.DataFrame, optional): bars already downloaded. Defaults to None.
+
+        Returns:
+            pd.DataFrame: full live data by minute
+        """
+        if new_data is None:
+            last_saved = None
+            if self.store is not None:
+                last_saved = self.store.last_timestamp(self.name_company, "1m")
+            new_data = self.provider.get_live(self.name_company, start=last_saved)
+        if self.minute_store is not None:
+            self.minute_store.append(self.name_company, new_data)
+
+        if self.store is None:
+            return new_data
+        self.store.append(self.name_company, "1m", new_data)
+        return self.store.load(self.name_company, "1m")
 
     def update_info(self):
         """Update info.
 
-        We update all info on the company.
+        We update all info on the company. It is downloaded again on next use, even if it is in the cache.
         """
-        self.ticker = yf.Ticker(self.name_company)
-        self.info = self.ticker.info
+        self._info = None
+        if self.info_cache is not None:
+            self.info_cache.invalidate(self.name_company)
 
     def update_history(self):
         """Update history.
 
-        We update all history on the company.
+        We update all history on the company. It is downloaded again on next use.
         """
-        self.ticker = yf.Ticker(self.name_company)
-        history = self.ticker.history(period="max")
-        history.index = pd.to_datetime(history.index)
-        history["Company"] = self.name_company
-        self.history = history
+        self._history = None
+
+    def last_live_timestamp(self):
+        """Get last live timestamp.
+
+        We get the timestamp of the latest bar by minute loaded.
+
+        Returns:
+            pd.Timestamp: latest timestamp, or None if no bar is loaded
+        """
+        if self._live_data is None or self._live_data.shape[0] == 0:
+            return None
+        latest = self._live_tail[-1] if self._live_tail else self._live_data
+        return latest.index.max()
 
     def update_live_values(self):
         """Update live values.
 
-        We update all live values on the company, by the minute.
+        We update all live values on the company, by the minute. If they are already loaded,
+        only the bars from the latest one are downloaded and appended (see append_live_values).
+        Otherwise, they are downloaded on next use.
         """
-        self.live_data = yf.download(
-            tickers=self.name_company, period="max", interval="1m"
-        )
+        latest = self.last_live_timestamp()
+        if latest is None:
+            self._live_data = None
+            self._live_tail = []
+            return
+        self.append_live_values(self.provider.get_live(self.name_company, start=latest))
+
+    def append_live_values(self, new_data):
+        """Append live values.
+
+        We append bars by minute already downloaded, from the latest one loaded. Only the new
+        bars are processed: the cost grows with the new bars, not with the bars loaded.
+        If no bar is loaded, they are all downloaded on next use.
+
+        Args:
+            new_data (pd.DataFrame): bars by minute downloaded, from the latest one loaded
+        """
+        if self.last_live_timestamp() is None:
+            self._live_data = None
+            self._live_tail = []
+            return
+        if new_data.shape[0] == 0:
+            return
+        if self.store is not None:
+            self.store.append(self.name_company, "1m", new_data)
+        if self.minute_store is not None:
+            self.minute_store.append(self.name_company, new_data)
+
+        # the bars downloaded again replace their old version, at the end of the bars loaded
+        start = new_data.index.min()
+        if self._live_tail and start < self._live_tail[-1].index[0]:
+            self.live_data
+        if self._live_tail:
+            last = self._live_tail.pop()
+            last = last.iloc[: last.index.searchsorted(start)]
+            if last.shape[0] > 0:
+                self._live_tail.append(last)
+        else:
+            self._live_data = self._live_data.iloc[
+                : self._live_data.index.searchsorted(start)
+            ]
+
+        times = normalise_minute_times(new_data.index, self._opening_hours)
+        opening_time_secs, closing_time_secs = self._opening_hours
+        if (
+            times["second_full"].min() < opening_time_secs
+            or times["second_full"].max() > closing_time_secs
+        ):
+            # the opening hours changed: all the bars are processed again
+            live_data = self.live_data
+            all_data = pd.concat([live_data[new_data.columns], new_data])
+            self._opening_hours = None
+            self._live_data = self._add_time_columns(all_data)
+        else:
+            self._live_tail.append(self._add_time_columns(new_data, times))
+
+    def set_data(self, info=None, history=None, live_data=None):
+        """Set data.
+
+        We set data already downloaded, for example by a batched download of several companies.
+        It is processed (and saved in the store) as if it was downloaded by this object.
+
+        Args:
+            info (dict, optional): information on company. Defaults to None.
+            history (pd.DataFrame, optional): daily bars downloaded. Defaults to None.
+            live_data (pd.DataFrame, optional): bars by minute downloaded. Defaults to None.
+        """
+        if info is not None:
+            self._info = info
+        if history is not None:
+            self._history = self._load_history(history)
+        if live_data is not None:
+            self._live_data = self._load_live(live_data)
+            self._live_tail = []
 
     def get_info(self):
         """Get information.
@@ -125,14 +434,24 @@ class FinancialData:
         """
         return self.history
 
-    def get_live(self):
+    def get_live(self, mapped=False):
         """Get live data.
 
         We get the live data of the company.
 
+        Args:
+            mapped (bool, optional): Choice if we read the bars from the minute store, mapped
+                without copy and without the time columns. Defaults to False.
+
         Returns:
             pd.DataFrame: live data of company
         """
+        if mapped:
+            if self.minute_store is None:
+                raise ValueError(
+                    "No minute store: give a MinuteBarStore to read the bars mapped."
+                )
+            return self.minute_store.frame(self.name_company)
         return self.live_data
 
     def save_live_data(self, file_path):
@@ -0,0 +1,231 @@
+from contextlib import nullcontext
+
+import pandas as pd
+
+from .financial_data import FinancialData
+from .providers import YahooProvider
+
+
+class FinancialDataSet:
+    """Class for the financial data of several companies.
+
+    All the companies are downloaded together, in batched calls, instead of one after the other.
+    """
+
+    PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+    def __init__(
+        self,
+        names,
+        store=None,
+        provider=None,
+        max_workers=8,
+        compact=False,
+        info_cache=None,
+        minute_store=None,
+    ):
+        """Initialisation.
+
+        We initialise our data for a list of companies, for example parameters.companies_of_interest.
+
+        Args:
+            names (list): names of the companies we will download
+            store (LocalStore, optional): local store of the bars. Defaults to None.
+            provider (DataProvider, optional): provider of the data. Defaults to None (YahooProvider).
+            max_workers (int, optional): maximum number of concurrent calls. Defaults to 8.
+            compact (bool, optional): Choice if we keep the data in a compact layout (see FinancialData).
+                Defaults to False.
+            info_cache (InfoCache, optional): cache of the information. Only the companies
+                missing from the cache are downloaded. Defaults to None.
+            minute_store (MinuteBarStore, optional): memory-mapped store of the bars by minute. Defaults to None.
+        """
+        self.names = list(names)
+        self.store = store
+        self.provider = YahooProvider() if provider is None else provider
+        self.max_workers = max_workers
+        self.info_cache = info_cache
+
+        self.companies = {
+            name: FinancialData(
+                name,
+                store=self.store,
+                provider=self.provider,
+                compact=compact,
+                info_cache=self.info_cache,
+                minute_store=minute_store,
+            )
+            for name in self.names
+        }
+        self._load_info()
+        self.update_history()
+        self.update_live_values()
+
+    def _fetch(self, resolution):
+        """Fetch bars of all companies.
+
+        With a store, we only download the bars from the oldest of the latest bars saved.
+
+        Args:
+            resolution (str): '1d' for the daily history or '1m' for the bars by minute
+
+        Returns:
+            dict: bars per company
+        """
+        start = None
+        if self.store is not None:
+            last_saved = [
+                self.store.last_timestamp(name, resolution) for name in self.names
+            ]
+            if all(timestamp is not None for timestamp in last_saved):
+                start = min(last_saved)
+                if resolution == "1d":
+                    start = start.date()
+
+        if resolution == "1d":
+            return self.provider.get_histories(
+                self.names, start=start, max_workers=self.max_workers
+            )
+        return self.provider.get_lives(
+            self.names, start=start, max_workers=self.max_workers
+        )
+
+    def _info_batch(self):
+        """Get a batch of the info cache, saved once at its end.
+
+        Returns:
+            contextmanager: batch of the cache, or nothing without a cache
+        """
+        if self.info_cache is None:
+            return nullcontext()
+        return self.info_cache.batch()
+
+    def _load_info(self):
+        """Load info.
+
+        We download the info of the companies missing from the cache, with concurrent calls.
+        """
+        if self.info_cache is None:
+            missing = self.names
+        else:
+            missing = [name for name in self.names if name not in self.info_cache]
+        if len(missing) == 0:
+            return
+
+        infos = self.provider.get_infos(missing, max_workers=self.max_workers)
+        # a company failing is missing: its info is downloaded when it is used
+        with self._info_batch():
+            for name in missing:
+                if name not in infos:
+                    continue
+                self.companies[name].set_data(info=infos[name])
+                if self.info_cache is not None:
+                    self.info_cache.set(name, infos[name])
+
+    def update_info(self):
+        """Update info.
+
+        We update all info on all companies, with concurrent calls, even if it is in the cache.
+        The cache is saved once.
+        """
+        with self._info_batch():
+            for company in self.companies.values():
+                company.update_info()
+            self._load_info()
+
+    def update_history(self):
+        """Update history.
+
+        We update all history on all companies, in a batched download.
+        """
+        histories = self._fetch("1d")
+        for name, company in self.companies.items():
+            if name in histories:
+                company.set_data(history=histories[name])
+
+    def update_live_values(self):
+        """Update live values.
+
+        We update all live values on all companies, in a batched download. If they are
+        already loaded, only the bars from the oldest of the latest bars loaded are downloaded,
+        and each company appends the bars from its latest one.
+        """
+        latest = {
+            name: company.last_live_timestamp()
+            for name, company in self.companies.items()
+        }
+        if all(timestamp is not None for timestamp in latest.values()):
+            lives = self.provider.get_lives(
+                self.names, start=min(latest.values()), max_workers=self.max_workers
+            )
+            for name, company in self.companies.items():
+                if name in lives:
+                    bars = lives[name]
+                    company.append_live_values(bars[bars.index >= latest[name]])
+            return
+
+        lives = self._fetch("1m")
+        for name, company in self.companies.items():
+            if name in lives:
+                company.set_data(live_data=lives[name])
+
+    def __getitem__(self, name):
+        return self.companies[name]
+
+    def __iter__(self):
+        return iter(self.companies.values())
+
+    def __len__(self):
+        return len(self.companies)
+
+    def memory_report(self):
+        """Get memory report.
+
+        We get the memory used by the data loaded, per company.
+
+        Returns:
+            pd.DataFrame: rows, columns and bytes used by history and live_data of each company
+        """
+        return pd.concat(
+            {name: company.memory_report() for name, company in self.companies.items()}
+        )
+
+    def get_history(self, column="Close"):
+        """Get aligned history.
+
+        We get the daily history of all companies in one table, aligned on the dates.
+
+        Args:
+            column (str, optional): column of the history. If None, all price columns are kept. Defaults to "Close".
+
+        Returns:
+            pd.DataFrame: history with one column per company (or per company and price if column is None)
+        """
+        frames = {}
+        for name, company in self.companies.items():
+            history = company.history.select_dtypes("number")
+            # the exchanges have different time zones: we align on the local day
+            if history.index.tz is not None:
+                history.index = history.index.tz_localize(None)
+            frames[name] = history if column is None else history[column]
+        return pd.concat(frames, axis=1).sort_index()
+
+    def get_live(self, column="Close"):
+        """Get aligned live data.
+
+        We get the bars by minute of all companies in one table, aligned on the UTC time.
+
+        Args:
+            column (str, optional): column of the bars. If None, all price columns are kept. Defaults to "Close".
+
+        Returns:
+            pd.DataFrame: bars with one column per company (or per company and price if column is None)
+        """
+        frames = {}
+        for name, company in self.companies.items():
+            live_data = company.live_data[
+                [col for col in self.PRICE_COLUMNS if col in company.live_data.columns]
+            ]
+            if live_data.index.tz is not None:
+                live_data.index = live_data.index.tz_convert("UTC")
+            frames[name] = live_data if column is None else live_data[column]
+        return pd.concat(frames, axis=1).sort_index()
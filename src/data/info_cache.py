@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class InfoCache:
+    """Class for the cache of the information on companies.
+
+    The information changes rarely, and is the slowest data to download. Each entry expires
+    after a time to live, the least recently used entries are removed when the cache is full,
+    and the cache is saved on disk to be reused after a restart. The changes made in a batch
+    are saved once, at the end of the batch.
+    """
+
+    # time to live used when the information does not give its own maxAge
+    DEFAULT_TTL = 24 * 60 * 60
+
+    def __init__(self, path=None, ttl=None, max_size=128):
+        """Initialisation.
+
+        Args:
+            path (str, optional): JSON file where the cache is saved. Defaults to None (not saved).
+            ttl (float, optional): time to live of an entry, in seconds. Defaults to None (maxAge of the information).
+            max_size (int, optional): maximum number of companies in the cache. Defaults to 128.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.changed = False
+
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.entries = OrderedDict(json.load(f))
+            except ValueError:
+                # a corrupt file is an empty cache
+                self.entries = OrderedDict()
+
+    def get(self, name_company):
+        """Get information.
+
+        Args:
+            name_company (str): name of the company
+
+        Returns:
+            dict: information on company, or None if it is not in the cache or expired
+        """
+        with self.lock:
+            entry = self.entries.get(name_company)
+            if entry is None:
+                return None
+            if entry["expires"] <= time.time():
+                del self.entries[name_company]
+                return None
+            self.entries.move_to_end(name_company)
+            return entry["info"]
+
+    def set(self, name_company, info):
+        """Set information.
+
+        Args:
+            name_company (str): name of the company
+            info (dict): information on company
+        """
+        ttl = self.ttl
+        if ttl is None:
+            ttl = info.get("maxAge")
+        if ttl is None:
+            ttl = self.DEFAULT_TTL
+        with self.lock:
+            self.entries[name_company] = {"info": info, "expires": time.time() + ttl}
+            self.entries.move_to_end(name_company)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+            self._changed()
+
+    def invalidate(self, name_company):
+        """Invalidate information.
+
+        Args:
+            name_company (str): name of the company
+        """
+        with self.lock:
+            if self.entries.pop(name_company, None) is not None:
+                self._changed()
+
+    @contextmanager
+    def batch(self):
+        """Batch the changes.
+
+        The cache is saved once at the end of the batch, instead of at each change.
+        """
+        with self.lock:
+            self.batches += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.batches -= 1
+                if self.batches == 0 and self.changed:
+                    self._save()
+
+    def _changed(self):
+        """Save the cache, or mark it changed during a batch."""
+        self.changed = True
+        if self.batches == 0:
+            self._save()
+
+    def _save(self):
+        """Save the cache on disk, if it has a path.
+
+        The cache is written in a temporary file then renamed, so a reader never gets a
+        partial file.
+        """
+        self.changed = False
+        if self.path is None:
+            return
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
+    def __contains__(self, name_company):
+        return self.get(name_company) is not None
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,188 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class MinuteBarStore:
+    """Class for the memory-mapped store of bars by minute.
+
+    Each column of the bars is saved as a raw binary file per company. The readers map
+    these files with NumPy instead of loading them, so several processes (dashboard,
+    notebooks, reports) share the same pages in memory, without any parsing.
+    """
+
+    # columns saved, with the timestamps in nanoseconds since epoch (UTC)
+    COLUMNS = {
+        "timestamp": np.int64,
+        "Open": np.float64,
+        "High": np.float64,
+        "Low": np.float64,
+        "Close": np.float64,
+        "Volume": np.float64,
+    }
+
+    def __init__(self, root="data/minute_bars"):
+        """Initialisation.
+
+        Args:
+            root (str, optional): folder where the files are saved. Defaults to "data/minute_bars".
+        """
+        self.root = root
+
+    def _path(self, name_company, column):
+        """Get file path of a column.
+
+        Args:
+            name_company (str): name of the company
+            column (str): column of the bars, or 'meta' for the time zone
+
+        Returns:
+            str: path to the file
+        """
+        extension = "json" if column == "meta" else "bin"
+        return os.path.join(self.root, name_company, f"{column}.{extension}")
+
+    def _meta(self, name_company):
+        """Get the metadata of a company.
+
+        Args:
+            name_company (str): name of the company
+
+        Returns:
+            dict: number of bars published and time zone
+        """
+        path = self._path(name_company, "meta")
+        if not os.path.exists(path):
+            return {"length": 0, "tz": "UTC"}
+        with open(path) as f:
+            return json.load(f)
+
+    def length(self, name_company):
+        """Get number of bars saved.
+
+        Args:
+            name_company (str): name of the company
+
+        Returns:
+            int: number of bars published, complete in all columns
+        """
+        return self._meta(name_company)["length"]
+
+    def append(self, name_company, bars):
+        """Append bars.
+
+        We append new bars to the files. The bars saved from the first new one onwards
+        are overwritten in place, as the latest bar can still change. The files are never
+        shrunk, so the readers mapping them are not affected, and the number of bars is
+        published last: the readers only read the bars written in all the columns.
+
+        Args:
+            name_company (str): name of the company
+            bars (pd.DataFrame): bars by minute, index dated
+        """
+        if bars.shape[0] == 0:
+            return
+        bars = bars.sort_index()
+        index = pd.DatetimeIndex(bars.index)
+        if index.tz is None:
+            index = index.tz_localize("UTC")
+        values = {"timestamp": index.asi8}
+        for column in self.COLUMNS:
+            if column != "timestamp":
+                values[column] = bars[column].to_numpy()
+
+        keep = self.length(name_company)
+        if keep > 0:
+            timestamps = self.read(name_company)["timestamp"]
+            keep = int(np.searchsorted(timestamps, values["timestamp"][0]))
+            del timestamps
+
+        os.makedirs(os.path.join(self.root, name_company), exist_ok=True)
+        for column, dtype in self.COLUMNS.items():
+            path = self._path(name_company, column)
+            itemsize = np.dtype(dtype).itemsize
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                f.seek(keep * itemsize)
+                f.write(np.ascontiguousarray(values[column], dtype=dtype).tobytes())
+
+        # written then renamed: the readers see the old or the new number of bars
+        path = self._path(name_company, "meta")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"length": keep + len(index), "tz": str(index.tz)}, f)
+        os.replace(tmp_path, path)
+
+    def read(self, name_company):
+        """Read columns.
+
+        We map the columns saved, without copying them in memory.
+
+        Args:
+            name_company (str): name of the company
+
+        Returns:
+            dict: read-only arrays per column
+        """
+        length = self.length(name_company)
+        columns = {}
+        for column, dtype in self.COLUMNS.items():
+            if length == 0:
+                columns[column] = np.empty(0, dtype=dtype)
+            else:
+                columns[column] = np.memmap(
+                    self._path(name_company, column),
+                    dtype=dtype,
+                    mode="r",
+                    shape=(length,),
+                )
+        return columns
+
+    def _index(self, name_company, timestamps):
+        """Create the index of the bars, on the timestamps mapped.
+
+        Args:
+            name_company (str): name of the company
+            timestamps (np.ndarray): timestamps in nanoseconds since epoch
+
+        Returns:
+            pd.DatetimeIndex: index in the time zone of the exchange
+        """
+        tz = self._meta(name_company)["tz"]
+        dates = pd.arrays.DatetimeArray(
+            timestamps.view("M8[ns]"), dtype=pd.DatetimeTZDtype(tz=tz), copy=False
+        )
+        return pd.DatetimeIndex(dates, name="Datetime", copy=False)
+
+    def frame(self, name_company):
+        """Get bars.
+
+        We get the bars saved as a DataFrame using the mapped columns, without copy.
+
+        Args:
+            name_company (str): name of the company
+
+        Returns:
+            pd.DataFrame: bars by minute, index dated
+        """
+        columns = self.read(name_company)
+        index = self._index(name_company, columns.pop("timestamp"))
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def series(self, name_company, column="Close"):
+        """Get a column.
+
+        We get a column of the bars as a Series using the mapped column, without copy.
+        It can be given directly to the plots (TimeSeries, Shewhart...) or ARIMAModel.
+
+        Args:
+            name_company (str): name of the company
+            column (str, optional): column of the bars. Defaults to "Close".
+
+        Returns:
+            pd.Series: column, index dated
+        """
+        columns = self.read(name_company)
+        index = self._index(name_company, columns["timestamp"])
+        return pd.Series(columns[column], index=index, name=column, copy=False)
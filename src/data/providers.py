@@ -0,0 +1,327 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+
+def _filter_start(data, start):
+    """Filter bars from a start date.
+
+    Args:
+        data (pd.DataFrame): bars, index dated
+        start (str, date or pd.Timestamp): first date to keep. If None, all bars are kept.
+
+    Returns:
+        pd.DataFrame: bars from the start date
+    """
+    if start is None or data.shape[0] == 0:
+        return data
+    start = pd.Timestamp(start)
+    if data.index.tz is not None and start.tz is None:
+        start = start.tz_localize(data.index.tz)
+    return data[data.index >= start]
+
+
+class DataProvider:
+    """Base class for the data providers.
+
+    A provider gives the info, the daily history and the bars by minute of a company.
+    """
+
+    def get_info(self, name_company):
+        """Get information.
+
+        Args:
+            name_company (str): name of the company
+
+        Returns:
+            dict: information on company
+        """
+        raise NotImplementedError
+
+    def get_history(self, name_company, start=None):
+        """Get daily history.
+
+        Args:
+            name_company (str): name of the company
+            start (str, date or pd.Timestamp, optional): first date to download. Defaults to None (all history).
+
+        Returns:
+            pd.DataFrame: daily history of company
+        """
+        raise NotImplementedError
+
+    def get_live(self, name_company, start=None):
+        """Get bars by minute.
+
+        Args:
+            name_company (str): name of the company
+            start (str, date or pd.Timestamp, optional): first date to download. Defaults to None (all bars available).
+
+        Returns:
+            pd.DataFrame: bars by minute of company
+        """
+        raise NotImplementedError
+
+    def get_infos(self, names, max_workers=8):
+        """Get information of several companies.
+
+        By default, we call get_info for each company in a pool of threads.
+
+        Args:
+            names (list): names of the companies
+            max_workers (int, optional): maximum number of concurrent calls. Defaults to 8.
+
+        Returns:
+            dict: information per company
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return dict(zip(names, pool.map(self.get_info, names)))
+
+    def get_histories(self, names, start=None, max_workers=8):
+        """Get daily history of several companies.
+
+        By default, we call get_history for each company in a pool of threads.
+
+        Args:
+            names (list): names of the companies
+            start (str, date or pd.Timestamp, optional): first date to download. Defaults to None (all history).
+            max_workers (int, optional): maximum number of concurrent calls. Defaults to 8.
+
+        Returns:
+            dict: daily history per company
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            histories = pool.map(lambda name: self.get_history(name, start), names)
+            return dict(zip(names, histories))
+
+    def get_lives(self, names, start=None, max_workers=8):
+        """Get bars by minute of several companies.
+
+        By default, we call get_live for each company in a pool of threads.
+
+        Args:
+            names (list): names of the companies
+            start (str, date or pd.Timestamp, optional): first date to download. Defaults to None (all bars available).
+            max_workers (int, optional): maximum number of concurrent calls. Defaults to 8.
+
+        Returns:
+            dict: bars by minute per company
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            lives = pool.map(lambda name: self.get_live(name, start), names)
+            return dict(zip(names, lives))
+
+
+def _split_tickers(data, names):
+    """Split a download of several tickers.
+
+    Args:
+        data (pd.DataFrame): download from yf.download, grouped by ticker
+        names (list): names of the companies
+
+    Returns:
+        dict: bars per company, without the dates where the company has no bar.
+            A company missing from the download is missing from the result.
+    """
+    if len(names) == 1 and data.columns.nlevels == 1:
+        return {names[0]: data}
+    downloaded = set(data.columns.get_level_values(0))
+    return {name: data[name].dropna(how="all") for name in names if name in downloaded}
+
+
+class YahooProvider(DataProvider):
+    """Provider downloading the data from Yahoo Finance."""
+
+    def get_info(self, name_company):
+        return yf.Ticker(name_company).info
+
+    def get_history(self, name_company, start=None):
+        ticker = yf.Ticker(name_company)
+        if start is None:
+            return ticker.history(period="max")
+        return ticker.history(start=start)
+
+    def get_live(self, name_company, start=None):
+        if start is None:
+            return yf.download(tickers=name_company, period="max", interval="1m")
+        return yf.download(tickers=name_company, start=start, interval="1m")
+
+    def get_histories(self, names, start=None, max_workers=8):
+        # one batched download, with the same columns as Ticker.history
+        period = {"period": "max"} if start is None else {"start": start}
+        data = yf.download(
+            tickers=list(names),
+            interval="1d",
+            group_by="ticker",
+            actions=True,
+            auto_adjust=True,
+            threads=max_workers,
+            **period,
+        )
+        return _split_tickers(data, names)
+
+    def get_lives(self, names, start=None, max_workers=8):
+        period = {"period": "max"} if start is None else {"start": start}
+        data = yf.download(
+            tickers=list(names),
+            interval="1m",
+            group_by="ticker",
+            threads=max_workers,
+            **period,
+        )
+        return _split_tickers(data, names)
+
+
+class ReplayProvider(DataProvider):
+    """Provider serving recorded or synthetic data, without any network.
+
+    The data is either given as a dictionary or read from a folder, with one
+    sub-folder per company containing 'info.json', 'history.parquet' and 'live.parquet'.
+    Each call waits for a latency, to behave like a real service.
+    """
+
+    def __init__(self, frames=None, folder=None, latency=0.0, jitter=0.0, seed=0):
+        """Initialisation.
+
+        Args:
+            frames (dict, optional): data per company, as a dict with keys 'info', 'history' and 'live'. Defaults to None.
+            folder (str, optional): folder of recorded data, used for the companies not in frames. Defaults to None.
+            latency (float, optional): time waited by each call, in seconds. Defaults to 0.0.
+            jitter (float, optional): maximum random time added to the latency, in seconds. Defaults to 0.0.
+            seed (int, optional): seed of the random jitter. Defaults to 0.
+        """
+        self.frames = {} if frames is None else frames
+        self.folder = folder
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = np.random.default_rng(seed)
+
+    def _wait(self):
+        """Wait for the latency of the call."""
+        delay = self.latency + self.rng.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _get(self, name_company, kind):
+        """Get recorded data.
+
+        Args:
+            name_company (str): name of the company
+            kind (str): 'info', 'history' or 'live'
+
+        Raises:
+            KeyError: if nothing is recorded for the company
+
+        Returns:
+            dict or pd.DataFrame: data recorded
+        """
+        self._wait()
+        if name_company in self.frames:
+            return self.frames[name_company][kind]
+        if self.folder is not None:
+            company_folder = os.path.join(self.folder, name_company)
+            if kind == "info":
+                with open(os.path.join(company_folder, "info.json")) as f:
+                    return json.load(f)
+            return pd.read_parquet(os.path.join(company_folder, f"{kind}.parquet"))
+        raise KeyError(f"No data recorded for {name_company}")
+
+    def get_info(self, name_company):
+        return dict(self._get(name_company, "info"))
+
+    def get_history(self, name_company, start=None):
+        return _filter_start(self._get(name_company, "history"), start).copy()
+
+    def get_live(self, name_company, start=None):
+        return _filter_start(self._get(name_company, "live"), start).copy()
+
+    @classmethod
+    def synthetic(cls, names, history_days=1000, live_days=5, **kwargs):
+        """Create a provider with synthetic data.
+
+        Args:
+            names (list): names of the companies
+            history_days (int, optional): number of days of daily history. Defaults to 1000.
+            live_days (int, optional): number of days of bars by minute. Defaults to 5.
+            **kwargs: other arguments given to the provider (latency, jitter, seed...)
+
+        Returns:
+            ReplayProvider: provider serving the synthetic data
+        """
+        frames = {}
+        for i, name in enumerate(names):
+            frames[name] = {
+                "info": {"symbol": name, "quoteType": "EQUITY", "maxAge": 86400},
+                "history": synthetic_bars(history_days, "D", seed=i),
+                "live": synthetic_bars(live_days, "T", seed=i),
+            }
+        return cls(frames=frames, **kwargs)
+
+
+def synthetic_bars(days, freq, seed=0, end="2023-09-01"):
+    """Create synthetic OHLCV bars.
+
+    The prices follow a random walk. Bars by minute are only created during
+    opening hours (8:00 to 16:30), like a real exchange.
+
+    Args:
+        days (int): number of days of bars
+        freq (str): 'D' for daily bars or 'T' for bars by minute
+        seed (int, optional): seed of the random walk. Defaults to 0.
+        end (str, optional): last day of bars. Defaults to "2023-09-01".
+
+    Returns:
+        pd.DataFrame: bars with columns Open, High, Low, Close, Adj Close and Volume
+    """
+    rng = np.random.default_rng(seed)
+    days_index = pd.bdate_range(end=end, periods=days, tz="Europe/London")
+    if freq == "D":
+        index = days_index
+    else:
+        minutes = pd.timedelta_range("8h", "16h30min", freq="T")
+        index = pd.DatetimeIndex(
+            (days_index.values[:, None] + minutes.values[None, :]).ravel(), tz="UTC"
+        ).tz_convert("Europe/London")
+
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index))))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.005, len(index))) * close
+    bars = pd.DataFrame(
+        {
+            "Open": open_,
+            "High": np.maximum(open_, close) + spread,
+            "Low": np.minimum(open_, close) - spread,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": rng.integers(0, 100000, len(index)),
+        },
+        index=index,
+    )
+    bars.index.name = "Date" if freq == "D" else "Datetime"
+    return bars
+
+
+def record(provider, names, folder):
+    """Record data from a provider.
+
+    We save the data of some companies in a folder, to replay it later with a ReplayProvider.
+
+    Args:
+        provider (DataProvider): provider to record, for example YahooProvider
+        names (list): names of the companies
+        folder (str): folder where the data is saved
+    """
+    for name in names:
+        company_folder = os.path.join(folder, name)
+        os.makedirs(company_folder, exist_ok=True)
+        with open(os.path.join(company_folder, "info.json"), "w") as f:
+            json.dump(provider.get_info(name), f)
+        provider.get_history(name).to_parquet(
+            os.path.join(company_folder, "history.parquet")
+        )
+        provider.get_live(name).to_parquet(os.path.join(company_folder, "live.parquet"))
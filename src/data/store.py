@@ -0,0 +1,167 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class LocalStore:
+    """Class for the local OHLCV store.
+
+    The bars are saved on disk in one folder per resolution and per ticker, with one
+    Parquet file per partition: one per year for daily bars, one per month otherwise.
+    An append only rewrites the partitions of the new bars, so its cost grows with the
+    new data and not with the history saved.
+    """
+
+    def __init__(self, root="data/store"):
+        """Initialisation.
+
+        We initialise the store in a specific folder.
+
+        Args:
+            root (str, optional): folder where the files are saved. Defaults to "data/store".
+        """
+        self.root = root
+
+    def path(self, name_company, resolution):
+        """Get folder path.
+
+        We get the path of the folder of the partitions for a company and a resolution.
+
+        Args:
+            name_company (str): name of the company
+            resolution (str): resolution of the bars, for example '1d' or '1m'
+
+        Returns:
+            str: path to the folder of the Parquet files
+        """
+        return os.path.join(self.root, resolution, name_company)
+
+    def partitions(self, name_company, resolution):
+        """Get partition files.
+
+        We get the paths of the partition files saved, in chronological order.
+
+        Args:
+            name_company (str): name of the company
+            resolution (str): resolution of the bars, for example '1d' or '1m'
+
+        Returns:
+            list: paths to the Parquet files
+        """
+        self._migrate(name_company, resolution)
+        folder = self.path(name_company, resolution)
+        if not os.path.isdir(folder):
+            return []
+        # the names of the partitions sort chronologically
+        return [
+            os.path.join(folder, file_name)
+            for file_name in sorted(os.listdir(folder))
+            if file_name.endswith(".parquet")
+        ]
+
+    def load(self, name_company, resolution):
+        """Load bars.
+
+        We load all the bars saved for a company and a resolution.
+
+        Args:
+            name_company (str): name of the company
+            resolution (str): resolution of the bars, for example '1d' or '1m'
+
+        Returns:
+            pd.DataFrame: bars saved, or None if nothing is saved yet
+        """
+        partitions = self.partitions(name_company, resolution)
+        if not partitions:
+            return None
+        return pd.concat([pd.read_parquet(file_path) for file_path in partitions])
+
+    def last_timestamp(self, name_company, resolution):
+        """Get last timestamp.
+
+        We get the timestamp of the latest bar saved for a company and a resolution.
+
+        Args:
+            name_company (str): name of the company
+            resolution (str): resolution of the bars, for example '1d' or '1m'
+
+        Returns:
+            pd.Timestamp: latest timestamp, or None if nothing is saved yet
+        """
+        partitions = self.partitions(name_company, resolution)
+        if not partitions:
+            return None
+        # we only read the index of the latest partition, not the prices
+        stored = pd.read_parquet(partitions[-1], columns=[])
+        if stored.shape[0] == 0:
+            return None
+        return stored.index.max()
+
+    def append(self, name_company, resolution, new_data):
+        """Append bars.
+
+        We append new bars to the ones saved. If a bar is already saved,
+        the new version replaces it (the latest bar of the day can still change).
+        Only the partitions of the new bars are read and written again.
+
+        Args:
+            name_company (str): name of the company
+            resolution (str): resolution of the bars, for example '1d' or '1m'
+            new_data (pd.DataFrame): new bars, index dated
+        """
+        self._migrate(name_company, resolution)
+        self._write_partitions(name_company, resolution, new_data, merge=True)
+
+    def _migrate(self, name_company, resolution):
+        """Split a store saved in the previous layout, with one file per company.
+
+        Args:
+            name_company (str): name of the company
+            resolution (str): resolution of the bars, for example '1d' or '1m'
+        """
+        legacy_path = os.path.join(self.root, resolution, f"{name_company}.parquet")
+        if os.path.exists(legacy_path):
+            self._write_partitions(
+                name_company, resolution, pd.read_parquet(legacy_path)
+            )
+            os.remove(legacy_path)
+
+    def _write_partitions(self, name_company, resolution, data, merge=False):
+        """Write bars in their partitions.
+
+        Each file is written then renamed, so the readers see the old or the new partition.
+
+        Args:
+            name_company (str): name of the company
+            resolution (str): resolution of the bars, for example '1d' or '1m'
+            data (pd.DataFrame): bars, index dated
+            merge (bool, optional): Choice if the bars are merged with the ones saved in their
+                partitions. Defaults to False.
+        """
+        if data.shape[0] == 0:
+            return
+        index = pd.DatetimeIndex(data.index)
+        keys = index.year * 100
+        if resolution != "1d":
+            keys = keys + index.month
+        keys = np.asarray(keys)
+
+        folder = self.path(name_company, resolution)
+        os.makedirs(folder, exist_ok=True)
+        for key in np.unique(keys):
+            partition = data[keys == key]
+            name = (
+                str(key // 100)
+                if resolution == "1d"
+                else f"{key // 100}-{key % 100:02d}"
+            )
+            file_path = os.path.join(folder, f"{name}.parquet")
+            if merge and os.path.exists(file_path):
+                partition = pd.concat([pd.read_parquet(file_path), partition])
+                partition = partition[~partition.index.duplicated(keep="last")]
+            partition = partition.sort_index()
+
+            tmp_path = f"{file_path}.{os.getpid()}.tmp"
+            partition.to_parquet(tmp_path)
+            os.replace(tmp_path, file_path)
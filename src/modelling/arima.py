@@ -8,19 +8,55 @@ import plotly.graph_objects as go
 from ..plotting.timeseries import TimeSeries
 
 
+def information_criteria(llf, nobs, n_params):
+    """Compute the information criteria of a model.
+
+    We use the formulas of statsmodels, from the log-likelihood and the number of
+    observations in the likelihood.
+
+    Args:
+        llf (float): log-likelihood
+        nobs (int): number of observations in the log-likelihood
+        n_params (int): number of parameters estimated
+
+    Returns:
+        dict: 'aic', 'aicc', 'bic' and 'hqic'
+    """
+    aic = -2 * llf + 2 * n_params
+    return {
+        "aic": aic,
+        "aicc": aic + 2 * n_params * (n_params + 1) / (nobs - n_params - 1),
+        "bic": -2 * llf + np.log(nobs) * n_params,
+        "hqic": -2 * llf + 2 * np.log(np.log(nobs)) * n_params,
+    }
+
+
 class ARIMAModel:
-    def __init__(self, p=1, d=1, q=1):
+    def __init__(self, p=1, d=1, q=1, refit_every=None, cache=None, name_company=None):
         """Initialize an ARIMA model with the specified order.
 
         Args:
             p (int): The order of autoregressive (AR) component.
             d (int): The order of differencing.
             q (int): The order of moving average (MA) component.
+            refit_every (int, optional): number of new observations after which 'update' fits the
+                model again on the full series. Defaults to None (never).
+            cache (ModelCache, optional): cache of the fitted models. 'fit' reuses the model fitted
+                on the same series if it is in the cache. Defaults to None.
+            name_company (str, optional): name of the company, in the key of the cache. Defaults to None.
         """
         self.p = p
         self.d = d
         self.q = q
+        self.refit_every = refit_every
+        self.cache = cache
+        self.name_company = name_company
         self.model = None
+        self.series = None
+        self.n_new = 0
+        # log-likelihood of all the observations, updated without filtering them again
+        self.llf = None
+        self.nobs = None
 
     def fit(self, train_series):
         """Fit the ARIMA model to the training time series data.
@@ -31,8 +67,81 @@ class ARIMAModel:
         Returns:
         - None
         """
-        self.model = ARIMA(order=(self.p, self.d, self.q))
+        self.n_new = 0
+        self.series = train_series
+        order = (self.p, self.d, self.q)
+        if self.cache is not None:
+            key = self.cache.key(self.name_company, order, train_series)
+            self.model = self.cache.get(key)
+            if self.model is not None:
+                self._reset_likelihood()
+                return
+
+        self.model = ARIMA(order=order)
         self.model.fit(train_series)
+        if self.cache is not None:
+            self.cache.set(key, self.model)
+        self._reset_likelihood()
+
+    def _reset_likelihood(self):
+        """Reset the log-likelihood to the one of the fit."""
+        results = self.model._forecaster.arima_res_
+        self.llf = results.llf
+        self.nobs = results.nobs_effective
+
+    def update(self, new_observations):
+        """Update the fitted model with new observations.
+
+        We keep the estimated parameters and only run the Kalman filter on the new
+        observations, from the state at the end of the series: the cost does not depend
+        on the length of the series. The log-likelihood of the new observations is added
+        to the one of the series, so the criteria cover all the observations. Every
+        refit_every new observations, the model is fitted again on the full series.
+
+        Args:
+            new_observations (pd.Series): The new observations, following the training series.
+        """
+        if self.model is None:
+            raise ValueError(
+                "Model has not been fitted. Please call 'fit' method first."
+            )
+        if len(new_observations) == 0:
+            return
+
+        self.n_new += len(new_observations)
+        self.series = pd.concat([self.series, new_observations])
+        if self.refit_every is not None and self.n_new >= self.refit_every:
+            self.fit(self.series)
+            return
+
+        # the statsmodels results of pmdarima, extended with the new observations:
+        # the state is known, so none of them is burned in the log-likelihood
+        forecaster = self.model._forecaster
+        extension = forecaster.arima_res_.extend(
+            new_observations.to_numpy(dtype=float), loglikelihood_burn=0
+        )
+        llf, nobs = self.llf + extension.llf, self.nobs + extension.nobs
+        forecaster.arima_res_ = extension
+        self.model.update(new_observations, update_params=False)
+        self.llf, self.nobs = llf, nobs
+
+    def information_criterion(self, criterion="aic"):
+        """Get an information criterion of the fitted model.
+
+        We compute it on all the observations, including the ones of the updates.
+
+        Args:
+            criterion (str, optional): 'aic', 'aicc', 'bic' or 'hqic'. Defaults to "aic".
+
+        Returns:
+            float: value of the criterion
+        """
+        if self.model is None:
+            raise ValueError(
+                "Model has not been fitted. Please call 'fit' method first."
+            )
+        n_params = len(self.model._forecaster.arima_res_.params)
+        return information_criteria(self.llf, self.nobs, n_params)[criterion]
 
     def predict(self, test):
         """Make predictions for future time periods.
@@ -83,7 +192,7 @@ class ARIMAModel:
                 "Model has not been fitted. Please call 'fit' method first."
             )
         predictions = self.predict(test)
-        mape = MeanAbsolutePercentageError(test, predictions)
+        mape = MeanAbsolutePercentageError()(test, predictions)
         return mape
 
     def plot(self, test, title, xlab, ylab, label, yformat):
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+from .batch import fit_models
+
+
+def fold_cutoffs(n, initial, horizon, step):
+    """Get the cutoffs of the folds.
+
+    Args:
+        n (int): number of points of the series
+        initial (int): number of points of the first training series
+        horizon (int): number of points forecast by each fold
+        step (int): number of points between two cutoffs
+
+    Returns:
+        np.ndarray: positions of the first point forecast by each fold
+    """
+    return np.arange(initial, n - horizon + 1, step)
+
+
+def backtest(
+    series,
+    order=(1, 1, 1),
+    initial=None,
+    horizon=5,
+    step=None,
+    window=None,
+    max_workers=None,
+    timeout=None,
+):
+    """Backtest an ARIMA model with rolling origins.
+
+    Each fold fits the model on the points before its cutoff and forecasts the next
+    points. The training series is expanding, or rolling with a window. The folds are
+    fitted in parallel.
+
+    Args:
+        series (pd.Series): series, index dated
+        order (tuple, optional): order (p, d, q) of the model. Defaults to (1, 1, 1).
+        initial (int, optional): number of points of the first training series. Defaults to None (half the series).
+        horizon (int, optional): number of points forecast by each fold. Defaults to 5.
+        step (int, optional): number of points between two cutoffs. Defaults to None (horizon).
+        window (int, optional): number of points of each training series. Defaults to None (expanding).
+        max_workers (int, optional): number of processes. Defaults to None (number of cores).
+        timeout (float, optional): maximum time of each fit, in seconds. Defaults to None (no maximum).
+
+    Returns:
+        pd.DataFrame: actual and forecast values, with one row per fold and step of the horizon
+    """
+    n = len(series)
+    initial = n // 2 if initial is None else initial
+    step = horizon if step is None else step
+    cutoffs = fold_cutoffs(n, initial, horizon, step)
+
+    # the folds use positions as index: the dates of prices have no frequency
+    positional = pd.Series(series.to_numpy(dtype=float))
+    trains = {
+        fold: positional.iloc[0 if window is None else max(0, cutoff - window) : cutoff]
+        for fold, cutoff in enumerate(cutoffs)
+    }
+    models, fit_times, failures = fit_models(
+        trains, order=order, max_workers=max_workers, timeout=timeout
+    )
+
+    # actual and forecast values as (folds × horizon) arrays
+    positions = cutoffs[:, None] + np.arange(horizon)[None, :]
+    actual = positional.to_numpy()[positions]
+    forecast = np.full(actual.shape, np.nan)
+    for fold, model in models.items():
+        try:
+            forecast[fold] = model.predict(positional.iloc[positions[fold]]).to_numpy()
+        except Exception as error:
+            failures[fold] = f"{type(error).__name__}: {error}"
+
+    folds = np.arange(len(cutoffs))
+    return pd.DataFrame(
+        {
+            "fold": np.repeat(folds, horizon),
+            "cutoff": np.repeat(series.index[cutoffs], horizon),
+            "step": np.tile(np.arange(1, horizon + 1), len(cutoffs)),
+            "date": series.index[positions.ravel()],
+            "actual": actual.ravel(),
+            "forecast": forecast.ravel(),
+            "fit_time": np.repeat([fit_times.get(fold) for fold in folds], horizon),
+            "failure": np.repeat([failures.get(fold) for fold in folds], horizon),
+        }
+    )
+
+
+def forecast_metrics(results, by="step"):
+    """Compute the metrics of a backtest.
+
+    We compute the MAPE, MAE and RMSE of the forecasts on the (folds × horizon) arrays,
+    ignoring the failed folds.
+
+    Args:
+        results (pd.DataFrame): results of backtest
+        by (str, optional): 'step' for the metrics per step of the horizon, 'fold' per fold,
+            or None for all the forecasts. Defaults to "step".
+
+    Returns:
+        pd.DataFrame: MAPE, MAE and RMSE
+    """
+    actual = results.pivot(index="fold", columns="step", values="actual")
+    forecast = results.pivot(index="fold", columns="step", values="forecast")
+    error = forecast.to_numpy() - actual.to_numpy()
+    percentage = np.abs(error) / np.abs(actual.to_numpy())
+
+    if by == "step":
+        axis, index = 0, actual.columns
+    elif by == "fold":
+        axis, index = 1, actual.index
+    elif by is None:
+        axis, index = None, ["all"]
+    else:
+        raise ValueError(f"The metrics should be by 'step', 'fold' or None ({by})")
+
+    return pd.DataFrame(
+        {
+            "mape": np.nanmean(percentage, axis=axis),
+            "mae": np.nanmean(np.abs(error), axis=axis),
+            "rmse": np.sqrt(np.nanmean(error**2, axis=axis)),
+        },
+        index=index,
+    )
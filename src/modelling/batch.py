@@ -0,0 +1,191 @@
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+from .arima import ARIMAModel
+
+TIMEOUT_ERROR = "TimeoutError: The fit took longer than the timeout."
+
+
+def _fit_one(name, series, order):
+    """Fit a model, in a worker.
+
+    Args:
+        name (str): name of the company
+        series (pd.Series): training series
+        order (tuple): order (p, d, q) of the model
+
+    Returns:
+        tuple: name, fitted model (or None), time of the fit in seconds, error (or None)
+    """
+    start = time.perf_counter()
+    try:
+        model = ARIMAModel(*order)
+        model.fit(series)
+        return name, model, time.perf_counter() - start, None
+    except Exception as error:
+        return (
+            name,
+            None,
+            time.perf_counter() - start,
+            f"{type(error).__name__}: {error}",
+        )
+
+
+def _work(connection):
+    """Fit the models received, until None is received.
+
+    Args:
+        connection (multiprocessing.connection.Connection): end of the pipe of the worker
+    """
+    # one thread per worker: the workers already use all the cores
+    with threadpool_limits(limits=1):
+        while True:
+            task = connection.recv()
+            if task is None:
+                return
+            connection.send(_fit_one(*task))
+
+
+class FitPool:
+    """Class for the pool of processes fitting ARIMA models.
+
+    Each worker receives one fit at a time through its pipe. The parent checks the time of
+    each fit, and terminates a worker still fitting after the timeout, even stuck in the C
+    code of statsmodels, then replaces it. The pool can be reused for several batches.
+    """
+
+    def __init__(self, max_workers=None):
+        """Initialisation.
+
+        Args:
+            max_workers (int, optional): number of processes. Defaults to None (number of cores).
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.workers = []
+
+    def _start(self):
+        """Start a worker.
+
+        Returns:
+            tuple: process and end of the pipe of the parent
+        """
+        parent, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=_work, args=(child,), daemon=True)
+        process.start()
+        child.close()
+        worker = (process, parent)
+        self.workers.append(worker)
+        return worker
+
+    def _stop(self, worker):
+        """Terminate a worker.
+
+        Args:
+            worker (tuple): process and end of the pipe of the parent
+        """
+        process, parent = worker
+        process.kill()
+        process.join()
+        parent.close()
+        self.workers.remove(worker)
+
+    def fit(self, tasks, timeout=None):
+        """Fit models.
+
+        Args:
+            tasks (list): name, training series and order (p, d, q) of each model
+            timeout (float, optional): maximum time of each fit, in seconds. Defaults to None (no maximum).
+
+        Returns:
+            tuple: fitted models per name, time of each fit (pd.Series) and errors per name
+        """
+        models, fit_times, failures = {}, {}, {}
+        pending = list(reversed(tasks))
+        idle = list(self.workers)
+        while len(self.workers) < min(self.max_workers, len(tasks)):
+            idle.append(self._start())
+
+        running = {}
+        while pending or running:
+            while pending and idle:
+                worker = idle.pop()
+                name, series, order = pending.pop()
+                worker[1].send((name, series, order))
+                running[worker[1]] = (worker, name, time.perf_counter())
+
+            wait_time = None
+            if timeout is not None:
+                oldest = min(start for _, _, start in running.values())
+                wait_time = max(0.0, oldest + timeout - time.perf_counter())
+            for connection in wait(list(running), timeout=wait_time):
+                worker, name, start = running.pop(connection)
+                try:
+                    name, model, seconds, error = connection.recv()
+                except EOFError:
+                    # the worker died during the fit
+                    self._stop(worker)
+                    worker = self._start()
+                    model, seconds = None, time.perf_counter() - start
+                    error = "RuntimeError: The worker stopped during the fit."
+                fit_times[name] = seconds
+                if error is None:
+                    models[name] = model
+                else:
+                    failures[name] = error
+                idle.append(worker)
+
+            if timeout is None:
+                continue
+            now = time.perf_counter()
+            for connection, (worker, name, start) in list(running.items()):
+                if now - start >= timeout:
+                    del running[connection]
+                    self._stop(worker)
+                    idle.append(self._start())
+                    fit_times[name] = now - start
+                    failures[name] = TIMEOUT_ERROR
+        return models, pd.Series(fit_times, dtype=float), failures
+
+    def close(self):
+        """Stop the workers."""
+        for process, parent in self.workers:
+            parent.send(None)
+        for process, parent in self.workers:
+            process.join()
+            parent.close()
+        self.workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def fit_models(series, order=(1, 1, 1), max_workers=None, timeout=None, pool=None):
+    """Fit ARIMA models of several companies in parallel.
+
+    We fit one ARIMAModel per company in a pool of processes, so the fits use all the
+    cores. A fit failing or longer than the timeout is reported, without stopping the others.
+
+    Args:
+        series (dict): training series per company
+        order (tuple or dict, optional): order (p, d, q) of the models, or order per company. Defaults to (1, 1, 1).
+        max_workers (int, optional): number of processes. Defaults to None (number of cores).
+        timeout (float, optional): maximum time of each fit, in seconds. Defaults to None (no maximum).
+        pool (FitPool, optional): pool of processes to reuse. Defaults to None (a new pool).
+
+    Returns:
+        tuple: fitted models per company, time of each fit (pd.Series) and errors per company
+    """
+    orders = order if isinstance(order, dict) else {name: order for name in series}
+    tasks = [(name, data, tuple(orders[name])) for name, data in series.items()]
+    if pool is not None:
+        return pool.fit(tasks, timeout=timeout)
+    with FitPool(max_workers) as pool:
+        return pool.fit(tasks, timeout=timeout)
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+import pandas as pd
+
+
+class ModelCache:
+    """Class for the cache of the fitted models, saved on disk.
+
+    A model is found again only if it has the same company, order and training series
+    (same dates and values). The least recently used models are removed when the cache
+    is full, and the hits and misses are counted to follow the savings.
+    """
+
+    def __init__(self, root="data/models", max_size=64):
+        """Initialisation.
+
+        Args:
+            root (str, optional): folder where the models are saved. Defaults to "data/models".
+            max_size (int, optional): maximum number of models in the cache. Defaults to 64.
+        """
+        self.root = root
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(series):
+        """Get the fingerprint of a series.
+
+        Args:
+            series (pd.Series): series, index dated
+
+        Returns:
+            str: hash of the dates and values of the series
+        """
+        hashed = pd.util.hash_pandas_object(series, index=True).to_numpy()
+        return hashlib.sha256(hashed.tobytes()).hexdigest()[:16]
+
+    def key(self, name_company, order, series):
+        """Get the key of a model.
+
+        Args:
+            name_company (str): name of the company. If None, the key only depends on the
+                order and the series.
+            order (tuple): order (p, d, q) of the model
+            series (pd.Series): training series
+
+        Returns:
+            str: key of the model
+        """
+        p, d, q = order
+        key = f"{p}_{d}_{q}_{self.fingerprint(series)}"
+        return key if name_company is None else f"{name_company}_{key}"
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.pkl")
+
+    def get(self, key):
+        """Get a model.
+
+        A model removed or being written by another process, or which cannot be loaded,
+        is a miss.
+
+        Args:
+            key (str): key of the model
+
+        Returns:
+            object: fitted model, or None if it is not in the cache
+        """
+        path = self._path(key)
+        with self.lock:
+            try:
+                with open(path, "rb") as f:
+                    model = pickle.load(f)
+                # the time of last modification orders the models by last use
+                os.utime(path)
+            except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return model
+
+    def set(self, key, model):
+        """Set a model.
+
+        Args:
+            key (str): key of the model
+            model (object): fitted model
+        """
+        with self.lock:
+            os.makedirs(self.root, exist_ok=True)
+            # written in a file of this writer then renamed, so other processes never
+            # read a partial model
+            with tempfile.NamedTemporaryFile(
+                dir=self.root, suffix=".tmp", delete=False
+            ) as f:
+                pickle.dump(model, f)
+            os.replace(f.name, self._path(key))
+            self._evict()
+
+    def _evict(self):
+        """Remove the least recently used models, above the maximum size."""
+        last_used = {}
+        for file in os.listdir(self.root):
+            if not file.endswith(".pkl"):
+                continue
+            path = os.path.join(self.root, file)
+            try:
+                last_used[path] = os.path.getmtime(path)
+            except FileNotFoundError:
+                # removed by another process
+                continue
+        paths = sorted(last_used, key=last_used.get)
+        for path in paths[: max(0, len(paths) - self.max_size)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+
+    def stats(self):
+        """Get the statistics of the cache.
+
+        Returns:
+            dict: hits, misses, hit rate and number of models saved
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self),
+        }
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def __len__(self):
+        if not os.path.exists(self.root):
+            return 0
+        return len([file for file in os.listdir(self.root) if file.endswith(".pkl")])
@@ -0,0 +1,118 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from pmdarima.arima import ndiffs
+
+from .batch import FitPool, fit_models
+
+
+def difference(series, d):
+    """Difference a series.
+
+    Args:
+        series (pd.Series): series
+        d (int): order of differencing
+
+    Returns:
+        pd.Series: series differenced d times
+    """
+    for _ in range(d):
+        series = series.diff().iloc[1:]
+    return series
+
+
+def search_order(
+    series,
+    p_values=range(4),
+    d_values=range(3),
+    q_values=range(4),
+    criterion="aic",
+    margin=10.0,
+    max_workers=None,
+    timeout=None,
+    test="kpss",
+):
+    """Search the order (p, d, q) of an ARIMA model.
+
+    The information criteria of different orders of differencing are on different data, so
+    they cannot be compared: d is chosen first with a unit root test, as the smallest order
+    of d_values after which the series is stationary. The series is differenced d times, and
+    an ARMA(p, q) is fitted on the differenced series: it has the same information criterion
+    as the ARIMA(p, d, q) on the series. The candidates are fitted in one pool of processes,
+    by number of parameters p + q. A candidate is pruned when the smaller candidates it
+    extends, (p - 1, q) and (p, q - 1), are all beaten by the best candidate by more than
+    the margin.
+
+    Args:
+        series (pd.Series): training series
+        p_values (list, optional): orders of the autoregressive component. Defaults to range(4).
+        d_values (list, optional): orders of differencing. Defaults to range(3).
+        q_values (list, optional): orders of the moving average component. Defaults to range(4).
+        criterion (str, optional): 'aic', 'aicc', 'bic' or 'hqic'. Defaults to "aic".
+        margin (float, optional): difference of criterion from which a candidate is clearly beaten. Defaults to 10.0.
+        max_workers (int, optional): number of processes. Defaults to None (number of cores).
+        timeout (float, optional): maximum time of each fit, in seconds. Defaults to None (no maximum).
+        test (str, optional): unit root test choosing d: 'kpss', 'adf' or 'pp'. Defaults to "kpss".
+
+    Returns:
+        pd.DataFrame: candidates of the order of differencing chosen, ranked by criterion,
+            with their fit time, and whether they were fitted, pruned or failed
+    """
+    d_values = sorted(d_values)
+    d = d_values[0]
+    if len(d_values) > 1:
+        needed = ndiffs(series.to_numpy(dtype=float), test=test, max_d=d_values[-1])
+        d = next(value for value in d_values if value >= needed)
+    differenced = difference(series, d)
+
+    candidates = list(itertools.product(p_values, [d], q_values))
+    results = {
+        order: {
+            "status": "pruned",
+            criterion: np.nan,
+            "fit_time": np.nan,
+            "error": None,
+        }
+        for order in candidates
+    }
+    best = np.inf
+
+    def beaten(p, d, q):
+        parents = [(p - 1, d, q), (p, d, q - 1)]
+        parents = [order for order in parents if order in results]
+        if len(parents) == 0:
+            return False
+        return all(not results[order][criterion] <= best + margin for order in parents)
+
+    with FitPool(max_workers) as pool:
+        for level in sorted({p + q for p, _, q in candidates}):
+            orders = [
+                (p, d, q)
+                for p, d, q in candidates
+                if p + q == level and not beaten(p, d, q)
+            ]
+            models, fit_times, failures = fit_models(
+                {order: differenced for order in orders},
+                order={(p, d, q): (p, 0, q) for p, d, q in orders},
+                timeout=timeout,
+                pool=pool,
+            )
+            for order in orders:
+                result = results[order]
+                result["fit_time"] = fit_times[order]
+                if order in failures:
+                    result["status"] = "failed"
+                    result["error"] = failures[order]
+                    continue
+                result["status"] = "fitted"
+                result[criterion] = models[order].information_criterion(criterion)
+                best = min(best, result[criterion])
+
+    table = pd.DataFrame.from_dict(results, orient="index")
+    table.index = pd.MultiIndex.from_tuples(table.index, names=["p", "d", "q"])
+    table = table.sort_values([criterion, "fit_time"], na_position="last")
+    table.insert(0, "rank", np.arange(1, len(table) + 1))
+    table.loc[table["status"] != "fitted", "rank"] = np.nan
+    return table
@@ -0,0 +1,257 @@
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+from .cusum import Cusum, decision_interval, tabular_cusum
+from .ewma import Ewma, month_ends
+from .shewhart import Shewhart
+
+
+def _matrix(prices):
+    """Get the price matrix.
+
+    Args:
+        prices (pd.DataFrame): prices, index dated, with one column per company
+
+    Returns:
+        tuple: values (companies × time), mask of the values available
+    """
+    values = prices.to_numpy(dtype=float).T
+    return values, ~np.isnan(values)
+
+
+def shewhart_statistics(prices, filter_iqr=False):
+    """Compute the Shewhart statistics of several companies.
+
+    We compute the average, standard deviation and points beyond the warning and action
+    lines of every company at once, as Shewhart does for one series.
+
+    Args:
+        prices (pd.DataFrame): prices, index dated, with one column per company
+        filter_iqr (bool, optional): Choice if we filter for IQR or not. Defaults to False.
+
+    Returns:
+        pd.DataFrame: statistics, with one row per company
+    """
+    values, valid = _matrix(prices)
+    if filter_iqr:
+        lower_q, upper_q = np.nanquantile(values, [0.25, 0.75], axis=1, keepdims=True)
+        iqr = upper_q - lower_q
+        valid &= (values >= lower_q - 1.5 * iqr) & (values <= upper_q + 1.5 * iqr)
+        values = np.where(valid, values, np.nan)
+
+    m = np.nanmean(values, axis=1, keepdims=True)
+    s = np.nanstd(values, axis=1, ddof=1, keepdims=True)
+    z = np.abs(values - m) / s
+    return pd.DataFrame(
+        {
+            "average": m[:, 0],
+            "std": s[:, 0],
+            "shewhart_warning": (valid & (z > Shewhart.WARNING)).sum(axis=1),
+            "shewhart_action": (valid & (z > Shewhart.ACTION)).sum(axis=1),
+        },
+        index=prices.columns,
+    )
+
+
+def ewma_statistics(prices, control_multiple=5, smoothing_factor=0.3):
+    """Compute the EWMA statistics of several companies.
+
+    We compute the EWMA and its control limits of every company at once, as Ewma does for
+    the prices of the company without the missing ones (days without trading). A company
+    without any price has no EWMA and no breach.
+
+    Args:
+        prices (pd.DataFrame): prices, index dated, with one column per company
+        control_multiple (int or float, optional): Scalar multiple applied to control limits. Defaults to 5.
+        smoothing_factor (float, optional): Smoothing factor or weight applied to most recent observation. Defaults to 0.3.
+
+    Returns:
+        pd.DataFrame: statistics, with one row per company
+    """
+    values, valid = _matrix(prices)
+    n_companies, n_dates = values.shape
+    n_valid = valid.sum(axis=1)
+    if n_dates == 0:
+        return pd.DataFrame({"ewma": np.nan, "ewma_breaches": 0}, index=prices.columns)
+
+    # the prices available of each company first, in their order, and the missing ones last
+    order = np.argsort(~valid, axis=1, kind="stable")
+    packed = np.take_along_axis(values, order, axis=1)
+    packed_valid = np.arange(n_dates)[None, :] < n_valid[:, None]
+
+    # number of months covered by each company, as in Ewma
+    first = prices.index[valid.argmax(axis=1)]
+    last = prices.index[n_dates - 1 - valid[:, ::-1].argmax(axis=1)]
+    n = np.maximum(month_ends(first, last), 1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m = np.nansum(values, axis=1) / n_valid
+        s = np.sqrt(np.nansum((values - m[:, None]) ** 2, axis=1) / (n_valid - 1))
+        scale = (control_multiple * s) / np.sqrt(n)
+
+        ewma, _ = lfilter(
+            [smoothing_factor],
+            [1, smoothing_factor - 1],
+            packed,
+            axis=1,
+            zi=(1 - smoothing_factor) * packed[:, :1],
+        )
+        i = np.arange(1, n_dates + 1)[None, :]
+        tolerance = scale[:, None] * np.sqrt(
+            (smoothing_factor / (2 - smoothing_factor))
+            * (1 - (1 - smoothing_factor) ** (2 * i))
+        )
+        breaches = packed_valid & (np.abs(ewma - m[:, None]) > tolerance)
+
+    last_ewma = ewma[np.arange(n_companies), np.maximum(n_valid - 1, 0)]
+    return pd.DataFrame(
+        {
+            "ewma": np.where(n_valid > 0, last_ewma, np.nan),
+            "ewma_breaches": breaches.sum(axis=1),
+        },
+        index=prices.columns,
+    )
+
+
+def cusum_statistics(prices):
+    """Compute the CUSUM statistics of several companies.
+
+    We compute the tabular CUSUM of every company at once, with the same reference value
+    and decision intervals as Cusum. The missing prices do not move the CUSUM.
+
+    Args:
+        prices (pd.DataFrame): prices, index dated, with one column per company
+
+    Returns:
+        pd.DataFrame: statistics, with one row per company
+    """
+    values, valid = _matrix(prices)
+    m = np.nanmean(values, axis=1, keepdims=True)
+    s = np.nanstd(values, axis=1, ddof=1, keepdims=True)
+    k = Cusum.DELTA / 2 * s
+
+    # a missing price is replaced by target + k and target - k: both steps are 0
+    s_hi, _ = tabular_cusum(np.where(valid, values, m + k), m, k)
+    _, s_lo = tabular_cusum(np.where(valid, values, m - k), m, k)
+
+    h_warning = decision_interval(Cusum.WARNING, Cusum.DELTA, Cusum.BETA) * s
+    h_action = decision_interval(Cusum.ACTION, Cusum.DELTA, Cusum.BETA) * s
+    s_max = np.maximum(s_hi, s_lo)
+    return pd.DataFrame(
+        {
+            "cusum_hi": s_hi[:, -1],
+            "cusum_lo": s_lo[:, -1],
+            "cusum_warning": (valid & (s_max > h_warning)).sum(axis=1),
+            "cusum_action": (valid & (s_max > h_action)).sum(axis=1),
+        },
+        index=prices.columns,
+    )
+
+
+def batch_statistics(
+    prices, filter_iqr=False, control_multiple=5, smoothing_factor=0.3
+):
+    """Compute the statistics of the control charts of several companies.
+
+    We compute the Shewhart, EWMA and CUSUM statistics of all companies in vectorised
+    passes, without building any figure. The prices are aligned, for example by
+    FinancialDataSet.get_history.
+
+    Args:
+        prices (pd.DataFrame): prices, index dated, with one column per company
+        filter_iqr (bool, optional): Choice if we filter for IQR or not (Shewhart). Defaults to False.
+        control_multiple (int or float, optional): Scalar multiple applied to control limits (EWMA). Defaults to 5.
+        smoothing_factor (float, optional): Smoothing factor or weight applied to most recent observation (EWMA).
+            Defaults to 0.3.
+
+    Returns:
+        pd.DataFrame: statistics, with one row per company, and whether each chart breaches
+    """
+    statistics = pd.concat(
+        [
+            shewhart_statistics(prices, filter_iqr),
+            ewma_statistics(prices, control_multiple, smoothing_factor),
+            cusum_statistics(prices),
+        ],
+        axis=1,
+    )
+    statistics["last"] = prices.ffill().iloc[-1] if len(prices) else np.nan
+    statistics["breach"] = (
+        (statistics["shewhart_action"] > 0)
+        | (statistics["ewma_breaches"] > 0)
+        | (statistics["cusum_action"] > 0)
+    )
+    return statistics
+
+
+def breach_figures(
+    prices,
+    statistics,
+    bought_values=None,
+    xlab="Date",
+    ylab="Price",
+    y_format="pound",
+    filter_iqr=False,
+    control_multiple=5,
+    smoothing_factor=0.3,
+):
+    """Build the charts of the companies that breach.
+
+    We only build the charts that breach, for the companies that breach.
+
+    Args:
+        prices (pd.DataFrame): prices, index dated, with one column per company
+        statistics (pd.DataFrame): statistics from batch_statistics
+        bought_values (dict, optional): bought value per company. Defaults to None.
+        xlab (str, optional): X-axis title. Defaults to "Date".
+        ylab (str, optional): Y-axis title. Defaults to "Price".
+        y_format (str, optional): format of the y axis. Defaults to "pound".
+        filter_iqr (bool, optional): Choice if we filter for IQR or not (Shewhart). Defaults to False.
+        control_multiple (int or float, optional): Scalar multiple applied to control limits (EWMA). Defaults to 5.
+        smoothing_factor (float, optional): Smoothing factor or weight applied to most recent observation (EWMA).
+            Defaults to 0.3.
+
+    Returns:
+        dict: charts per company, then per chart ('shewhart', 'ewma' or 'cusum')
+    """
+    bought_values = {} if bought_values is None else bought_values
+    charts = {}
+    for name, row in statistics[statistics["breach"]].iterrows():
+        pd_ts = prices[name].dropna()
+        bought_value = bought_values.get(name)
+        charts[name] = {}
+        if row["shewhart_action"] > 0:
+            charts[name]["shewhart"] = Shewhart(
+                pd_ts,
+                bought_value,
+                f"Shewhart chart of {name}",
+                xlab,
+                ylab,
+                name,
+                y_format,
+                filter_iqr=filter_iqr,
+            )
+        if row["ewma_breaches"] > 0:
+            charts[name]["ewma"] = Ewma(
+                pd_ts,
+                bought_value,
+                f"EWMA chart of {name}",
+                xlab,
+                ylab,
+                name,
+                y_format,
+                control_multiple=control_multiple,
+                smoothing_factor=smoothing_factor,
+            )
+        if row["cusum_action"] > 0:
+            charts[name]["cusum"] = Cusum(
+                pd_ts,
+                bought_value,
+                f"CUSUM chart of {name}",
+                xlab,
+                ylab,
+                name,
+                y_format,
+            )
+    return charts
@@ -7,10 +7,60 @@ import plotly.graph_objects as go
 import plotly.subplots as sp
 import scipy.stats
 
+from .figure_factory import figures
 from .timeseries import TimeSeries
 
 
+def tabular_cusum(values, target, k, s_hi_start=0.0, s_lo_start=0.0):
+    """Compute the two-sided tabular CUSUM.
+
+    S_hi[t] = max(0, S_hi[t-1] + x[t] - (target + k)) and
+    S_lo[t] = max(0, S_lo[t-1] + (target - k) - x[t]), computed without a Python loop:
+    each recursion is the cumulative sum minus its running minimum. A 2-D array holds one
+    series per row, with target and k as columns (shape (rows, 1)).
+
+    Args:
+        values (np.ndarray): values of the series, along the last axis
+        target (float or np.ndarray): target (in control) average
+        k (float or np.ndarray): reference value (allowance)
+        s_hi_start (float, optional): S_hi before these values. Defaults to 0.0.
+        s_lo_start (float, optional): S_lo before these values. Defaults to 0.0.
+
+    Returns:
+        tuple: arrays S_hi and S_lo
+    """
+    values = np.asarray(values, dtype=float)
+
+    def reflected_walk(steps, start):
+        walk = np.cumsum(steps, axis=-1)
+        return walk + np.maximum(start, -np.minimum.accumulate(walk, axis=-1))
+
+    s_hi = reflected_walk(values - (target + k), s_hi_start)
+    s_lo = reflected_walk((target - k) - values, s_lo_start)
+    return s_hi, s_lo
+
+
+def decision_interval(z, delta, beta):
+    """Compute the decision interval of the tabular CUSUM, in standard deviations.
+
+    We use the design of the equivalent V-mask: h = ln((1 - beta) / alpha) / delta,
+    where alpha is the false alarm probability of a Shewhart line at z standard deviations.
+
+    Args:
+        z (float): number of standard deviations of the matching Shewhart line
+        delta (float): shift to detect, in standard deviations
+        beta (float): probability of missing the shift
+
+    Returns:
+        float: decision interval, in standard deviations
+    """
+    alpha = 2 * scipy.stats.norm.sf(z)
+    return np.log((1 - beta) / alpha) / delta
+
+
 class Cusum(TimeSeries):
+    CHART = "cusum"
+
     WARNING = 2.0
     ACTION = 3.0
 
@@ -18,40 +68,64 @@ class Cusum(TimeSeries):
     DELTA = 1.0
 
     def __init__(
-        self, pd_ts, bought_value, title, xlab, ylab, label, y_format, filter_iqr=False
+        self,
+        pd_ts,
+        bought_value,
+        title,
+        xlab,
+        ylab,
+        label,
+        y_format,
+        filter_iqr=False,
+        max_points=None,
+        downsample="lttb",
     ):
         m = pd_ts.mean()
 
-        # print(S_lo)
         # calculate running cusum
-        running_cusum = pd_ts.cumsum() - [n * m for n in range(1, 1 + len(pd_ts))]
-
-        if bought_value is None:
-            self.benefit = None
-        else:
-            self.benefit = (pd_ts - bought_value) / bought_value
-        self.pd_ts = pd_ts
-        self.title = title
-        self.xlab = xlab
-        self.ylab = ylab
-        self.label = label
-        self.y_format = y_format
-
-        # Create figure with secondary y-axis
-        fig = sp.make_subplots(specs=[[{"secondary_y": True}]])
+        running_cusum = pd_ts.cumsum() - m * np.arange(1, 1 + len(pd_ts))
+
+        # calculate the tabular cusum and its alarms
+        self.state = CusumState(m, pd_ts.std())
+        self.cusum = self.state.update(pd_ts)
+        self.alarms = self.state.alarms
+
+        super().__init__(
+            pd_ts,
+            bought_value,
+            title,
+            xlab,
+            ylab,
+            label,
+            y_format,
+            max_points=max_points,
+            downsample=downsample,
+        )
+        self.average = m
+        self.running_cusum = running_cusum
+
+    def _build_fig(self):
+        """Build the figure.
+
+        We build the figure of the series, with the running cusum on the secondary y-axis.
+
+        Returns:
+            go.Figure: figure of the plot
+        """
+        # figure with secondary y-axis
+        fig = figures.new(self.CHART, self.y_format, self.title, self.xlab, self.ylab)
 
         fig.add_trace(
-            go.Scatter(
-                x=pd_ts.index,
-                y=pd_ts,
+            self._scatter(
+                self.pd_ts,
                 mode="lines",
                 line=dict(color=TimeSeries.COLOURS[0], width=2, dash="solid"),
                 showlegend=True,
-                name=label,
+                name=self.label,
             )
         )
         fig.add_hline(
-            y=m,
+            y=self.average,
             line_width=2,
             line_dash="dash",
             line_color=TimeSeries.COLOURS[1],
@@ -61,123 +135,89 @@ class Cusum(TimeSeries):
             annotation_font_color=TimeSeries.COLOURS[1],
         )
         fig.add_trace(
-            go.Scatter(
-                x=pd_ts.index,
-                y=running_cusum,
+            self._scatter(
+                self.running_cusum,
                 line=dict(color=TimeSeries.COLOURS[2], width=2, dash="solid"),
                 showlegend=False,
             ),
             secondary_y=True,
         )
+        return fig
 
-        fig.update_layout(
-            plot_bgcolor="white",
-            legend=dict(
-                x=0.9,
-                xanchor="auto",
-                yanchor="auto",
-            ),
-            title={
-                "text": title,
-                "y": 0.9,
-                "x": 0.5,
-                "xanchor": "center",
-                "yanchor": "bottom",
-                "font": dict(size=20, color="black"),
-            },
-            xaxis={
-                "title": xlab,
-                "showgrid": True,
-                "gridwidth": 1,
-                "gridcolor": "lightgrey",
-                "linecolor": "black",
-                "mirror": True,
-                "ticks": "outside",
-                "showline": True,
-                "titlefont": dict(size=16, color="black"),
-            },
-            yaxis={
-                "title": ylab,
-                "showgrid": True,
-                "gridwidth": 1,
-                "gridcolor": "lightgrey",
-                "linecolor": "black",
-                "mirror": True,
-                "ticks": "outside",
-                "showline": True,
-                "titlefont": dict(size=16, color="black"),
-            },
-            yaxis2=dict(
-                title="Cumulative sum vs average",
-                titlefont=dict(color=TimeSeries.COLOURS[2]),
-                tickfont=dict(color=TimeSeries.COLOURS[2]),
-                side="right",
-            ),
-            xaxis_tickformat="%Y-%m",
-            xaxis_dtick="M1",
-        )
 
-        if y_format == "pct":
-            fig.update_layout(yaxis_tickformat="~%")
-        elif y_format == "pound":
-            fig.update_layout(yaxis_tickprefix="£ ")
-        if y_format == "integer":
-            fig.update_layout(yaxis_tickformat="~s")
-        if y_format == "numeric":
-            fig.update_layout(yaxis_tickformat="~s")
-        else:
-            fig.update_layout(yaxis_tickformat="~s")
+class CusumState:
+    """State of a tabular CUSUM, updated one batch of points at a time.
 
-        self.fig = fig
+    The reference value is k = DELTA / 2 standard deviations. The warning and action
+    decision intervals are designed from the WARNING and ACTION lines and BETA.
+    """
 
-    def defaut_layout(self):
-        """Set the layout back to default.
+    def __init__(
+        self,
+        target,
+        sigma,
+        delta=Cusum.DELTA,
+        beta=Cusum.BETA,
+        warning=Cusum.WARNING,
+        action=Cusum.ACTION,
+    ):
+        """Initialisation.
 
-        Used to set the layout to default - in case we did too many changes and want to go back to default.
+        Args:
+            target (float): target (in control) average
+            sigma (float): standard deviation of the series in control
+            delta (float, optional): shift to detect, in standard deviations. Defaults to Cusum.DELTA.
+            beta (float, optional): probability of missing the shift. Defaults to Cusum.BETA.
+            warning (float, optional): standard deviations of the warning line. Defaults to Cusum.WARNING.
+            action (float, optional): standard deviations of the action line. Defaults to Cusum.ACTION.
         """
-        self.fig.update_layout(
-            plot_bgcolor="white",
-            legend=dict(
-                x=0.9,
-                xanchor="auto",
-                yanchor="auto",
-            ),
-            title={
-                "text": self.title,
-                "y": 0.9,
-                "x": 0.5,
-                "xanchor": "center",
-                "yanchor": "bottom",
-                "font": dict(size=20, color="black"),
-            },
-            xaxis={
-                "title": self.xlab,
-                "showgrid": True,
-                "gridwidth": 1,
-                "gridcolor": "lightgrey",
-                "linecolor": "black",
-                "mirror": True,
-                "ticks": "outside",
-                "showline": True,
-                "titlefont": dict(size=16, color="black"),
-            },
-            yaxis={
-                "title": self.ylab,
-                "showgrid": True,
-                "gridwidth": 1,
-                "gridcolor": "lightgrey",
-                "linecolor": "black",
-                "mirror": True,
-                "ticks": "outside",
-                "showline": True,
-                "titlefont": dict(size=16, color="black"),
-            },
-            yaxis2=dict(
-                title="Cumulative sum vs average",
-                titlefont=dict(color=TimeSeries.COLOURS[2]),
-                tickfont=dict(color=TimeSeries.COLOURS[2]),
-                side="right",
-            ),
-            xaxis_tickformat="%Y-%m",
-            xaxis_dtick="M1",
+        self.target = target
+        self.sigma = sigma
+        self.k = delta / 2 * sigma
+        self.h_warning = decision_interval(warning, delta, beta) * sigma
+        self.h_action = decision_interval(action, delta, beta) * sigma
+        self.s_hi = 0.0
+        self.s_lo = 0.0
+        self.alarms = pd.DataFrame(columns=["s_hi", "s_lo", "side", "limit"])
+
+    def update(self, new_points):
+        """Update with new points.
+
+        Args:
+            new_points (pd.Series): new points, index dated
+
+        Returns:
+            pd.DataFrame: S_hi and S_lo of the new points
+        """
+        s_hi, s_lo = tabular_cusum(
+            new_points.to_numpy(), self.target, self.k, self.s_hi, self.s_lo
         )
+        if len(s_hi) > 0:
+            self.s_hi, self.s_lo = s_hi[-1], s_lo[-1]
+
+        cusum = pd.DataFrame({"s_hi": s_hi, "s_lo": s_lo}, index=new_points.index)
+        alarms = self.alarm_indices(s_hi, s_lo)
+        if len(alarms) > 0:
+            found = cusum.iloc[alarms].copy()
+            found["side"] = np.where(found["s_hi"] > found["s_lo"], "upper", "lower")
+            found["limit"] = np.where(
+                found[["s_hi", "s_lo"]].max(axis=1) > self.h_action,
+                "action",
+                "warning",
+            )
+            self.alarms = pd.concat([self.alarms, found]) if len(self.alarms) else found
+        return cusum
+
+    def alarm_indices(self, s_hi, s_lo, limit="warning"):
+        """Get alarm indices.
+
+        Args:
+            s_hi (np.ndarray): S_hi of the points
+            s_lo (np.ndarray): S_lo of the points
+            limit (str, optional): 'warning' or 'action'. Defaults to "warning".
+
+        Returns:
+            np.ndarray: positions of the points beyond the decision interval
+        """
+        h = self.h_action if limit == "action" else self.h_warning
+        return np.flatnonzero((np.asarray(s_hi) > h) | (np.asarray(s_lo) > h))
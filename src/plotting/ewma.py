@@ -3,16 +3,199 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import plotly.subplots as sp
+from scipy.signal import lfilter
 
+from .rolling import rolling_limits, window_months, window_tail
 from .timeseries import TimeSeries
 
 
+def ewma_filter(values, smoothing_factor, initial=None):
+    """Compute an EWMA.
+
+    We compute ewma[j] = smoothing_factor * values[j] + (1 - smoothing_factor) * ewma[j - 1]
+    as a recursive linear filter, without a Python loop.
+
+    Args:
+        values (np.ndarray): values to smooth
+        smoothing_factor (float): weight applied to most recent observation
+        initial (float, optional): last smoothed value before these values. Defaults to None
+            (the EWMA starts at the first value).
+
+    Returns:
+        np.ndarray: smoothed values
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return values
+    if initial is None:
+        initial = values[0]
+    ewma, _ = lfilter(
+        [smoothing_factor],
+        [1, smoothing_factor - 1],
+        values,
+        zi=[(1 - smoothing_factor) * initial],
+    )
+    return ewma
+
+
+def month_ends(first, last):
+    """Count the month ends between dates.
+
+    We count them as len(pd.date_range(first, last, freq="M")), the number of months used
+    by Ewma, for arrays of dates at once.
+
+    Args:
+        first (pd.DatetimeIndex): first dates
+        last (pd.DatetimeIndex): last dates, not before the first ones
+
+    Returns:
+        np.ndarray: number of month ends between each first and last date
+    """
+    first = pd.DatetimeIndex(first)
+    last = pd.DatetimeIndex(last)
+    months = np.asarray((last.year - first.year) * 12 + (last.month - first.month))
+    # the month ends are at the time of day of the first date. As in pd.date_range, the
+    # last date is only rolled back to the previous month end if the first date is a month end
+    not_earlier = np.asarray((last - last.normalize()) >= (first - first.normalize()))
+    last_month_end = np.asarray(last.is_month_end)
+    return np.where(
+        first.is_month_end,
+        months - 1 + not_earlier + last_month_end,
+        months + (last_month_end & not_earlier),
+    )
+
+
+def ewma_grid(values, smoothing_factors):
+    """Compute the EWMA for several smoothing factors.
+
+    Args:
+        values (np.ndarray): values to smooth
+        smoothing_factors (list): smoothing factors
+
+    Returns:
+        np.ndarray: smoothed values, with one row per smoothing factor
+    """
+    values = np.asarray(values, dtype=float)
+    grid = np.empty((len(smoothing_factors), len(values)))
+    # each row is a recursive filter in C: only the smoothing factors are looped over
+    for row, smoothing_factor in enumerate(smoothing_factors):
+        grid[row] = ewma_filter(values, smoothing_factor)
+    return grid
+
+
+def ewma_sweep(pd_ts, smoothing_factors, control_multiples=(5,), change_at=None):
+    """Sweep the parameters of the EWMA.
+
+    We compute the EWMA and control limits of Ewma for all the smoothing factors and control
+    multiples at once, as (control multiples × smoothing factors × time) arrays, and count
+    the points beyond the limits of each combination.
+
+    Args:
+        pd_ts (pd.Series or pd.DataFrame): Series, index dated, or prices with one column per company
+        smoothing_factors (list): smoothing factors
+        control_multiples (list, optional): scalar multiples applied to control limits. Defaults to (5,).
+        change_at (str or pd.Timestamp, optional): date of a known change. If given, the breaches before
+            it are false alarms and the delay is the number of points until the first breach from it.
+            Defaults to None.
+
+    Returns:
+        pd.DataFrame: breaches, first breach (and false alarms and delay), per combination
+            (and per company)
+    """
+    if isinstance(pd_ts, pd.DataFrame):
+        return pd.concat(
+            {
+                name: ewma_sweep(
+                    column.dropna(), smoothing_factors, control_multiples, change_at
+                )
+                for name, column in pd_ts.items()
+            },
+            names=["company"],
+        )
+
+    smoothing_factors = np.asarray(smoothing_factors, dtype=float)
+    control_multiples = np.asarray(control_multiples, dtype=float)
+    values = pd_ts.to_numpy(dtype=float)
+    if len(values) == 0:
+        # a company without prices has no breach
+        m, s, n = np.nan, np.nan, 1
+    else:
+        m = values.mean()
+        s = values.std(ddof=1)
+        n = max(len(pd.date_range(pd_ts.index.min(), pd_ts.index.max(), freq="M")), 1)
+
+    # distance to the average, in units of the limits of a control multiple of 1
+    lam = smoothing_factors[:, None]
+    i = np.arange(1, len(values) + 1)[None, :]
+    unit = (s / np.sqrt(n)) * np.sqrt((lam / (2 - lam)) * (1 - (1 - lam) ** (2 * i)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        distance = np.abs(ewma_grid(values, smoothing_factors) - m) / unit
+    breach = distance[None, :, :] > control_multiples[:, None, None]
+
+    start = 0
+    if change_at is not None:
+        start = int(pd_ts.index.searchsorted(pd.Timestamp(change_at)))
+    after = breach[:, :, start:]
+    found = after.any(axis=2)
+    # no point after the change (or no point at all): no first breach
+    first_after = after.argmax(axis=2) if after.shape[2] > 0 else np.zeros_like(found)
+    first = np.where(found, first_after + start, -1)
+
+    table = pd.DataFrame(
+        {
+            "breaches": breach.sum(axis=2).ravel(),
+            "first_breach": [
+                pd_ts.index[j] if j >= 0 else pd.NaT for j in first.ravel()
+            ],
+        },
+        index=pd.MultiIndex.from_product(
+            [control_multiples, smoothing_factors],
+            names=["control_multiple", "smoothing_factor"],
+        ),
+    )
+    if change_at is not None:
+        table["false_alarms"] = breach[:, :, :start].sum(axis=2).ravel()
+        table["delay"] = np.where(found, first - start, np.nan).ravel()
+    return table.swaplevel().sort_index()
+
+
+class _Chunked:
+    """Attribute of a series extended by chunks.
+
+    The chunks appended are only concatenated when the series is read, so appending new
+    points does not copy the points already in the series.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = f"_{name}"
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        chunks = obj.__dict__[self.name]
+        if len(chunks) > 1:
+            chunks[:] = [pd.concat(chunks)]
+        return chunks[0]
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = [value]
+
+
 class Ewma(TimeSeries):
     """Base class for EWMA time series.
 
     This class sets up all EWMA time series plots.
     """
 
+    # series extended by update
+    pd_ts = _Chunked()
+    values = _Chunked()
+    benefit = _Chunked()
+    average = _Chunked()
+    scale = _Chunked()
+    control_upper = _Chunked()
+    control_lower = _Chunked()
+
     def __init__(
         self,
         pd_ts,
@@ -24,6 +207,9 @@ class Ewma(TimeSeries):
         y_format,
         control_multiple=5,
         smoothing_factor=0.3,
+        max_points=None,
+        downsample="lttb",
+        window=None,
     ):
         """The initialisation of EWMA series.
 
@@ -39,63 +225,186 @@ class Ewma(TimeSeries):
             y_format (str): format of the y axis: 'pct', 'pound','integer' or 'numeric'
             control_multiple (int or float, optional): Scalar multiple applied to control limits. Defaults to 5.
             smoothing_factor (float, optional): Smoothing factor or weight applied to most recent observation. Defaults to 0.3.
+            max_points (int, optional): maximum number of points drawn per trace. Defaults to None (all points).
+            downsample (str, optional): how the points drawn are selected: 'lttb' or 'minmax'. Defaults to "lttb".
+            window (int or str, optional): number of points, or duration (for example '30D'), of the
+                rolling window of the average and standard deviation. Defaults to None (whole series).
         """
-        m = pd_ts.mean()
-        s = pd_ts.std()
-
-        if bought_value is None:
-            self.benefit = None
+        # with a window, the average, standard deviation and months are series
+        if window is None:
+            m = pd_ts.mean()
+            s = pd_ts.std()
+            n = max(
+                len(pd.date_range(pd_ts.index.min(), pd_ts.index.max(), freq="M")), 1
+            )
         else:
+            m, s = rolling_limits(pd_ts, window)
+            n = window_months(pd_ts, window)
+
+        # the plot shows the EWMA, but the benefit is on the series itself
+        ewma = pd.Series(ewma_filter(pd_ts, smoothing_factor), index=pd_ts.index)
+        super().__init__(
+            ewma,
+            bought_value,
+            title,
+            xlab,
+            ylab,
+            label,
+            y_format,
+            max_points=max_points,
+            downsample=downsample,
+        )
+        if bought_value is not None:
             self.benefit = (pd_ts - bought_value) / bought_value
 
-        n = len(pd.date_range(pd_ts.index.min(), pd_ts.index.max(), freq="M"))
+        # kept to update the EWMA with new points
+        self.bought_value = bought_value
+        self.smoothing_factor = smoothing_factor
+        self.control_multiple = control_multiple
+        self.window = window
+        self.n_months = n
+        self.values = pd_ts
+        # the points of the windows of the next points
+        self._tail = pd_ts
+        self.average = m
+        self.scale = (control_multiple * s) / np.sqrt(n)
+        self.n_points = len(pd_ts)
 
         # tolerance
-        i = pd.Series([j for j in range(1, len(pd_ts) + 1)], index=pd_ts.index)
-        tolerance = ((control_multiple * s) / np.sqrt(n)) * np.sqrt(
-            (smoothing_factor / (2 - smoothing_factor))
-            * (1 - (1 - smoothing_factor) ** (2 * i))
-        )
+        i = np.arange(1, len(pd_ts) + 1)
+        tolerance = self._tolerance(i, self.scale)
 
         # controls
-        control_upper = pd.Series(m + tolerance)
-        control_lower = pd.Series(m - tolerance)
+        self.control_upper = pd.Series(m + tolerance, index=pd_ts.index)
+        self.control_lower = pd.Series(m - tolerance, index=pd_ts.index)
 
-        ewma = pd.Series(index=pd_ts.index, dtype=float)
-        ewma[0] = pd_ts[0]
+    def _build_fig(self):
+        """Build the figure.
 
-        for j in range(1, len(pd_ts)):
-            ewma[j] = smoothing_factor * pd_ts[j] + (1 - smoothing_factor) * ewma[j - 1]
+        We add the average and control lines to the figure of the EWMA.
 
-        ts = TimeSeries(ewma, bought_value, title, xlab, ylab, label, y_format)
-        self.pd_ts = ts.pd_ts
-        self.title = ts.title
-        self.xlab = ts.xlab
-        self.ylab = ts.ylab
-        self.label = ts.label
-        self.y_format = ts.y_format
-
-        # now create the plot
-        fig = ts.fig
+        Returns:
+            go.Figure: figure of the plot
+        """
+        fig = super()._build_fig()
 
         # add the average and control lines
-        fig.add_hline(y=m, line_width=2, line_dash="solid", line_color="darkgreen")
+        if self.window is None:
+            fig.add_hline(
+                y=self.average, line_width=2, line_dash="solid", line_color="darkgreen"
+            )
         fig.add_trace(
-            go.Scatter(
-                x=pd_ts.index,
-                y=control_upper,
+            self._scatter(
+                self.control_upper,
                 mode="lines",
                 line=dict(color="darkorange", width=2, dash="dash"),
                 showlegend=False,
             )
         )
         fig.add_trace(
-            go.Scatter(
-                x=pd_ts.index,
-                y=control_lower,
+            self._scatter(
+                self.control_lower,
                 mode="lines",
                 line=dict(color="darkorange", width=2, dash="dash"),
                 showlegend=False,
             )
         )
-        self.fig = fig
+        if self.window is not None:
+            fig.add_trace(
+                self._scatter(
+                    self.average,
+                    mode="lines",
+                    line=dict(color="darkgreen", width=2, dash="solid"),
+                    showlegend=False,
+                )
+            )
+        return fig
+
+    def _tolerance(self, i, scale):
+        """Compute the tolerance of the control limits.
+
+        Args:
+            i (np.ndarray): positions of the points in the series, starting at 1
+            scale (float or pd.Series): scale of the control limits of the points
+
+        Returns:
+            np.ndarray: tolerance around the average
+        """
+        return np.asarray(scale) * np.sqrt(
+            (self.smoothing_factor / (2 - self.smoothing_factor))
+            * (1 - (1 - self.smoothing_factor) ** (2 * i))
+        )
+
+    def update(self, new_points):
+        """Update with new points.
+
+        We extend the EWMA and its control limits with new points, starting from the last
+        smoothed value. The average and standard deviation of the first series are kept,
+        or, with a window, computed on the window before each new point. The series are
+        extended by chunks and the traces of the figure are refreshed when it is next used,
+        so an update only costs the new points (and the window before them).
+
+        Args:
+            new_points (pd.Series): new points, index dated, after the points already in the series
+
+        Returns:
+            tuple: new points of the traces and their indices, as the extendData of a dash
+                Graph. None if there are no new points or the points drawn are downsampled.
+        """
+        if len(new_points) == 0:
+            return None
+        ewma = pd.Series(
+            ewma_filter(new_points, self.smoothing_factor, self._pd_ts[-1].iloc[-1]),
+            index=new_points.index,
+        )
+        if self.window is None:
+            average, scale = self.average, self.scale
+        else:
+            values = pd.concat(
+                [window_tail(self._tail, self.window, new_points.index[0]), new_points]
+            )
+            average, s = rolling_limits(values, self.window)
+            n = window_months(values, self.window)
+            average = average.iloc[-len(new_points) :]
+            scale = (self.control_multiple * s / np.sqrt(n)).iloc[-len(new_points) :]
+            self._average.append(average)
+            self._scale.append(scale)
+            self._tail = values
+        self._values.append(new_points)
+
+        i = np.arange(self.n_points + 1, self.n_points + len(new_points) + 1)
+        tolerance = self._tolerance(i, scale)
+        self.n_points += len(new_points)
+
+        upper = pd.Series(average + tolerance, index=ewma.index)
+        lower = pd.Series(average - tolerance, index=ewma.index)
+        self._pd_ts.append(ewma)
+        self._control_upper.append(upper)
+        self._control_lower.append(lower)
+        if self._benefit[0] is not None:
+            self._benefit.append((new_points - self.bought_value) / self.bought_value)
+
+        self._stale = True
+        if self.max_points is not None and self.n_points > self.max_points:
+            return None
+        # the traces are the EWMA, then the upper and lower controls (and rolling average)
+        traces = [ewma, upper, lower]
+        if self.window is not None:
+            traces.append(average)
+        return (
+            {
+                "x": [ewma.index] * len(traces),
+                "y": [trace.to_numpy() for trace in traces],
+            },
+            list(range(len(traces))),
+        )
+
+    def _refresh_fig(self):
+        """Refresh the traces of the figure with the points of the series."""
+        positions = self.positions()
+        x = self.pd_ts.index[positions]
+        self._fig.data[0].update(x=x, y=self.pd_ts.iloc[positions].to_numpy())
+        self._fig.data[1].update(x=x, y=self.control_upper.iloc[positions].to_numpy())
+        self._fig.data[2].update(x=x, y=self.control_lower.iloc[positions].to_numpy())
+        if self.window is not None:
+            self._fig.data[3].update(x=x, y=self.average.iloc[positions].to_numpy())
@@ -0,0 +1,123 @@
+import plotly.graph_objects as go
+import plotly.subplots as sp
+
+# main colours to be used by our plots
+COLOURS = ["purple", "darkgreen", "mediumslateblue", "darkorange", "red"]
+
+
+def default_layout(chart, title, xlab, ylab):
+    """Get the default layout.
+
+    Args:
+        chart (str): type of chart: 'timeseries' or 'cusum'
+        title (str): Main title of plot
+        xlab (str): X-axis title
+        ylab (str): Y-axis title
+
+    Returns:
+        dict: layout of the plot
+    """
+    axis = {
+        "showgrid": True,
+        "gridwidth": 1,
+        "gridcolor": "lightgrey",
+        "linecolor": "black",
+        "mirror": True,
+        "ticks": "outside",
+        "showline": True,
+        "titlefont": dict(size=16, color="black"),
+    }
+    layout = dict(
+        plot_bgcolor="white",
+        legend=dict(
+            x=0.9 if chart == "cusum" else 0.5,
+            xanchor="auto" if chart == "cusum" else "center",
+            yanchor="auto",
+        ),
+        title={
+            "text": title,
+            "y": 0.9,
+            "x": 0.5,
+            "xanchor": "center",
+            "yanchor": "bottom",
+            "font": dict(size=20, color="black"),
+        },
+        xaxis={"title": xlab, **axis},
+        yaxis={"title": ylab, **axis},
+        xaxis_tickformat="%Y-%m",
+        xaxis_dtick="M1",
+    )
+    if chart == "cusum":
+        layout["yaxis2"] = dict(
+            title="Cumulative sum vs average",
+            titlefont=dict(color=COLOURS[2]),
+            tickfont=dict(color=COLOURS[2]),
+            side="right",
+        )
+    return layout
+
+
+class FigureFactory:
+    """Factory of the figures of the plots.
+
+    The base figure of each type of chart and format of the y axis, with its grid of
+    subplots and layout, is built once. The figures of the series are copies of it, with
+    their own titles.
+    """
+
+    def __init__(self):
+        """Initialisation."""
+        self.templates = {}
+
+    def template(self, chart, y_format):
+        """Get the base figure.
+
+        Args:
+            chart (str): type of chart: 'timeseries' or 'cusum'
+            y_format (str): format of the y axis: 'pct', 'pound','integer' or 'numeric'
+
+        Returns:
+            go.Figure: base figure, with its grid of subplots
+        """
+        key = (chart, y_format)
+        if key not in self.templates:
+            fig = sp.make_subplots(specs=[[{"secondary_y": True}]])
+            fig.update_layout(default_layout(chart, None, None, None))
+
+            if y_format == "pct":
+                fig.update_layout(yaxis_tickformat="~%")
+            elif y_format == "pound":
+                fig.update_layout(yaxis_tickprefix="£ ")
+            if y_format == "integer":
+                fig.update_layout(yaxis_tickformat="~s")
+            if y_format == "numeric":
+                fig.update_layout(yaxis_tickformat="~s")
+            else:
+                fig.update_layout(yaxis_tickformat="~s")
+
+            self.templates[key] = fig
+        return self.templates[key]
+
+    def new(self, chart, y_format, title, xlab, ylab):
+        """Create a figure.
+
+        Args:
+            chart (str): type of chart: 'timeseries' or 'cusum'
+            y_format (str): format of the y axis: 'pct', 'pound','integer' or 'numeric'
+            title (str): Main title of plot
+            xlab (str): X-axis title
+            ylab (str): Y-axis title
+
+        Returns:
+            go.Figure: figure without traces
+        """
+        # a copy of the base figure keeps its grid of subplots
+        fig = go.Figure(self.template(chart, y_format))
+        fig.layout.title.text = title
+        fig.layout.xaxis.title.text = xlab
+        fig.layout.yaxis.title.text = ylab
+        return fig
+
+
+# factory shared by all the plots
+figures = FigureFactory()
@@ -0,0 +1,96 @@
+import numbers
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+
+def rolling_limits(pd_ts, window):
+    """Compute the rolling average and standard deviation.
+
+    Each point is compared with the points of the window before it, without itself. pandas
+    updates the sums of the window at each point, in O(n) whatever the window.
+
+    Args:
+        pd_ts (pd.Series): Series, index dated.
+        window (int or str): number of points, or duration (for example '30D') of the window
+
+    Returns:
+        tuple: rolling average and standard deviation, with the index of the series
+    """
+    rolling = pd_ts.rolling(window, min_periods=2, closed="left")
+    return rolling.mean(), rolling.std()
+
+
+def window_months(pd_ts, window):
+    """Count the months covered by the window before each point.
+
+    The window of a point of a short series, or a window shorter than a month, covers at
+    least one month.
+
+    Args:
+        pd_ts (pd.Series): Series, index dated.
+        window (int or str): number of points, or duration (for example '30D') of the window
+
+    Returns:
+        pd.Series: number of months of the window, with the index of the series
+    """
+    index = pd_ts.index
+    if isinstance(window, numbers.Integral):
+        start = index[np.maximum(np.arange(len(index)) - window, 0)]
+    else:
+        start = index - to_offset(window)
+    months = (index.year - start.year) * 12 + (index.month - start.month)
+    return pd.Series(np.maximum(months, 1), index=index)
+
+
+def rolling_fences(pd_ts, window):
+    """Compute the rolling IQR fences.
+
+    The quartiles of the window before each point are updated with a skip list, in
+    O(n log w) instead of sorting each window.
+
+    Args:
+        pd_ts (pd.Series): Series, index dated.
+        window (int or str): number of points, or duration (for example '30D') of the window
+
+    Returns:
+        tuple: rolling lower and upper fences, with the index of the series
+    """
+    rolling = pd_ts.rolling(window, min_periods=4, closed="left")
+    lower_q = rolling.quantile(0.25)
+    upper_q = rolling.quantile(0.75)
+    iqr = upper_q - lower_q
+    return lower_q - 1.5 * iqr, upper_q + 1.5 * iqr
+
+
+def filter_rolling_iqr(pd_ts, window):
+    """Filter the points outside the rolling IQR fences.
+
+    The first points, without enough points before them to compute the fences, are kept.
+
+    Args:
+        pd_ts (pd.Series): Series, index dated.
+        window (int or str): number of points, or duration (for example '30D') of the window
+
+    Returns:
+        pd.Series: points within the fences
+    """
+    lower_fence, upper_fence = rolling_fences(pd_ts, window)
+    return pd_ts[~((pd_ts < lower_fence) | (pd_ts > upper_fence))]
+
+
+def window_tail(pd_ts, window, start):
+    """Get the points in the window before a date.
+
+    Args:
+        pd_ts (pd.Series): Series, index dated.
+        window (int or str): number of points, or duration (for example '30D') of the window
+        start (pd.Timestamp): date of the first point after the series
+
+    Returns:
+        pd.Series: last points of the series, needed for the windows of the next points
+    """
+    if isinstance(window, numbers.Integral):
+        return pd_ts.iloc[-window:]
+    return pd_ts[pd_ts.index >= start - to_offset(window)]
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+# run rules of Western Electric and Nelson, with their description
+RULES = {
+    "beyond_3_sigma": "1 point beyond 3 standard deviations",
+    "2_of_3_beyond_2_sigma": "2 of 3 points in a row beyond 2 standard deviations, on the same side",
+    "4_of_5_beyond_1_sigma": "4 of 5 points in a row beyond 1 standard deviation, on the same side",
+    "8_same_side": "8 points in a row on the same side of the average",
+    "6_trend": "6 points in a row increasing or decreasing",
+    "14_alternating": "14 points in a row alternating up and down",
+    "15_within_1_sigma": "15 points in a row within 1 standard deviation",
+    "8_beyond_1_sigma": "8 points in a row beyond 1 standard deviation, on either side",
+}
+
+
+def window_count(mask, k):
+    """Count the points of a mask in each window.
+
+    We count the points in the window of the last k points, with a cumulative sum. The
+    first k - 1 points, without a full window, have a count of 0.
+
+    Args:
+        mask (np.ndarray): mask of the points
+        k (int): number of points of the window
+
+    Returns:
+        np.ndarray: number of points of the mask in the window ending at each point
+    """
+    counts = np.cumsum(mask, dtype=np.int64)
+    counts[k:] = counts[k:] - counts[:-k]
+    counts[: k - 1] = 0
+    return counts
+
+
+def check_rules(pd_ts, average, std):
+    """Check the run rules.
+
+    We check all the run rules on all the points at once, with counts over rolling windows.
+    A point breaks a rule if the run breaking it ends at this point.
+
+    Args:
+        pd_ts (pd.Series): Series, index dated.
+        average (float or pd.Series): average, or rolling average, of the series
+        std (float or pd.Series): standard deviation, or rolling standard deviation, of the series
+
+    Returns:
+        pd.DataFrame: mask of the points breaking each rule, with one column per rule
+    """
+    values = pd_ts.to_numpy(dtype=float)
+    z = (values - np.asarray(average, dtype=float)) / np.asarray(std, dtype=float)
+    n = len(values)
+
+    above = {sigma: z > sigma for sigma in (0, 1, 2)}
+    below = {sigma: z < -sigma for sigma in (0, 1, 2)}
+
+    def same_side(k, m, sigma):
+        return (window_count(above[sigma], k) >= m) | (
+            window_count(below[sigma], k) >= m
+        )
+
+    # the differences of the points, aligned on the second point of each pair
+    diff = np.diff(values, prepend=np.nan)
+    increasing, decreasing = diff > 0, diff < 0
+    alternating = np.zeros(n, dtype=bool)
+    alternating[1:] = (increasing[1:] & decreasing[:-1]) | (
+        decreasing[1:] & increasing[:-1]
+    )
+
+    return pd.DataFrame(
+        {
+            "beyond_3_sigma": np.abs(z) > 3,
+            "2_of_3_beyond_2_sigma": same_side(3, 2, 2),
+            "4_of_5_beyond_1_sigma": same_side(5, 4, 1),
+            "8_same_side": same_side(8, 8, 0),
+            "6_trend": (window_count(increasing, 5) == 5)
+            | (window_count(decreasing, 5) == 5),
+            "14_alternating": window_count(alternating, 12) == 12,
+            "15_within_1_sigma": window_count(np.abs(z) < 1, 15) == 15,
+            "8_beyond_1_sigma": window_count(np.abs(z) > 1, 8) == 8,
+        },
+        index=pd_ts.index,
+    )
+
+
+def rule_violations(pd_ts, average, std):
+    """Get the violations of the run rules.
+
+    Args:
+        pd_ts (pd.Series): Series, index dated.
+        average (float or pd.Series): average, or rolling average, of the series
+        std (float or pd.Series): standard deviation, or rolling standard deviation, of the series
+
+    Returns:
+        dict: dates of the points breaking each rule
+    """
+    rules = check_rules(pd_ts, average, std)
+    return {rule: rules.index[rules[rule].to_numpy()] for rule in RULES}
@@ -1,11 +1,37 @@
 import numpy as np
+import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import plotly.subplots as sp
 
+from .rolling import filter_rolling_iqr, rolling_limits
+from .run_rules import rule_violations
 from .timeseries import TimeSeries
 
 
+def add_limit_lines(fig, m, s, warning, action):
+    """Add the Shewhart lines.
+
+    We add the average, warning and action lines to a figure.
+
+    Args:
+        fig (go.Figure): figure of the series
+        m (float): average
+        s (float): standard deviation
+        warning (float): number of standard deviations of the warning lines
+        action (float): number of standard deviations of the action lines
+    """
+    fig.add_hline(y=m, line_width=2, line_dash="solid", line_color="darkgreen")
+    fig.add_hline(
+        y=m + warning * s, line_width=2, line_dash="dash", line_color="darkorange"
+    )
+    fig.add_hline(
+        y=m - warning * s, line_width=2, line_dash="dash", line_color="darkorange"
+    )
+    fig.add_hline(y=m + action * s, line_width=2, line_dash="dash", line_color="red")
+    fig.add_hline(y=m - action * s, line_width=2, line_dash="dash", line_color="red")
+
+
 class Shewhart(TimeSeries):
     """Base class for Shewhart time series.
 
@@ -16,7 +42,18 @@ class Shewhart(TimeSeries):
     ACTION = 3
 
     def __init__(
-        self, pd_ts, bought_value, title, xlab, ylab, label, y_format, filter_iqr=False
+        self,
+        pd_ts,
+        bought_value,
+        title,
+        xlab,
+        ylab,
+        label,
+        y_format,
+        filter_iqr=False,
+        max_points=None,
+        downsample="lttb",
+        window=None,
     ):
         """The initialisation of basic time series.
 
@@ -30,9 +67,16 @@ class Shewhart(TimeSeries):
             ylab (str): Y-axis title
             label (str): label in legend
             y_format (str): format of the y axis: 'pct', 'pound','integer' or 'numeric'
-            filter_iqr (bool, optional): Choice if we filter for IQR or not. Defaults to False.
+            filter_iqr (bool, optional): Choice if we filter for IQR or not. With a window, the
+                quartiles are the ones of the window before each point. Defaults to False.
+            max_points (int, optional): maximum number of points drawn per trace. Defaults to None (all points).
+            downsample (str, optional): how the points drawn are selected: 'lttb' or 'minmax'. Defaults to "lttb".
+            window (int or str, optional): number of points, or duration (for example '30D'), of the
+                rolling window of the limits. Defaults to None (limits on the whole series).
         """
-        if filter_iqr:
+        if filter_iqr and window is not None:
+            pd_ts = filter_rolling_iqr(pd_ts, window)
+        elif filter_iqr:
             upper_q = pd_ts.quantile(0.75)
             lower_q = pd_ts.quantile(0.25)
             iqr = upper_q - lower_q
@@ -40,45 +84,342 @@ class Shewhart(TimeSeries):
                 (pd_ts >= (lower_q - 1.5 * iqr)) & (pd_ts <= (upper_q + 1.5 * iqr))
             ]
 
-        ts = TimeSeries(pd_ts, bought_value, title, xlab, ylab, label, y_format)
+        super().__init__(
+            pd_ts,
+            bought_value,
+            title,
+            xlab,
+            ylab,
+            label,
+            y_format,
+            max_points=max_points,
+            downsample=downsample,
+        )
+
+        # with a window, the average and standard deviation are series
+        self.window = window
+        if window is None:
+            self.average = pd_ts.mean()
+            self.std = pd_ts.std()
+        else:
+            self.average, self.std = rolling_limits(pd_ts, window)
+
+    def violations(self):
+        """Get the violations of the run rules.
+
+        We check the Western Electric and Nelson rules (see run_rules.RULES) against the
+        average and standard deviation of the chart.
+
+        Returns:
+            dict: dates of the points breaking each rule
+        """
+        return rule_violations(self.pd_ts, self.average, self.std)
+
+    def _build_fig(self):
+        """Build the figure.
+
+        We add the average, action and warning lines to the figure of the series.
+
+        Returns:
+            go.Figure: figure of the plot
+        """
+        fig = super()._build_fig()
+        if self.window is None:
+            add_limit_lines(fig, self.average, self.std, self.WARNING, self.ACTION)
+            return fig
+
+        m, s = self.average, self.std
+        for line, colour, dash in [
+            (m, "darkgreen", "solid"),
+            (m + self.WARNING * s, "darkorange", "dash"),
+            (m - self.WARNING * s, "darkorange", "dash"),
+            (m + self.ACTION * s, "red", "dash"),
+            (m - self.ACTION * s, "red", "dash"),
+        ]:
+            fig.add_trace(
+                self._scatter(
+                    line,
+                    mode="lines",
+                    line=dict(color=colour, width=2, dash=dash),
+                    showlegend=False,
+                )
+            )
+        return fig
+
+
+class P2Quantile:
+    """Streaming estimate of a quantile, with the P² algorithm.
+
+    The estimate uses 5 markers only, whatever the number of points seen
+    (Jain and Chlamtac, 1985).
+    """
+
+    def __init__(self, q):
+        """Initialisation.
 
-        self.pd_ts = ts.pd_ts
-        self.benefit = ts.benefit
-        self.title = ts.title
-        self.xlab = ts.xlab
-        self.ylab = ts.ylab
-        self.label = ts.label
-        self.y_format = ts.y_format
+        Args:
+            q (float): quantile to estimate, between 0 and 1
+        """
+        self.q = q
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self.increments = [0, q / 2, q, (1 + q) / 2, 1]
 
-        m = pd_ts.mean()
-        s = pd_ts.std()
+    def warm_start(self, values):
+        """Start from a batch of points.
 
-        # uppers
-        upper_warning = m + self.WARNING * s
-        upper_action = m + self.ACTION * s
+        We place the markers on the exact quantiles of the batch, at their positions, as
+        if the batch had been added point by point. Only the next points go through P².
+
+        Args:
+            values (np.ndarray): first points
+        """
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        probabilities = np.array([0, self.q / 2, self.q, (1 + self.q) / 2, 1])
+        positions = np.round(1 + (n - 1) * probabilities).astype(int)
+        # too few points for distinct markers: the points are added one by one
+        if len(self.heights) > 0 or np.any(np.diff(positions) < 1):
+            for x in values:
+                self.add(x)
+            return
+        self.heights = list(np.quantile(values, probabilities))
+        self.positions = list(positions)
+        self.desired = list(1 + (n - 1) * probabilities)
 
-        # lowers
-        lower_warning = m - self.WARNING * s
-        lower_action = m - self.ACTION * s
+    def add(self, x):
+        """Add a point.
 
-        y_max = max(m + 5 * s, pd_ts.max())
-        y_min = min(m - 5 * s, pd_ts.min())
+        Args:
+            x (float): new point
+        """
+        heights = self.heights
+        if len(heights) < 5:
+            heights.append(x)
+            heights.sort()
+            return
 
-        # if same, we make just y_max slightly higher (should never happen)
-        if y_max == y_min:
-            y_max += 0.00001
+        # find the cell of the point, and update the extreme markers
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= heights[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            self.positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
 
-        fig = ts.fig
+        # adjust the middle markers if they are off their desired position
+        for i in range(1, 4):
+            d = self.desired[i] - self.positions[i]
+            if (d >= 1 and self.positions[i + 1] - self.positions[i] > 1) or (
+                d <= -1 and self.positions[i - 1] - self.positions[i] < -1
+            ):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, d)
+                heights[i] = height
+                self.positions[i] += d
 
-        # add the average, action and warning lines
-        fig.add_hline(y=m, line_width=2, line_dash="solid", line_color="darkgreen")
-        fig.add_hline(
-            y=upper_warning, line_width=2, line_dash="dash", line_color="darkorange"
+    def _parabolic(self, i, d):
+        n, h = self.positions, self.heights
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
         )
-        fig.add_hline(
-            y=lower_warning, line_width=2, line_dash="dash", line_color="darkorange"
+
+    def _linear(self, i, d):
+        n, h = self.positions, self.heights
+        return h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+
+    def value(self):
+        """Get the estimate.
+
+        Returns:
+            float: estimate of the quantile, or None if no point was seen
+        """
+        if len(self.heights) == 0:
+            return None
+        if len(self.heights) < 5:
+            return float(np.quantile(self.heights, self.q))
+        return self.heights[2]
+
+
+class StreamingShewhart:
+    """Streaming Shewhart chart.
+
+    The average and standard deviation are updated with each batch of points
+    (Welford's algorithm), without scanning the full series again. The crossings of the
+    warning and action lines are kept as events, and the figure is only built on request.
+    """
+
+    WARNING = Shewhart.WARNING
+    ACTION = Shewhart.ACTION
+
+    def __init__(self, filter_iqr=False, keep_points=100000):
+        """Initialisation.
+
+        Args:
+            filter_iqr (bool, optional): Choice if we filter for IQR or not. The quartiles are
+                computed on the first batch, then estimated in streaming, and the points outside
+                the fences once their batch is added are not used for the average and standard
+                deviation. Defaults to False.
+            keep_points (int, optional): number of latest points kept for the figure. Defaults to 100000.
+        """
+        self.filter_iqr = filter_iqr
+        self.keep_points = keep_points
+        self.n_kept = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.quartiles = (P2Quantile(0.25), P2Quantile(0.75))
+        self.points = []
+        self.events = pd.DataFrame(columns=["value", "limit", "side"])
+
+    @property
+    def std(self):
+        """Standard deviation of the points (same as pd.Series.std)."""
+        if self.count < 2:
+            return np.nan
+        return np.sqrt(self.m2 / (self.count - 1))
+
+    def limits(self):
+        """Get the limits.
+
+        Returns:
+            dict: average, then lower and upper warning and action limits
+        """
+        m, s = self.mean, self.std
+        return {
+            "average": m,
+            "lower_action": m - self.ACTION * s,
+            "lower_warning": m - self.WARNING * s,
+            "upper_warning": m + self.WARNING * s,
+            "upper_action": m + self.ACTION * s,
+        }
+
+    def _fences(self):
+        """Get the IQR fences, from the quartiles estimated so far.
+
+        Returns:
+            tuple: lower and upper fences
+        """
+        lower_q, upper_q = (quartile.value() for quartile in self.quartiles)
+        if lower_q is None:
+            return -np.inf, np.inf
+        iqr = upper_q - lower_q
+        return lower_q - 1.5 * iqr, upper_q + 1.5 * iqr
+
+    def update(self, new_points):
+        """Update with new points.
+
+        The new points are checked against the limits before they are added.
+
+        Args:
+            new_points (pd.Series): new points, index dated
+
+        Returns:
+            pd.DataFrame: events of the new points beyond the warning or action lines
+        """
+        new_points = new_points.dropna()
+        if len(new_points) == 0:
+            return self.events.iloc[:0]
+
+        events = self._crossings(new_points) if self.count > 1 else self.events.iloc[:0]
+        self.events = pd.concat([self.events, events]) if len(events) else self.events
+
+        kept = new_points
+        if self.filter_iqr:
+            for quartile in self.quartiles:
+                quartile.warm_start(new_points.to_numpy())
+            lower_fence, upper_fence = self._fences()
+            kept = new_points[(new_points >= lower_fence) & (new_points <= upper_fence)]
+
+        # only the latest points are kept, dropped by blocks
+        self.points.append(kept)
+        self.n_kept += len(kept)
+        if self.n_kept > 2 * self.keep_points:
+            self.points = [pd.concat(self.points).iloc[-self.keep_points :]]
+            self.n_kept = len(self.points[0])
+
+        # combine the batch statistics with the previous ones (Chan et al.)
+        values = kept.to_numpy(dtype=float)
+        if len(values) > 0:
+            count = len(values)
+            mean = values.mean()
+            m2 = ((values - mean) ** 2).sum()
+            delta = mean - self.mean
+            total = self.count + count
+            self.m2 += m2 + delta**2 * self.count * count / total
+            self.mean += delta * count / total
+            self.count = total
+        return events
+
+    def _crossings(self, points):
+        """Find the crossings of the lines.
+
+        Args:
+            points (pd.Series): points, index dated
+
+        Returns:
+            pd.DataFrame: events of the points beyond the warning or action lines
+        """
+        limits = self.limits()
+        values = points.to_numpy()
+        upper = np.where(
+            values > limits["upper_action"],
+            "action",
+            np.where(values > limits["upper_warning"], "warning", ""),
+        )
+        lower = np.where(
+            values < limits["lower_action"],
+            "action",
+            np.where(values < limits["lower_warning"], "warning", ""),
+        )
+        limit = np.where(upper != "", upper, lower)
+        side = np.where(upper != "", "upper", "lower")
+        crossed = limit != ""
+        return pd.DataFrame(
+            {"value": values[crossed], "limit": limit[crossed], "side": side[crossed]},
+            index=points.index[crossed],
         )
-        fig.add_hline(y=upper_action, line_width=2, line_dash="dash", line_color="red")
-        fig.add_hline(y=lower_action, line_width=2, line_dash="dash", line_color="red")
 
-        self.fig = fig
+    def series(self):
+        """Get the latest points used by the chart.
+
+        Returns:
+            pd.Series: keep_points latest points, index dated
+        """
+        if len(self.points) > 1:
+            self.points = [pd.concat(self.points)]
+        if len(self.points) == 0:
+            return pd.Series(dtype=float)
+        return self.points[0].iloc[-self.keep_points :]
+
+    def figure(self, bought_value, title, xlab, ylab, label, y_format):
+        """Build the figure.
+
+        We build the same figure as Shewhart, with the current statistics.
+
+        Args:
+            bought_value (float): Bought value. If None, will have no impact.
+            title (str): Main title of plot
+            xlab (str): X-axis title
+            ylab (str): Y-axis title
+            label (str): label in legend
+            y_format (str): format of the y axis: 'pct', 'pound','integer' or 'numeric'
+
+        Returns:
+            TimeSeries: time series with the figure
+        """
+        ts = TimeSeries(self.series(), bought_value, title, xlab, ylab, label, y_format)
+        add_limit_lines(ts.fig, self.mean, self.std, self.WARNING, self.ACTION)
+        return ts
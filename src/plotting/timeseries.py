@@ -6,6 +6,70 @@ import plotly.express as px
 import plotly.graph_objects as go
 import plotly.subplots as sp
 
+from .figure_factory import COLOURS, default_layout, figures
+
+
+def lttb_positions(x, y, n_out):
+    """Select points with Largest-Triangle-Three-Buckets.
+
+    We keep the first and last points, and one point per bucket in between: the one making
+    the largest triangle with the point kept in the previous bucket and the average of the
+    next bucket (Steinarsson, 2013).
+
+    Args:
+        x (np.ndarray): x values, increasing
+        y (np.ndarray): y values
+        n_out (int): number of points to keep
+
+    Returns:
+        np.ndarray: positions of the points kept
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    positions = np.empty(n_out, dtype=int)
+    positions[0], positions[-1] = 0, n - 1
+    previous = 0
+    for b in range(n_out - 2):
+        start, stop = edges[b], edges[b + 1]
+        next_stop = edges[b + 2] if b + 2 < len(edges) else n
+        next_x = x[stop:next_stop].mean()
+        next_y = y[stop:next_stop].mean()
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        positions[b + 1] = previous
+    return positions
+
+
+def minmax_positions(y, n_out):
+    """Select the minimum and maximum of each bucket.
+
+    We split the points into n_out / 2 buckets and keep the lowest and highest point of
+    each, so all the visible extrema are kept.
+
+    Args:
+        y (np.ndarray): y values
+        n_out (int): number of points to keep
+
+    Returns:
+        np.ndarray: positions of the points kept, increasing
+    """
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+
+    buckets = np.arange(n) * (n_out // 2) // n
+    # sorted by bucket then value: the first and last of each bucket are its extrema
+    order = np.lexsort((y, buckets))
+    last = np.flatnonzero(np.diff(buckets[order], append=buckets[-1] + 1))
+    first = np.concatenate([[0], last[:-1] + 1])
+    return np.unique(np.concatenate([order[first], order[last], [0, n - 1]]))
+
 
 class TimeSeries:
     """Base class for all our future time series.
@@ -14,9 +78,26 @@ class TimeSeries:
     """
 
     # main colours to be used by our plots
-    COLOURS = ["purple", "darkgreen", "mediumslateblue", "darkorange", "red"]
-
-    def __init__(self, pd_ts, bought_value, title, xlab, ylab, label, y_format):
+    COLOURS = COLOURS
+
+    # type of chart, for the layout of the figure
+    CHART = "timeseries"
+
+    # number of points from which the traces are drawn with WebGL
+    WEBGL_THRESHOLD = 10000
+
+    def __init__(
+        self,
+        pd_ts,
+        bought_value,
+        title,
+        xlab,
+        ylab,
+        label,
+        y_format,
+        max_points=None,
+        downsample="lttb",
+    ):
         """The initialisation of basic time series.
 
         This is the initialisation of a basic time series plot.
@@ -29,6 +110,8 @@ class TimeSeries:
             ylab (str): Y-axis title
             label (str): label in legend
             y_format (str): format of the y axis: 'pct', 'pound','integer' or 'numeric'
+            max_points (int, optional): maximum number of points drawn per trace. Defaults to None (all points).
+            downsample (str, optional): how the points drawn are selected: 'lttb' or 'minmax'. Defaults to "lttb".
         """
         if not isinstance(pd_ts.index, pd.core.indexes.datetimes.DatetimeIndex):
             raise TypeError(
@@ -47,74 +130,120 @@ class TimeSeries:
         self.ylab = ylab
         self.label = label
         self.y_format = y_format
+        self.max_points = max_points
+        self.downsample = downsample
+
+        # the figure is only built when it is used, and refreshed if the series changed
+        self._fig = None
+        self._stale = False
+        self._positions = None
+
+    @property
+    def fig(self):
+        """Figure of the plot, built the first time it is used."""
+        if self._fig is None:
+            self._fig = self._build_fig()
+        elif self._stale:
+            self._refresh_fig()
+        self._stale = False
+        return self._fig
+
+    @fig.setter
+    def fig(self, fig):
+        self._fig = fig
+
+    def positions(self):
+        """Get the positions of the points drawn.
+
+        We downsample the series if it has more than max_points points. The same positions
+        are used for all the traces aligned on the series (controls, benefit...).
+
+        Returns:
+            np.ndarray: positions of the points drawn in the series
+        """
+        n = len(self.pd_ts)
+        if self._positions is not None and self._positions[1] == n:
+            return self._positions[0]
+
+        if self.max_points is None or n <= self.max_points:
+            positions = np.arange(n)
+        elif self.downsample == "minmax":
+            positions = minmax_positions(
+                self.pd_ts.to_numpy(dtype=float), self.max_points
+            )
+        elif self.downsample == "lttb":
+            positions = lttb_positions(
+                self.pd_ts.index.asi8.astype(float),
+                self.pd_ts.to_numpy(dtype=float),
+                self.max_points,
+            )
+        else:
+            raise ValueError(
+                f"The downsampling should be 'lttb' or 'minmax' ({self.downsample})"
+            )
+        self._positions = (positions, n)
+        return positions
 
-        fig = sp.make_subplots(specs=[[{"secondary_y": True}]])
+    def _scatter(self, pd_ts, **kwargs):
+        """Create a trace of a series aligned on the series plotted.
+
+        We only draw the points kept by the downsampling, with WebGL for large series.
+
+        Args:
+            pd_ts (pd.Series): series, with the same index as the series plotted
+
+        Returns:
+            go.Scatter or go.Scattergl: trace
+        """
+        positions = self.positions()
+        trace = go.Scattergl if len(positions) > self.WEBGL_THRESHOLD else go.Scatter
+        return trace(
+            x=pd_ts.index[positions], y=pd_ts.iloc[positions].to_numpy(), **kwargs
+        )
+
+    def payload_size(self):
+        """Get size of the figure.
+
+        We get the number of points of the series and drawn, and the size of the figure
+        sent to the browser (JSON).
+
+        Returns:
+            dict: points of the series, points drawn per trace and bytes of the figure
+        """
+        return {
+            "points": len(self.pd_ts),
+            "points_drawn": len(self.positions()),
+            "bytes": len(self.fig.to_json()),
+        }
+
+    def _build_fig(self):
+        """Build the figure.
+
+        We build the plotly figure of the series, from the base figure of the chart.
+
+        Returns:
+            go.Figure: figure of the plot
+        """
+        fig = figures.new(self.CHART, self.y_format, self.title, self.xlab, self.ylab)
 
         fig.add_trace(
-            go.Scatter(
-                x=pd_ts.index,
-                y=pd_ts,
+            self._scatter(
+                self.pd_ts,
                 mode="lines",
                 line=dict(color=TimeSeries.COLOURS[0], width=2, dash="solid"),
                 showlegend=True,
-                name=label,
+                name=self.label,
             ),
             secondary_y=False,
         )
+        return fig
 
-        fig.update_layout(
-            plot_bgcolor="white",
-            legend=dict(
-                x=0.5,
-                xanchor="center",
-                yanchor="auto",
-            ),
-            title={
-                "text": title,
-                "y": 0.9,
-                "x": 0.5,
-                "xanchor": "center",
-                "yanchor": "bottom",
-                "font": dict(size=20, color="black"),
-            },
-            xaxis={
-                "title": xlab,
-                "showgrid": True,
-                "gridwidth": 1,
-                "gridcolor": "lightgrey",
-                "linecolor": "black",
-                "mirror": True,
-                "ticks": "outside",
-                "showline": True,
-                "titlefont": dict(size=16, color="black"),
-            },
-            yaxis={
-                "title": ylab,
-                "showgrid": True,
-                "gridwidth": 1,
-                "gridcolor": "lightgrey",
-                "linecolor": "black",
-                "mirror": True,
-                "ticks": "outside",
-                "showline": True,
-                "titlefont": dict(size=16, color="black"),
-            },
-            xaxis_tickformat="%Y-%m",
-            xaxis_dtick="M1",
-        )
-
-        if y_format == "pct":
-            fig.update_layout(yaxis_tickformat="~%")
-        elif y_format == "pound":
-            fig.update_layout(yaxis_tickprefix="£ ")
-        if y_format == "integer":
-            fig.update_layout(yaxis_tickformat="~s")
-        if y_format == "numeric":
-            fig.update_layout(yaxis_tickformat="~s")
-        else:
-            fig.update_layout(yaxis_tickformat="~s")
+    def _refresh_fig(self):
+        """Refresh the figure after the series changed.
 
-        self.fig = fig
+        We build the figure again. The charts which can be updated only refresh their traces.
+        """
+        self._fig = self._build_fig()
 
     def defaut_layout(self):
         """Set the layout back to default.
@@ -122,52 +251,14 @@ class TimeSeries:
         Used to set the layout to default - in case we did too many changes and want to go back to default.
         """
         self.fig.update_layout(
-            plot_bgcolor="white",
-            legend=dict(
-                x=0.5,
-                xanchor="center",
-                yanchor="auto",
-            ),
-            title={
-                "text": self.title,
-                "y": 0.9,
-                "x": 0.5,
-                "xanchor": "center",
-                "yanchor": "bottom",
-                "font": dict(size=20, color="black"),
-            },
-            xaxis={
-                "title": self.xlab,
-                "showgrid": True,
-                "gridwidth": 1,
-                "gridcolor": "lightgrey",
-                "linecolor": "black",
-                "mirror": True,
-                "ticks": "outside",
-                "showline": True,
-                "titlefont": dict(size=16, color="black"),
-            },
-            yaxis={
-                "title": self.ylab,
-                "showgrid": True,
-                "gridwidth": 1,
-                "gridcolor": "lightgrey",
-                "linecolor": "black",
-                "mirror": True,
-                "ticks": "outside",
-                "showline": True,
-                "titlefont": dict(size=16, color="black"),
-            },
-            xaxis_tickformat="%Y-%m",
-            xaxis_dtick="M1",
+            default_layout(self.CHART, self.title, self.xlab, self.ylab)
         )
 
     def add_benefit(self):
         if self.benefit is not None:
             self.fig.add_trace(
-                go.Scatter(
-                    x=self.pd_ts.index,
-                    y=self.benefit,
+                self._scatter(
+                    self.benefit,
                     name="Benefit",
                     mode="lines",
                     line=dict(color=TimeSeries.COLOURS[2], width=2, dash="dash"),
@@ -1,6 +1,7 @@
 import datetime
 import os
 import sys
+import threading
 from pathlib import Path
 
 import dash
@@ -18,6 +19,12 @@ external_stylesheets = ["https://codepen.io/chriddyp/pen/bWLwgP.css"]
 app = Dash(__name__, external_stylesheets=external_stylesheets)
 server = app.server
 
+# data of the companies already loaded, refreshed with the new bars only, once per interval.
+# The callbacks run in parallel threads: the lock protects the companies and their refresh.
+companies = {}
+refreshed = {}
+companies_lock = threading.Lock()
+
 app.layout = html.Div(
     html.Div(
         [
@@ -42,17 +49,39 @@ app.layout = html.Div(
 )
 
 
+def get_live_data(name, n):
+    """Get live data.
+
+    We get the bars by minute of a company. They are refreshed once per interval,
+    and the result is shared by the callbacks of this interval.
+
+    Args:
+        name (str): name of the company
+        n (int): number of intervals elapsed
+
+    Returns:
+        pd.DataFrame: live data of the company
+    """
+    with companies_lock:
+        if name not in companies:
+            companies[name] = FinancialData(name)
+        elif refreshed.get(name) != n:
+            companies[name].update_live_values()
+        refreshed[name] = n
+        return companies[name].live_data
+
+
 @callback(
     Output("info-header", "children"),
     Input("interval-component", "n_intervals"),
     State("choice_company", "value"),
 )
 def update_data(n, name):
-    company = FinancialData(name)
+    live_data = get_live_data(name, n)
 
-    latest = company.live_data.index.max()
+    latest = live_data.index.max()
 
-    info_data = company.live_data.head().reset_index(drop=False)
+    info_data = live_data.head().reset_index(drop=False)
 
     columns = [{"name": i, "id": i} for i in info_data.columns]
     return [
@@ -67,12 +96,21 @@ def update_data(n, name):
     State("choice_company", "value"),
 )
 def update_graph_live(n, name):
-    company = FinancialData(name)
+    live_data = get_live_data(name, n)
 
-    live_data = company.live_data.reset_index(drop=False).set_index("corrected_time")
+    live_data = live_data.reset_index(drop=False).set_index("corrected_time")
 
+    # weeks of bars by minute: we only draw the extrema of each pixel bucket
     fig = TimeSeries(
-        live_data["Open"], "Live Data", "Date", "Opening value", "Value", "pound"
+        live_data["Open"],
+        None,
+        "Live Data",
+        "Date",
+        "Opening value",
+        "Value",
+        "pound",
+        max_points=2000,
+        downsample="minmax",
     )
 
     fig.update_xaxis_frequency(frequency="daily")
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def make_series():
+    """Get a factory of random walks.
+
+    We create prices following a random walk, with a dated index.
+
+    Returns:
+        function: factory taking the number of points, and optionally the first date,
+            the frequency of the index and the seed of the random walk
+    """
+
+    def make(periods, start="2022-01-03", freq="B", seed=0):
+        rng = np.random.default_rng(seed)
+        index = pd.date_range(start, periods=periods, freq=freq)
+        return pd.Series(100 + np.cumsum(rng.normal(size=periods)), index=index)
+
+    return make
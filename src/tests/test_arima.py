@@ -0,0 +1,77 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add the root of the repository to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.modelling.arima import ARIMAModel  # noqa: E402
+
+
+def test_update(make_series):
+    """Test update.
+
+    We test the forecasts after an update are the ones of the model with the same
+    parameters on the full series.
+    """
+    series = make_series(1100, start="2023-01-02", freq="T")
+    model = ARIMAModel()
+    model.fit(series.iloc[:1000])
+    params = model.model.get_fitted_params()
+    results = model.model._forecaster.arima_res_
+    expected = results.append(series.iloc[1000:].to_numpy(), refit=False).forecast(5)
+
+    model.update(series.iloc[1000:1050])
+    model.update(series.iloc[1050:])
+    test = pd.Series(
+        0.0, index=pd.date_range(series.index[-1], periods=6, freq="T")[1:]
+    )
+
+    assert np.allclose(model.predict(test), expected)
+    assert model.model.cutoff[0] == series.index[-1]
+    assert model.model.get_fitted_params()["ar.L1"] == params["ar.L1"]
+    assert model.predict_interval(test, coverage=0.9).shape == (5, 2)
+
+
+def test_update_likelihood(make_series):
+    """Test the likelihood after update.
+
+    We test only the new observations are filtered by an update, and the criteria are
+    the ones of the full series, with the parameters of the fit.
+    """
+    series = make_series(1100, start="2023-01-02", freq="T")
+    model = ARIMAModel()
+    model.fit(series.iloc[:1000])
+    results = model.model._forecaster.arima_res_
+    expected = results.append(series.iloc[1000:].to_numpy(), refit=False)
+
+    model.update(series.iloc[1000:1060])
+    assert model.model._forecaster.arima_res_.nobs == 60
+    model.update(series.iloc[1060:])
+    assert model.model._forecaster.arima_res_.nobs == 40
+
+    assert np.allclose(model.model._forecaster.arima_res_.params, results.params)
+    assert np.isclose(model.llf, expected.llf)
+    for criterion in ["aic", "aicc", "bic", "hqic"]:
+        assert np.isclose(
+            model.information_criterion(criterion), getattr(expected, criterion)
+        )
+
+
+def test_update_refit(make_series):
+    """Test the scheduled refit of update.
+
+    We test the model is fitted again on the full series after refit_every observations.
+    """
+    series = make_series(1100, start="2023-01-02", freq="T")
+    model = ARIMAModel(refit_every=80)
+    model.fit(series.iloc[:1000])
+    model.update(series.iloc[1000:1050])
+    assert model.n_new == 50
+    model.update(series.iloc[1050:])
+
+    expected = ARIMAModel()
+    expected.fit(series)
+    assert model.n_new == 0
+    assert np.isclose(model.information_criterion(), expected.information_criterion())
@@ -0,0 +1,94 @@
+import os
+import signal
+import sys
+import time
+
+import numpy as np
+
+# Add the root of the repository to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.modelling.arima import ARIMAModel  # noqa: E402
+from src.modelling import batch  # noqa: E402
+from src.modelling.batch import FitPool, fit_models  # noqa: E402
+
+
+def test_fit_models(make_series):
+    """Test fit_models.
+
+    We test the models fitted in parallel are the same as the ones fitted one by one, and
+    the failures are reported.
+    """
+    series = {
+        "A": make_series(200, seed=0),
+        "B": make_series(200, seed=1),
+        "EMPTY": make_series(0),
+    }
+    models, fit_times, failures = fit_models(series, max_workers=2)
+
+    assert set(models) == {"A", "B"}
+    assert set(failures) == {"EMPTY"}
+    assert set(fit_times.index) == {"A", "B", "EMPTY"}
+
+    expected = ARIMAModel()
+    expected.fit(series["A"])
+    test = make_series(205).iloc[200:]
+    assert np.allclose(models["A"].predict(test), expected.predict(test))
+
+
+def test_fit_models_timeout(make_series):
+    """Test the timeout of fit_models.
+
+    We test a fit longer than the timeout is stopped and reported as a failure.
+    """
+    models, fit_times, failures = fit_models(
+        {"A": make_series(500)}, order=(3, 1, 3), timeout=0.001
+    )
+
+    assert models == {}
+    assert failures["A"].startswith("TimeoutError")
+    assert fit_times["A"] < 5
+
+
+class StuckModel(ARIMAModel):
+    def fit(self, train_series):
+        if len(train_series) == 1:
+            # like a fit stuck in C code: the signals are not handled
+            signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+            time.sleep(60)
+        super().fit(train_series)
+
+
+def test_fit_models_stuck(monkeypatch, make_series):
+    """Test the timeout of fit_models on a stuck fit.
+
+    We test a fit which does not handle signals is terminated by the parent, and its
+    worker is replaced to fit the other models.
+    """
+    monkeypatch.setattr(batch, "ARIMAModel", StuckModel)
+    series = {
+        "STUCK": make_series(1),
+        "A": make_series(200, seed=0),
+        "B": make_series(200, seed=1),
+    }
+    models, fit_times, failures = fit_models(series, max_workers=1, timeout=5)
+
+    assert set(models) == {"A", "B"}
+    assert failures["STUCK"].startswith("TimeoutError")
+
+
+def test_fit_pool(make_series):
+    """Test FitPool.
+
+    We test a pool fits several batches with the same workers.
+    """
+    with FitPool(max_workers=2) as pool:
+        models, _, _ = fit_models({"A": make_series(200)}, pool=pool)
+        workers = list(pool.workers)
+        other_models, _, _ = fit_models(
+            {"B": make_series(200, seed=1), "C": make_series(200, seed=2)}, pool=pool
+        )
+
+        assert set(models) == {"A"}
+        assert set(other_models) == {"B", "C"}
+        assert pool.workers[: len(workers)] == workers
+    assert pool.workers == []
@@ -0,0 +1,140 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from data.async_fetch import AsyncYahooProvider  # noqa: E402
+from data.financial_data import FinancialData  # noqa: E402
+
+# 2 days of bars, at 8:00 UTC
+TIMESTAMPS = [1693468800, 1693555200]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Stub of the chart API, counting the calls running at the same time."""
+
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with StubHandler.lock:
+            StubHandler.running += 1
+            StubHandler.max_running = max(StubHandler.max_running, StubHandler.running)
+        time.sleep(0.05)
+
+        symbol = self.path.split("?")[0].split("/")[-1]
+        if symbol == "MISSING":
+            self.send_error(404)
+            with StubHandler.lock:
+                StubHandler.running -= 1
+            return
+        result = {
+            "meta": {"symbol": symbol, "exchangeTimezoneName": "Europe/London"},
+            "timestamp": TIMESTAMPS,
+            "indicators": {
+                "quote": [
+                    {
+                        "open": [1.0, 2.0],
+                        "high": [1.5, 2.5],
+                        "low": [0.5, 1.5],
+                        "close": [1.0, 2.0],
+                        "volume": [100, 200],
+                    }
+                ],
+                "adjclose": [{"adjclose": [0.5, 2.0]}],
+            },
+            "events": {
+                "dividends": {"1": {"amount": 0.1, "date": TIMESTAMPS[1]}},
+            },
+        }
+        content = json.dumps({"chart": {"result": [result], "error": None}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+        with StubHandler.lock:
+            StubHandler.running -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    StubHandler.max_running = 0
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_get_histories(stub_url):
+    """Test get_histories.
+
+    We test the charts are parsed like yfinance, with a limited number of connections.
+    """
+    provider = AsyncYahooProvider(base_url=stub_url, limit_per_host=2)
+    names = ["A", "B", "C", "D", "E", "F"]
+    histories = provider.get_histories(names)
+    provider.close()
+
+    assert list(histories) == names
+    history = histories["C"]
+    assert list(history.columns) == [
+        "Open",
+        "High",
+        "Low",
+        "Close",
+        "Volume",
+        "Dividends",
+        "Stock Splits",
+    ]
+    assert str(history.index.tz) == "Europe/London"
+    assert list(history["Close"]) == [0.5, 2.0]
+    assert list(history["Dividends"]) == [0.0, 0.1]
+    assert StubHandler.max_running == 2
+
+
+def test_financial_data(stub_url):
+    """Test FinancialData with the asyncio provider.
+
+    We test the info and bars by minute of FinancialData.
+    """
+    test_fd = FinancialData("test", provider=AsyncYahooProvider(base_url=stub_url))
+
+    assert test_fd.info["symbol"] == "test"
+    assert list(test_fd.live_data["Adj Close"]) == [1.0, 2.0]
+    assert "corrected_time" in test_fd.live_data.columns
+
+
+def test_failures(stub_url):
+    """Test the companies failing.
+
+    We test a company failing is reported without stopping the others, and the session is
+    kept from one batch to the next.
+    """
+    with AsyncYahooProvider(base_url=stub_url) as provider:
+        histories = provider.get_histories(["A", "MISSING", "B"])
+        session = provider._session
+        infos = provider.get_infos(["C"])
+
+        assert list(histories) == ["A", "B"]
+        assert provider.failures == {}
+        assert infos["C"]["symbol"] == "C"
+        assert provider._session is session
+
+        provider.get_lives(["MISSING"])
+        assert provider.failures["MISSING"].startswith("ClientResponseError")
+        with pytest.raises(ValueError):
+            provider.get_live("MISSING")
+    assert session.closed
@@ -0,0 +1,74 @@
+import os
+import sys
+
+import numpy as np
+
+# Add the root of the repository to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.modelling.arima import ARIMAModel  # noqa: E402
+from src.modelling.backtest import backtest, forecast_metrics  # noqa: E402
+
+
+def test_evaluate(make_series):
+    """Test evaluate.
+
+    We test the score is the MAPE of the forecasts.
+    """
+    series = make_series(210)
+    model = ARIMAModel()
+    model.fit(series.iloc[:200])
+    test = series.iloc[200:]
+    expected = ((model.predict(test) - test).abs() / test.abs()).mean()
+
+    assert np.isclose(model.evaluate(test), expected)
+
+
+def test_backtest(make_series):
+    """Test backtest.
+
+    We test the folds forecast the points after their cutoff, with the model of their
+    training series, and the metrics of the forecasts.
+    """
+    series = make_series(240)
+    results = backtest(
+        series, initial=200, horizon=5, step=10, window=150, max_workers=2
+    )
+
+    assert list(results["fold"].unique()) == [0, 1, 2, 3]
+    assert list(results["cutoff"].unique()) == list(series.index[[200, 210, 220, 230]])
+    assert results["failure"].isna().all()
+
+    fold = results[results["fold"] == 1]
+    model = ARIMAModel()
+    model.fit(series.iloc[60:210])
+    test = series.iloc[210:215]
+    assert list(fold["date"]) == list(test.index)
+    assert np.allclose(fold["forecast"], model.predict(test))
+
+    by_step = forecast_metrics(results)
+    assert list(by_step.index) == [1, 2, 3, 4, 5]
+    first = results[results["step"] == 1]
+    error = first["forecast"] - first["actual"]
+    assert np.isclose(by_step.loc[1, "mae"], error.abs().mean())
+    assert np.isclose(by_step.loc[1, "rmse"], np.sqrt((error**2).mean()))
+    assert np.isclose(
+        forecast_metrics(results[results["fold"] == 1], by=None).loc["all", "mape"],
+        model.evaluate(test),
+    )
+
+
+def test_backtest_gaps(make_series):
+    """Test backtest on dates with gaps.
+
+    We test the folds forecast a series without frequency, like the prices with holidays,
+    and the forecasts are on the dates of the series.
+    """
+    series = make_series(244).drop(make_series(244).index[[50, 120, 205, 222]])
+    assert series.index.freq is None
+    results = backtest(series, initial=200, horizon=5, step=10, max_workers=2)
+
+    assert results["failure"].isna().all()
+    assert results["forecast"].notna().all()
+    assert list(results["date"]) == list(
+        series.index[[c + s for c in (200, 210, 220, 230) for s in range(5)]]
+    )
@@ -0,0 +1,110 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from plotting.batch_statistics import batch_statistics, breach_figures  # noqa: E402
+from plotting.cusum import CusumState  # noqa: E402
+from plotting.ewma import Ewma  # noqa: E402
+
+
+def make_prices():
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range("2022-01-03", periods=300)
+    prices = pd.DataFrame(
+        {
+            "STABLE": 100 + rng.normal(0, 1, 300),
+            "SHIFT": 100
+            + rng.normal(0, 1, 300)
+            + np.where(np.arange(300) > 200, 10, 0),
+            "TREND": 100 + np.cumsum(rng.normal(0, 1, 300)),
+        },
+        index=index,
+    )
+    return prices
+
+
+def test_batch_statistics():
+    """Test batch_statistics.
+
+    We test the statistics are the same as the charts of each company.
+    """
+    prices = make_prices()
+    statistics = batch_statistics(prices)
+
+    for name, pd_ts in prices.items():
+        row = statistics.loc[name]
+        assert np.isclose(row["average"], pd_ts.mean())
+        assert np.isclose(row["std"], pd_ts.std())
+        z = (pd_ts - pd_ts.mean()).abs() / pd_ts.std()
+        assert row["shewhart_action"] == (z > 3).sum()
+
+        ewma = Ewma(pd_ts, None, "title", "x", "y", "label", "numeric")
+        assert np.isclose(row["ewma"], ewma.pd_ts.iloc[-1])
+        breaches = (ewma.pd_ts > ewma.control_upper) | (ewma.pd_ts < ewma.control_lower)
+        assert row["ewma_breaches"] == breaches.sum()
+
+        state = CusumState(pd_ts.mean(), pd_ts.std())
+        state.update(pd_ts)
+        assert row["cusum_warning"] == len(state.alarms)
+        assert row["cusum_action"] == (state.alarms["limit"] == "action").sum()
+
+    assert statistics.loc["SHIFT", "breach"]
+
+
+def test_batch_statistics_missing():
+    """Test batch_statistics with missing prices.
+
+    We test the missing prices are ignored by the Shewhart and CUSUM statistics.
+    """
+    prices = make_prices()
+    prices.iloc[::7, 0] = np.nan
+    statistics = batch_statistics(prices)
+
+    pd_ts = prices["STABLE"].dropna()
+    assert np.isclose(statistics.loc["STABLE", "average"], pd_ts.mean())
+    state = CusumState(pd_ts.mean(), pd_ts.std())
+    state.update(pd_ts)
+    assert statistics.loc["STABLE", "cusum_warning"] == len(state.alarms)
+
+
+def test_batch_statistics_gaps():
+    """Test the EWMA statistics with gaps.
+
+    We test the EWMA statistics of companies with different calendars and of a company
+    without any price are the ones of Ewma on the prices available.
+    """
+    prices = make_prices()
+    prices.iloc[::3, 0] = np.nan
+    prices.iloc[5::4, 1] = np.nan
+    prices["SHIFT"] = prices["SHIFT"].where(np.arange(300) % 7 != 6)
+    prices["EMPTY"] = np.nan
+    statistics = batch_statistics(prices)
+
+    for name in ["STABLE", "SHIFT", "TREND"]:
+        pd_ts = prices[name].dropna()
+        ewma = Ewma(pd_ts, None, "title", "x", "y", "label", "numeric")
+        breaches = (ewma.pd_ts > ewma.control_upper) | (ewma.pd_ts < ewma.control_lower)
+        assert np.isclose(statistics.loc[name, "ewma"], ewma.pd_ts.iloc[-1])
+        assert statistics.loc[name, "ewma_breaches"] == breaches.sum()
+
+    assert np.isnan(statistics.loc["EMPTY", "ewma"])
+    assert not statistics.loc["EMPTY", "breach"]
+    assert "EMPTY" not in breach_figures(prices, statistics)
+
+
+def test_breach_figures():
+    """Test breach_figures.
+
+    We test the charts are only built for the companies that breach.
+    """
+    prices = make_prices()
+    statistics = batch_statistics(prices)
+    charts = breach_figures(prices, statistics)
+
+    assert set(charts) == set(statistics.index[statistics["breach"]])
+    for name, company_charts in charts.items():
+        assert ("cusum" in company_charts) == (statistics.loc[name, "cusum_action"] > 0)
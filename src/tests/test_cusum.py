@@ -0,0 +1,73 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from plotting.cusum import Cusum, CusumState, tabular_cusum  # noqa: E402
+
+
+def make_series(periods, shift_at=None):
+    rng = np.random.default_rng(0)
+    values = rng.normal(100, 5, periods)
+    if shift_at is not None:
+        values[shift_at:] += 5
+    index = pd.date_range("2023-01-01", periods=periods, freq="T")
+    return pd.Series(values, index=index)
+
+
+def test_tabular_cusum():
+    """Test tabular_cusum.
+
+    We test the vectorised CUSUM is the same as the recursion, point by point.
+    """
+    values = make_series(500).to_numpy()
+    s_hi, s_lo = tabular_cusum(values, 100, 2.5, s_hi_start=3.0)
+
+    expected_hi, expected_lo = [], []
+    hi, lo = 3.0, 0.0
+    for x in values:
+        hi = max(0.0, hi + x - 102.5)
+        lo = max(0.0, lo + 97.5 - x)
+        expected_hi.append(hi)
+        expected_lo.append(lo)
+
+    assert np.allclose(s_hi, expected_hi)
+    assert np.allclose(s_lo, expected_lo)
+
+
+def test_cusum_state():
+    """Test CusumState.
+
+    We test the batches give the same CUSUM as the full series, and the shift is detected.
+    """
+    pd_ts = make_series(1000, shift_at=600)
+    full = CusumState(100, 5)
+    expected = full.update(pd_ts)
+
+    state = CusumState(100, 5)
+    batches = [
+        state.update(pd_ts.iloc[start : start + 250]) for start in range(0, 1000, 250)
+    ]
+
+    pd.testing.assert_frame_equal(pd.concat(batches), expected)
+    assert len(state.alarms) == len(full.alarms)
+    assert state.h_warning < state.h_action
+    action = state.alarms[state.alarms["limit"] == "action"]
+    after_shift = action.index >= pd_ts.index[600]
+    assert after_shift.sum() > 100 * (~after_shift).sum()
+    assert (action.loc[after_shift, "side"] == "upper").all()
+
+
+def test_cusum_alarms():
+    """Test the alarms of Cusum.
+
+    We test the alarms are the points beyond the decision interval.
+    """
+    pd_ts = make_series(1000, shift_at=600)
+    chart = Cusum(pd_ts, None, "title", "x", "y", "label", "numeric")
+    alarms = chart.state.alarm_indices(chart.cusum["s_hi"], chart.cusum["s_lo"])
+
+    assert list(chart.alarms.index) == list(pd_ts.index[alarms])
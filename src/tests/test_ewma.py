@@ -0,0 +1,165 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from plotting.ewma import Ewma, ewma_filter, ewma_sweep, month_ends  # noqa: E402
+
+
+def test_ewma_filter(make_series):
+    """Test ewma_filter.
+
+    We test the filter gives the same values as the recursive loop.
+    """
+    values = make_series(500, start="2023-01-01", freq="D").to_numpy()
+    expected = np.empty(len(values))
+    expected[0] = values[0]
+    for j in range(1, len(values)):
+        expected[j] = 0.3 * values[j] + 0.7 * expected[j - 1]
+
+    assert np.allclose(ewma_filter(values, 0.3), expected, rtol=0, atol=1e-9)
+
+
+def test_month_ends():
+    """Test month_ends.
+
+    We test the month ends are counted as pd.date_range does, for daily and intraday dates.
+    """
+    first = pd.DatetimeIndex(
+        [
+            "2023-01-05",
+            "2023-01-31",
+            "2023-01-05 10:00",
+            "2023-01-31 10:00",
+            "2023-01-31",
+        ]
+    )
+    last = pd.DatetimeIndex(
+        [
+            "2023-03-31",
+            "2023-03-13",
+            "2023-03-31 09:00",
+            "2023-03-13 09:00",
+            "2023-01-31",
+        ]
+    )
+    expected = [len(pd.date_range(a, b, freq="M")) for a, b in zip(first, last)]
+    assert list(month_ends(first, last)) == expected
+
+
+def test_update(make_series):
+    """Test update.
+
+    We test updating with new points gives the same EWMA as the full series, and new
+    controls with the average and scale of the first series.
+    """
+    pd_ts = make_series(400, start="2023-01-01", freq="D")
+    full = Ewma(pd_ts, None, "title", "x", "y", "label", "pound")
+    ewma = Ewma(pd_ts.iloc[:300], None, "title", "x", "y", "label", "pound")
+    ewma.update(pd_ts.iloc[300:350])
+    # the figure is built between the updates, and then refreshed with the new points
+    assert len(ewma.fig.data[0].y) == 350
+    extension, traces = ewma.update(pd_ts.iloc[350:])
+
+    assert np.allclose(ewma.pd_ts, full.pd_ts)
+    assert ewma.control_upper.index.equals(full.control_upper.index)
+    tolerance = (full.control_upper - full.average) * ewma.scale / full.scale
+    assert np.allclose(ewma.control_upper.iloc[300:], ewma.average + tolerance[300:])
+    assert np.allclose(ewma.control_lower.iloc[300:], ewma.average - tolerance[300:])
+    assert len(ewma.fig.data[0].y) == 400
+
+    # only the new points are sent to extend the traces
+    assert traces == [0, 1, 2]
+    assert [len(y) for y in extension["y"]] == [50, 50, 50]
+    assert np.allclose(extension["y"][1], ewma.control_upper.iloc[350:])
+
+
+def test_lazy_figure(make_series):
+    """Test the figure is lazy.
+
+    We test the figure is only built when it is used, once, with the EWMA and controls.
+    """
+    pd_ts = make_series(400, start="2023-01-01", freq="D")
+    ewma = Ewma(pd_ts, None, "title", "x", "y", "label", "pound")
+
+    assert ewma._fig is None
+    fig = ewma.fig
+    assert ewma.fig is fig
+    assert len(fig.data) == 3
+    assert np.allclose(fig.data[0].y, ewma.pd_ts)
+    assert np.allclose(fig.data[1].y, ewma.control_upper)
+
+
+def test_ewma_sweep(make_series):
+    """Test ewma_sweep.
+
+    We test the breaches of each combination are the ones of the Ewma with its parameters.
+    """
+    pd_ts = make_series(400, start="2023-01-01", freq="D")
+    sweep = ewma_sweep(pd_ts, [0.1, 0.3, 0.6], control_multiples=[3, 5])
+
+    assert len(sweep) == 6
+    for (smoothing_factor, control_multiple), row in sweep.iterrows():
+        ewma = Ewma(
+            pd_ts,
+            None,
+            "title",
+            "x",
+            "y",
+            "label",
+            "pound",
+            control_multiple=control_multiple,
+            smoothing_factor=smoothing_factor,
+        )
+        breach = (ewma.pd_ts > ewma.control_upper) | (ewma.pd_ts < ewma.control_lower)
+        assert row["breaches"] == breach.sum()
+        if breach.any():
+            assert row["first_breach"] == breach.idxmax()
+
+
+def test_ewma_sweep_delay():
+    """Test the detection delays of ewma_sweep.
+
+    We test the delays to detect a shift, for several companies.
+    """
+    rng = np.random.default_rng(1)
+    index = pd.date_range("2023-01-01", periods=600, freq="D")
+    prices = pd.DataFrame(
+        {
+            "SHIFT": 100 + rng.normal(size=600) + np.where(np.arange(600) >= 400, 5, 0),
+            "STABLE": 100 + rng.normal(size=600),
+        },
+        index=index,
+    )
+    sweep = ewma_sweep(prices, [0.2, 0.5], control_multiples=[5], change_at=index[400])
+
+    assert list(sweep.index.names) == [
+        "company",
+        "smoothing_factor",
+        "control_multiple",
+    ]
+    shift = sweep.loc["SHIFT"]
+    assert (shift["delay"] < 20).all()
+    assert (shift["first_breach"] >= index[400]).all()
+
+
+def test_ewma_sweep_empty(make_series):
+    """Test ewma_sweep with a company without prices.
+
+    We test the company has no breach, and the others are swept as on their own.
+    """
+    pd_ts = make_series(400, start="2023-01-01", freq="D")
+    prices = pd.DataFrame({"A": pd_ts, "EMPTY": np.nan})
+    sweep = ewma_sweep(
+        prices, [0.1, 0.3], control_multiples=[3], change_at=pd_ts.index[200]
+    )
+
+    assert sweep.loc["EMPTY", "breaches"].eq(0).all()
+    assert sweep.loc["EMPTY", "false_alarms"].eq(0).all()
+    assert sweep.loc["EMPTY", "first_breach"].isna().all()
+    assert sweep.loc["EMPTY", "delay"].isna().all()
+    expected = ewma_sweep(pd_ts, [0.1, 0.3], [3], change_at=pd_ts.index[200])
+    assert sweep.loc["A"].equals(expected)
@@ -0,0 +1,117 @@
+import json
+import os
+import sys
+
+import plotly.graph_objects as go
+import plotly.subplots as sp
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from plotting.cusum import Cusum  # noqa: E402
+from plotting.figure_factory import COLOURS, FigureFactory  # noqa: E402
+from plotting.timeseries import TimeSeries  # noqa: E402
+
+
+def legacy_figure(pd_ts, title, xlab, ylab, label, y_format):
+    """Build the figure of a time series, with its whole layout.
+
+    Args:
+        pd_ts (pd.Series): Time series, where the index is the date
+        title (str): Main title of plot
+        xlab (str): X-axis title
+        ylab (str): Y-axis title
+        label (str): label in legend
+        y_format (str): format of the y axis: 'pct', 'pound','integer' or 'numeric'
+
+    Returns:
+        go.Figure: figure of the plot
+    """
+    fig = sp.make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(
+        go.Scatter(
+            x=pd_ts.index,
+            y=pd_ts,
+            mode="lines",
+            line=dict(color=COLOURS[0], width=2, dash="solid"),
+            showlegend=True,
+            name=label,
+        ),
+        secondary_y=False,
+    )
+    axis = {
+        "showgrid": True,
+        "gridwidth": 1,
+        "gridcolor": "lightgrey",
+        "linecolor": "black",
+        "mirror": True,
+        "ticks": "outside",
+        "showline": True,
+        "titlefont": dict(size=16, color="black"),
+    }
+    fig.update_layout(
+        plot_bgcolor="white",
+        legend=dict(x=0.5, xanchor="center", yanchor="auto"),
+        title={
+            "text": title,
+            "y": 0.9,
+            "x": 0.5,
+            "xanchor": "center",
+            "yanchor": "bottom",
+            "font": dict(size=20, color="black"),
+        },
+        xaxis={"title": xlab, **axis},
+        yaxis={"title": ylab, **axis},
+        xaxis_tickformat="%Y-%m",
+        xaxis_dtick="M1",
+    )
+    if y_format == "pound":
+        fig.update_layout(yaxis_tickprefix="£ ")
+    fig.update_layout(yaxis_tickformat="~s")
+    return fig
+
+
+def test_same_figure(make_series):
+    """Test the figures of the factory.
+
+    We test the figure is the same as the one built with its whole layout.
+    """
+    pd_ts = make_series(100, start="2023-01-02")
+    for y_format in ("pound", "pct", "numeric"):
+        args = ("title", "Date", "Price", "label", y_format)
+        expected = legacy_figure(pd_ts, *args)
+        fig = TimeSeries(pd_ts, None, *args).fig
+        assert json.loads(fig.to_json()) == json.loads(expected.to_json())
+
+
+def test_templates():
+    """Test the templates are built once and not changed by the figures.
+
+    We test the figures created are independent of each other.
+    """
+    factory = FigureFactory()
+    first = factory.new("cusum", "pound", "first", "x", "y")
+    second = factory.new("cusum", "pound", "second", "x", "y")
+    first.update_layout(plot_bgcolor="black")
+
+    assert len(factory.templates) == 1
+    assert second.layout.title.text == "second"
+    assert second.layout.plot_bgcolor == "white"
+    assert factory.template("cusum", "pound")["layout"]["plot_bgcolor"] == "white"
+    assert second.layout.yaxis2.title.text == "Cumulative sum vs average"
+
+
+def test_default_layout(make_series):
+    """Test defaut_layout.
+
+    We test the layout is set back to the default one, with the titles of the plot.
+    """
+    chart = Cusum(
+        make_series(100, start="2023-01-02"), None, "title", "x", "y", "label", "pound"
+    )
+    chart.fig.update_layout(plot_bgcolor="black", legend_x=0.1)
+    chart.defaut_layout()
+
+    assert chart.fig.layout.plot_bgcolor == "white"
+    assert chart.fig.layout.legend.x == 0.9
+    assert chart.fig.layout.title.text == "title"
+    assert len(chart.fig.data) == 2
@@ -1,13 +1,16 @@
 import os
 import sys
 
+import numpy as np
 import pandas as pd
 import yfinance as yf
 from dateutil import parser
 
 # Add the parent directory of this file to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from data.financial_data import FinancialData  # noqa: E402
+from data.financial_data import FinancialData, normalise_minute_times  # noqa: E402
+from data.providers import ReplayProvider  # noqa: E402
+from data.store import LocalStore  # noqa: E402
 
 
 def test_init():
@@ -169,3 +172,162 @@ def test_get_live():
     """
     test_fd = FinancialData("test")
     assert all(test_fd.get_live == pd.DataFrame())
+
+
+def test_init_offline():
+    """Test initialisation of FinancialData with a replay provider.
+
+    We test initialisation of FinancialData without network.
+    """
+    provider = ReplayProvider.synthetic(["test"], history_days=10, live_days=2)
+    test_fd = FinancialData("test", provider=provider)
+
+    assert test_fd.info["symbol"] == "test"
+    assert test_fd.history.shape[0] == 10
+    assert all(test_fd.history["Company"] == "test")
+    assert test_fd.live_data.shape[0] == 2 * 511
+    assert test_fd.live_data["corrected_time"].is_monotonic_increasing
+    assert test_fd.live_data["date"].dtype.kind == "M"
+    assert test_fd.live_data["time"].dtype.kind == "m"
+    assert test_fd.live_data["date"].iloc[0] == pd.Timestamp("2023-08-31")
+    assert test_fd.live_data["time"].iloc[0] == pd.Timedelta("8h")
+
+
+def test_init_store(tmp_path):
+    """Test initialisation of FinancialData with a local store.
+
+    We test only the new bars are downloaded once the store is filled.
+    """
+    provider = ReplayProvider.synthetic(["test"], history_days=10, live_days=2)
+    full_history = provider.frames["test"]["history"]
+    provider.frames["test"]["history"] = full_history.iloc[:7]
+    store = LocalStore(tmp_path)
+    FinancialData("test", store=store, provider=provider).history
+
+    # new bars are available: only the ones from the latest saved are downloaded
+    provider.frames["test"]["history"] = full_history
+    starts = []
+    get_history = provider.get_history
+    provider.get_history = lambda name, start=None: starts.append(start) or get_history(
+        name, start
+    )
+    test_fd = FinancialData("test", store=store, provider=provider)
+
+    assert test_fd.history.shape[0] == 10
+    assert starts == [full_history.index[6].date()]
+    assert store.load("test", "1d").equals(full_history)
+    live_data = test_fd.live_data
+    assert store.load("test", "1m").shape[0] == live_data.shape[0]
+
+
+def test_lazy():
+    """Test the data is loaded on first use.
+
+    We test nothing is downloaded at initialisation, and update methods invalidate the data.
+    """
+    provider = ReplayProvider.synthetic(["test"], history_days=10, live_days=1)
+    calls = []
+    get_live = provider.get_live
+    provider.get_live = lambda name, start=None: calls.append(name) or get_live(
+        name, start
+    )
+    test_fd = FinancialData("test", provider=provider)
+
+    assert test_fd._info is None and test_fd._history is None
+    assert calls == []
+
+    test_fd.live_data
+    test_fd.get_live()
+    assert calls == ["test"]
+    assert test_fd._history is None
+
+    test_fd.update_history()
+    assert test_fd._history is None
+    test_fd.update_live_values()
+    test_fd.live_data
+    assert calls == ["test", "test"]
+
+
+def test_normalise_minute_times():
+    """Test normalise_minute_times.
+
+    We test the opening hours are stretched over the full day.
+    """
+    index = pd.DatetimeIndex(
+        ["2023-08-31 08:00", "2023-08-31 12:15", "2023-09-01 16:30"]
+    ).tz_localize("Europe/London")
+    times = normalise_minute_times(index)
+
+    assert list(times["second_full"]) == [8 * 3600, 12.25 * 3600, 16.5 * 3600]
+    assert list(pd.DatetimeIndex(times["corrected_time"])) == [
+        pd.Timestamp("2023-08-31 00:00"),
+        pd.Timestamp("2023-08-31 12:00"),
+        pd.Timestamp("2023-09-02 00:00"),
+    ]
+
+
+def test_update_live_values_incremental():
+    """Test update_live_values when live data is loaded.
+
+    We test only the new bars are processed, and the result is the same as a full download.
+    """
+    provider = ReplayProvider.synthetic(["test"], history_days=10, live_days=2)
+    full_live = provider.frames["test"]["live"]
+    provider.frames["test"]["live"] = full_live.iloc[:600]
+    test_fd = FinancialData("test", provider=provider)
+    test_fd.live_data
+
+    provider.frames["test"]["live"] = full_live
+    test_fd.update_live_values()
+
+    expected = FinancialData("test", provider=provider).live_data
+    assert test_fd.live_data.shape == expected.shape
+    assert test_fd.live_data.index.is_unique
+    assert test_fd.live_data["corrected_time"].equals(expected["corrected_time"])
+    assert test_fd.live_data["Close"].equals(expected["Close"])
+
+
+def test_update_live_values_tail():
+    """Test several update_live_values without using live data.
+
+    We test the bars loaded are not copied by the updates, and the result is the same as a full download.
+    """
+    provider = ReplayProvider.synthetic(["test"], history_days=10, live_days=2)
+    full_live = provider.frames["test"]["live"]
+    provider.frames["test"]["live"] = full_live.iloc[:600]
+    test_fd = FinancialData("test", provider=provider)
+    close = test_fd.live_data["Close"].to_numpy()
+
+    for end in (700, 800, None):
+        provider.frames["test"]["live"] = full_live.iloc[:end]
+        test_fd.update_live_values()
+
+    assert np.shares_memory(test_fd._live_data["Close"].to_numpy(), close)
+    expected = FinancialData("test", provider=provider).live_data
+    assert test_fd.live_data.index.equals(expected.index)
+    assert test_fd.live_data["corrected_time"].equals(expected["corrected_time"])
+    assert test_fd.live_data["Close"].equals(expected["Close"])
+
+
+def test_compact():
+    """Test the compact layout of FinancialData.
+
+    We test the compact data uses less memory, with the same prices.
+    """
+    provider = ReplayProvider.synthetic(["test"], history_days=100, live_days=2)
+    test_fd = FinancialData("test", provider=provider)
+    compact_fd = FinancialData("test", provider=provider, compact=True)
+    test_fd.history, test_fd.live_data
+    compact_fd.history, compact_fd.live_data
+
+    assert compact_fd.live_data["Close"].dtype == np.float32
+    assert compact_fd.live_data["Volume"].dtype.kind == "i"
+    assert "corrected_time" not in compact_fd.live_data.columns
+    assert np.allclose(compact_fd.history["Close"], test_fd.history["Close"])
+    assert compact_fd.get_live_times()["corrected_time"].equals(
+        test_fd.live_data["corrected_time"]
+    )
+
+    report = compact_fd.memory_report()
+    assert list(report.index) == ["history", "live_data"]
+    assert all(report["bytes"] * 2 < test_fd.memory_report()["bytes"])
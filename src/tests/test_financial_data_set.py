@@ -0,0 +1,122 @@
+import os
+import sys
+import threading
+
+import numpy as np
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from data.financial_data_set import FinancialDataSet  # noqa: E402
+from data.providers import ReplayProvider  # noqa: E402
+from data.store import LocalStore  # noqa: E402
+
+NAMES = ["A", "B", "C", "D"]
+
+
+class ConcurrentProvider(ReplayProvider):
+    """Replay provider where each call waits for the calls of the other companies."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.barrier = threading.Barrier(len(NAMES), timeout=10)
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def _wait(self):
+        # the barrier is broken if the calls of a round do not run at the same time
+        self.barrier.wait()
+        with self.lock:
+            self.calls += 1
+
+
+class StartProvider(ReplayProvider):
+    """Replay provider recording the start of each download of bars by minute."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.starts = []
+
+    def get_live(self, name_company, start=None):
+        self.starts.append(start)
+        return super().get_live(name_company, start)
+
+
+def test_init():
+    """Test initialisation of FinancialDataSet.
+
+    We test all companies are loaded, with concurrent calls.
+    """
+    provider = ConcurrentProvider.synthetic(NAMES, history_days=10, live_days=1)
+
+    data_set = FinancialDataSet(NAMES, provider=provider, max_workers=4)
+
+    # 3 rounds of 4 concurrent calls, instead of 12 calls one after the other
+    assert provider.calls == 12
+    assert not provider.barrier.broken
+    assert len(data_set) == 4
+    assert data_set["B"].info["symbol"] == "B"
+    assert [company.name_company for company in data_set] == NAMES
+
+
+def test_get_history():
+    """Test get_history.
+
+    We test the history of all companies is aligned on the dates.
+    """
+    provider = ReplayProvider.synthetic(NAMES, history_days=10, live_days=1)
+    data_set = FinancialDataSet(NAMES, provider=provider)
+
+    history = data_set.get_history()
+    assert history.shape == (10, 4)
+    assert list(history.columns) == NAMES
+    assert history["C"].equals(
+        data_set["C"].history["Close"].tz_localize(None).rename("C")
+    )
+
+    live_data = data_set.get_live(column=None)
+    assert live_data.shape == (511, 4 * 6)
+    assert str(live_data.index.tz) == "UTC"
+
+
+def test_init_store(tmp_path):
+    """Test initialisation of FinancialDataSet with a local store.
+
+    We test the store is filled for all companies.
+    """
+    provider = ReplayProvider.synthetic(NAMES, history_days=10, live_days=1)
+    store = LocalStore(tmp_path)
+    FinancialDataSet(NAMES, store=store, provider=provider)
+    data_set = FinancialDataSet(NAMES, store=store, provider=provider)
+
+    assert data_set["D"].history.shape[0] == 10
+    assert store.load("D", "1m").shape[0] == 511
+
+
+def test_update_live_values():
+    """Test update_live_values when live data is loaded.
+
+    We test only the bars from the latest ones loaded are downloaded, and the result is
+    the same as a full download.
+    """
+    provider = StartProvider.synthetic(NAMES, history_days=10, live_days=2)
+    full_lives = {name: provider.frames[name]["live"] for name in NAMES}
+    for name, end in zip(NAMES, [600, 700, 800, 900]):
+        provider.frames[name]["live"] = full_lives[name].iloc[:end]
+    data_set = FinancialDataSet(NAMES, provider=provider)
+    close = data_set["D"].live_data["Close"].to_numpy()
+
+    provider.starts = []
+    for name in NAMES:
+        provider.frames[name]["live"] = full_lives[name]
+    data_set.update_live_values()
+
+    assert provider.starts == [full_lives["A"].index[599]] * 4
+    assert np.shares_memory(data_set["D"]._live_data["Close"].to_numpy(), close)
+    expected = FinancialDataSet(NAMES, provider=provider)
+    for name in NAMES:
+        assert data_set[name].live_data.index.equals(expected[name].live_data.index)
+        assert (
+            data_set[name]
+            .live_data["corrected_time"]
+            .equals(expected[name].live_data["corrected_time"])
+        )
@@ -0,0 +1,97 @@
+import os
+import sys
+import time
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from data.financial_data import FinancialData  # noqa: E402
+from data.financial_data_set import FinancialDataSet  # noqa: E402
+from data.info_cache import InfoCache  # noqa: E402
+from data.providers import ReplayProvider  # noqa: E402
+
+
+def test_ttl():
+    """Test the time to live of InfoCache.
+
+    We test the entries expire, with the maxAge of the information by default.
+    """
+    cache = InfoCache(ttl=0.05)
+    cache.set("test", {"symbol": "TEST"})
+    assert cache.get("test") == {"symbol": "TEST"}
+    time.sleep(0.1)
+    assert cache.get("test") is None
+
+    cache = InfoCache()
+    cache.set("test", {"symbol": "TEST", "maxAge": 0})
+    cache.set("other", {"symbol": "OTHER", "maxAge": 86400})
+    assert "test" not in cache
+    assert "other" in cache
+
+
+def test_lru():
+    """Test the eviction of InfoCache.
+
+    We test the least recently used entry is removed when the cache is full.
+    """
+    cache = InfoCache(max_size=2)
+    cache.set("a", {})
+    cache.set("b", {})
+    cache.get("a")
+    cache.set("c", {})
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+
+
+def test_persistence(tmp_path):
+    """Test the persistence of InfoCache.
+
+    We test a new FinancialData, after a restart, does not download the information again.
+    """
+    path = os.path.join(tmp_path, "info.json")
+    provider = ReplayProvider.synthetic(["test"], history_days=10, live_days=1)
+    FinancialData("test", provider=provider, info_cache=InfoCache(path)).info
+
+    provider.frames["test"]["info"] = {"symbol": "changed"}
+    test_fd = FinancialData("test", provider=provider, info_cache=InfoCache(path))
+    assert test_fd.info["symbol"] == "test"
+
+    test_fd.update_info()
+    assert test_fd.info["symbol"] == "changed"
+    assert InfoCache(path).get("test")["symbol"] == "changed"
+
+
+def test_batch(tmp_path, monkeypatch):
+    """Test the batches of InfoCache.
+
+    We test the cache is saved once per update of FinancialDataSet.
+    """
+    path = os.path.join(tmp_path, "info.json")
+    names = ["a", "b", "c"]
+    provider = ReplayProvider.synthetic(names, history_days=10, live_days=1)
+    cache = InfoCache(path)
+    saves = []
+    save = cache._save
+    monkeypatch.setattr(cache, "_save", lambda: saves.append(1) or save())
+
+    data_set = FinancialDataSet(names, provider=provider, info_cache=cache)
+    assert len(saves) == 1
+    data_set.update_info()
+    assert len(saves) == 2
+    assert set(InfoCache(path).entries) == set(names)
+
+
+def test_corrupt(tmp_path):
+    """Test InfoCache with a corrupt file.
+
+    We test a partial file is an empty cache, and the cache is saved without temporary files.
+    """
+    path = os.path.join(tmp_path, "info.json")
+    with open(path, "w") as f:
+        f.write('{"test": {"info": ')
+
+    cache = InfoCache(path)
+    assert len(cache) == 0
+    cache.set("test", {"symbol": "TEST"})
+    assert InfoCache(path).get("test") == {"symbol": "TEST"}
+    assert os.listdir(tmp_path) == ["info.json"]
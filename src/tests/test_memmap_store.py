@@ -0,0 +1,93 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from data.financial_data import FinancialData  # noqa: E402
+from data.memmap_store import MinuteBarStore  # noqa: E402
+from data.providers import ReplayProvider, synthetic_bars  # noqa: E402
+
+
+def test_append(tmp_path):
+    """Test append.
+
+    We test the overlapping bars are overwritten and the time zone is kept.
+    """
+    bars = synthetic_bars(2, "T")
+    store = MinuteBarStore(tmp_path)
+    store.append("test", bars.iloc[:600])
+    store.append("test", bars.iloc[590:] * 2)
+
+    frame = store.frame("test")
+    assert store.length("test") == bars.shape[0]
+    assert frame.index.equals(bars.index)
+    assert np.allclose(frame["Close"].iloc[:590], bars["Close"].iloc[:590])
+    assert np.allclose(frame["Close"].iloc[590:], bars["Close"].iloc[590:] * 2)
+
+
+def test_append_fewer(tmp_path):
+    """Test append with fewer bars than the ones overwritten.
+
+    We test the files are not shrunk, so a reader mapping them can still read them, and
+    only the bars published are read.
+    """
+    bars = synthetic_bars(2, "T")
+    store = MinuteBarStore(tmp_path)
+    store.append("test", bars)
+    reader = store.series("test")
+    size = os.path.getsize(store._path("test", "Close"))
+
+    store.append("test", bars.iloc[590:600] * 2)
+
+    assert store.length("test") == 600
+    assert os.path.getsize(store._path("test", "Close")) == size
+    assert reader.shape[0] == bars.shape[0]
+    assert np.isclose(reader.iloc[-1], bars["Close"].iloc[-1])
+    assert store.frame("test").index.equals(bars.index[:600])
+
+
+def test_series(tmp_path):
+    """Test series.
+
+    We test the series uses the mapped file, without copy.
+    """
+    store = MinuteBarStore(tmp_path)
+    assert store.series("test").shape[0] == 0
+
+    store.append("test", synthetic_bars(1, "T"))
+    series = store.series("test", "Open")
+
+    assert series.shape[0] == 511
+    assert isinstance(series.values, np.memmap)
+    assert not series.values.flags.writeable
+
+
+def test_financial_data(tmp_path):
+    """Test FinancialData with a minute store.
+
+    We test the bars downloaded are written in the store and read mapped.
+    """
+    provider = ReplayProvider.synthetic(["test"], history_days=10, live_days=1)
+    test_fd = FinancialData(
+        "test", provider=provider, minute_store=MinuteBarStore(tmp_path)
+    )
+
+    live_data = test_fd.get_live()
+    mapped = test_fd.get_live(mapped=True)
+    assert mapped.index.equals(live_data.index)
+    assert mapped["Close"].equals(live_data["Close"])
+
+
+def test_financial_data_no_store():
+    """Test FinancialData without a minute store.
+
+    We test reading the bars mapped without a minute store raises a clear error.
+    """
+    provider = ReplayProvider.synthetic(["test"], history_days=10, live_days=1)
+    test_fd = FinancialData("test", provider=provider)
+
+    with pytest.raises(ValueError):
+        test_fd.get_live(mapped=True)
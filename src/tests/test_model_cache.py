@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the root of the repository to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.modelling.arima import ARIMAModel  # noqa: E402
+from src.modelling.model_cache import ModelCache  # noqa: E402
+
+
+def test_fit_cached(tmp_path, make_series):
+    """Test fit with a cache.
+
+    We test the model is fitted once for the same series, and again if the series changes.
+    """
+    cache = ModelCache(root=str(tmp_path))
+    series = make_series(300)
+    test = make_series(305).iloc[300:]
+
+    first = ARIMAModel(cache=cache, name_company="AAPL")
+    first.fit(series)
+    # another process (new cache object) on the same folder
+    second = ARIMAModel(cache=ModelCache(root=str(tmp_path)), name_company="AAPL")
+    second.fit(series)
+
+    assert cache.stats()["misses"] == 1
+    assert second.cache.stats()["hits"] == 1
+    assert np.allclose(second.predict(test), first.predict(test))
+
+    changed = series.copy()
+    changed.iloc[-1] += 1
+    third = ARIMAModel(cache=cache, name_company="AAPL")
+    third.fit(changed)
+    ARIMAModel(2, 1, 1, cache=cache, name_company="AAPL").fit(series)
+    assert cache.misses == 3
+    assert len(cache) == 3
+
+
+def test_eviction(tmp_path):
+    """Test the eviction of the cache.
+
+    We test the least recently used models are removed when the cache is full.
+    """
+    cache = ModelCache(root=str(tmp_path), max_size=2)
+    cache.set("a", 1)
+    time.sleep(0.01)
+    cache.set("b", 2)
+    time.sleep(0.01)
+    assert cache.get("a") == 1
+    time.sleep(0.01)
+    cache.set("c", 3)
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.stats() == {"hits": 1, "misses": 0, "hit_rate": 1.0, "size": 2}
+
+
+def test_get_broken(tmp_path, make_series):
+    """Test get with a broken model.
+
+    We test a truncated model is a miss, and the models are written with a file per writer.
+    """
+    cache = ModelCache(root=str(tmp_path))
+    cache.set("a", list(range(100)))
+    path = os.path.join(str(tmp_path), "a.pkl")
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-10])
+
+    assert cache.get("a") is None
+    assert cache.get("missing") is None
+    assert cache.stats()["misses"] == 2
+    assert os.listdir(str(tmp_path)) == ["a.pkl"]
+    assert cache.key(None, (1, 1, 1), make_series(10)).startswith("1_1_1_")
@@ -0,0 +1,60 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add the root of the repository to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.modelling.arima import ARIMAModel  # noqa: E402
+from src.modelling.order_search import search_order  # noqa: E402
+
+
+def make_series(periods):
+    # random walk with autocorrelated steps: ARIMA(1, 1, 0)
+    rng = np.random.default_rng(0)
+    steps = np.zeros(periods)
+    noise = rng.normal(size=periods)
+    for j in range(1, periods):
+        steps[j] = 0.6 * steps[j - 1] + noise[j]
+    index = pd.bdate_range("2022-01-03", periods=periods)
+    return pd.Series(100 + np.cumsum(steps), index=index)
+
+
+def test_search_order():
+    """Test search_order.
+
+    We test the order of differencing is chosen first, and the candidates are ranked by
+    criterion, with the criterion of the ARIMA model fitted on the series itself.
+    """
+    series = make_series(300)
+    table = search_order(
+        series, p_values=range(3), d_values=range(2), q_values=range(3), max_workers=2
+    )
+
+    assert len(table) == 9
+    assert set(table.index.get_level_values("d")) == {1}
+    fitted = table[table["status"] == "fitted"]
+    assert fitted["aic"].is_monotonic_increasing
+    assert list(fitted["rank"]) == list(range(1, len(fitted) + 1))
+
+    p, d, q = table.index[0]
+    model = ARIMAModel(p, d, q)
+    model.fit(series)
+    assert np.isclose(model.information_criterion("aic"), table["aic"].iloc[0])
+
+
+def test_search_order_pruning():
+    """Test the pruning of search_order.
+
+    We test the candidates extending clearly beaten candidates are not fitted.
+    """
+    series = make_series(300)
+    table = search_order(
+        series, p_values=range(3), d_values=[0], q_values=range(3), margin=0.0
+    )
+
+    pruned = table[table["status"] == "pruned"]
+    assert len(pruned) > 0
+    assert pruned["fit_time"].isna().all()
+    assert pruned["rank"].isna().all()
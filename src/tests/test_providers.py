@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+
+import pandas as pd
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from data.providers import (  # noqa: E402
+    ReplayProvider,
+    _split_tickers,
+    record,
+    synthetic_bars,
+)
+
+
+def test_synthetic_bars():
+    """Test synthetic_bars.
+
+    We test the synthetic bars look like real ones.
+    """
+    bars = synthetic_bars(3, "T")
+
+    assert bars.shape[0] == 3 * 511
+    assert bars.index.is_monotonic_increasing
+    assert all(bars["High"] >= bars[["Open", "Close"]].max(axis=1))
+    assert all(bars["Low"] <= bars[["Open", "Close"]].min(axis=1))
+
+
+def test_replay_start():
+    """Test the start of ReplayProvider.
+
+    We test only the bars from the start date are served.
+    """
+    provider = ReplayProvider.synthetic(["test"], history_days=10, live_days=2)
+
+    history = provider.get_history("test", start="2023-08-30")
+    assert list(history.index.strftime("%Y-%m-%d")) == [
+        "2023-08-30",
+        "2023-08-31",
+        "2023-09-01",
+    ]
+    assert provider.get_live("test", start=pd.Timestamp("2023-09-01")).shape[0] == 511
+
+
+def test_split_tickers():
+    """Test _split_tickers.
+
+    We test a company missing from a download of several tickers is skipped.
+    """
+    bars = synthetic_bars(3, "D")
+    data = pd.concat({"A": bars, "B": bars}, axis=1)
+
+    split = _split_tickers(data, ["A", "B", "C"])
+    assert list(split) == ["A", "B"]
+    assert split["A"].equals(bars)
+
+
+def test_replay_latency():
+    """Test the latency of ReplayProvider.
+
+    We test each call waits for the latency.
+    """
+    provider = ReplayProvider.synthetic(
+        ["test"], history_days=10, live_days=1, latency=0.05
+    )
+
+    start = time.perf_counter()
+    provider.get_info("test")
+    assert time.perf_counter() - start >= 0.05
+
+
+def test_record(tmp_path):
+    """Test record.
+
+    We test recorded data is replayed the same.
+    """
+    provider = ReplayProvider.synthetic(["test"], history_days=10, live_days=1)
+    record(provider, ["test"], tmp_path)
+    replay = ReplayProvider(folder=tmp_path)
+
+    assert replay.get_info("test") == provider.get_info("test")
+    assert replay.get_history("test").equals(provider.get_history("test"))
+    assert replay.get_live("test").equals(provider.get_live("test"))
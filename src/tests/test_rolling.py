@@ -0,0 +1,134 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from plotting.ewma import Ewma  # noqa: E402
+from plotting.rolling import (  # noqa: E402
+    filter_rolling_iqr,
+    rolling_limits,
+    window_months,
+    window_tail,
+)
+from plotting.shewhart import Shewhart  # noqa: E402
+
+
+def make_series(periods, freq="H"):
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2023-01-01", periods=periods, freq=freq)
+    values = 100 + np.cumsum(rng.normal(size=periods))
+    # a few outliers
+    values[::97] += 40
+    return pd.Series(values, index=index)
+
+
+def test_rolling_limits():
+    """Test rolling_limits.
+
+    We test the limits of each point are the average and deviation of the window before it.
+    """
+    pd_ts = make_series(500)
+    for window in (50, "3D"):
+        average, std = rolling_limits(pd_ts, window)
+        for j in (10, 100, 499):
+            if isinstance(window, int):
+                before = pd_ts.iloc[max(0, j - window) : j]
+            else:
+                t = pd_ts.index[j]
+                before = pd_ts[
+                    (pd_ts.index >= t - pd.Timedelta(window)) & (pd_ts.index < t)
+                ]
+            assert np.isclose(average.iloc[j], before.mean())
+            assert np.isclose(std.iloc[j], before.std())
+
+
+def test_filter_rolling_iqr():
+    """Test filter_rolling_iqr.
+
+    We test the points outside the fences of the window before them are filtered.
+    """
+    pd_ts = make_series(500)
+    kept = filter_rolling_iqr(pd_ts, 50)
+
+    expected = []
+    for j in range(len(pd_ts)):
+        before = pd_ts.iloc[max(0, j - 50) : j]
+        if len(before) < 4:
+            expected.append(True)
+            continue
+        lower_q, upper_q = before.quantile(0.25), before.quantile(0.75)
+        iqr = upper_q - lower_q
+        expected.append(lower_q - 1.5 * iqr <= pd_ts.iloc[j] <= upper_q + 1.5 * iqr)
+    assert kept.index.equals(pd_ts.index[expected])
+    assert pd_ts.index[97] not in kept.index
+
+
+def test_rolling_shewhart():
+    """Test the rolling Shewhart chart.
+
+    We test the limits are series, drawn as traces.
+    """
+    pd_ts = make_series(500)
+    chart = Shewhart(
+        pd_ts, None, "title", "x", "y", "label", "pound", filter_iqr=True, window="2D"
+    )
+
+    assert chart.average.index.equals(chart.pd_ts.index)
+    assert len(chart.fig.data) == 6
+    assert len(chart.fig.layout.shapes) == 0
+
+
+def test_rolling_ewma_update():
+    """Test updating the rolling EWMA.
+
+    We test updating with new points gives the same controls as the full series.
+    """
+    pd_ts = make_series(2000)
+    full = Ewma(pd_ts, None, "title", "x", "y", "label", "pound", window=100)
+    ewma = Ewma(
+        pd_ts.iloc[:1500], None, "title", "x", "y", "label", "pound", window=100
+    )
+    assert len(ewma.fig.data) == 4
+    ewma.update(pd_ts.iloc[1500:1800])
+    ewma.update(pd_ts.iloc[1800:])
+
+    assert np.allclose(ewma.average, full.average, equal_nan=True)
+    assert np.allclose(ewma.control_upper.iloc[1500:], full.control_upper.iloc[1500:])
+    assert np.allclose(ewma.control_lower.iloc[1500:], full.control_lower.iloc[1500:])
+    assert len(ewma.fig.data[3].y) == 2000
+
+
+def test_window_months():
+    """Test window_months.
+
+    We test the months are the ones of the window, at least one, and the windows of
+    points can be numpy integers.
+    """
+    pd_ts = make_series(2000)
+    months = window_months(pd_ts, np.int64(1500))
+    assert (months.iloc[:700] == 1).all()
+    assert months.iloc[-1] == 2
+    assert (window_months(pd_ts, "1D") == 1).all()
+    assert len(window_tail(pd_ts, np.int64(100), pd_ts.index[-1])) == 100
+
+
+def test_rolling_ewma_short():
+    """Test the rolling EWMA of a series shorter than a month.
+
+    We test the control limits are finite, and do not depend on the length of the series
+    before the window.
+    """
+    pd_ts = make_series(500)
+    short = Ewma(
+        pd_ts.iloc[-100:], None, "title", "x", "y", "label", "pound", window=20
+    )
+    full = Ewma(pd_ts, None, "title", "x", "y", "label", "pound", window=20)
+
+    assert np.isfinite(short.control_upper.iloc[2:]).all()
+    assert np.allclose(
+        short.control_upper.iloc[20:] - short.average.iloc[20:],
+        (full.control_upper - full.average).iloc[-80:],
+    )
@@ -0,0 +1,75 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from plotting import run_rules  # noqa: E402
+from plotting.run_rules import RULES, check_rules, window_count  # noqa: E402
+from plotting.shewhart import Shewhart  # noqa: E402
+
+
+def make_series(values):
+    index = pd.date_range("2023-01-01", periods=len(values), freq="T")
+    return pd.Series(np.asarray(values, dtype=float), index=index)
+
+
+def broken(values, rule):
+    return list(np.flatnonzero(check_rules(make_series(values), 0, 1)[rule]))
+
+
+def test_window_count():
+    """Test window_count.
+
+    We test the counts are the ones of each full window.
+    """
+    mask = np.array([1, 0, 1, 1, 1, 0, 1], dtype=bool)
+    assert list(window_count(mask, 3)) == [0, 0, 2, 2, 3, 2, 2]
+
+
+def test_rules():
+    """Test the run rules.
+
+    We test each rule is broken at the end of the run breaking it, and not before.
+    """
+    assert broken([0, 3.5, -0.5, -3.2], "beyond_3_sigma") == [1, 3]
+    assert broken([0, 2.5, 0, 2.1, -2.5], "2_of_3_beyond_2_sigma") == [3]
+    assert broken([1.5, 1.5, -1.5, 1.5, 1.5, 0], "4_of_5_beyond_1_sigma") == [4]
+    assert broken([-1] + [0.1] * 8, "8_same_side") == [8]
+    assert broken([0.1] * 7 + [-0.1], "8_same_side") == []
+    assert broken([0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.4], "6_trend") == [5]
+    assert broken([0.1, -0.1] * 7, "14_alternating") == [13]
+    assert broken([0.1, -0.1] * 6 + [0.1, 0.1], "14_alternating") == []
+    assert broken([0.5] * 16, "15_within_1_sigma") == [14, 15]
+    assert broken([1.5, -1.5] * 4 + [0.5], "8_beyond_1_sigma") == [7]
+
+
+def test_violations(monkeypatch):
+    """Test the violations of Shewhart.
+
+    We test all rules are checked, with rolling limits too, on a year of bars by minute.
+    The counts over windows are computed on the whole series at once, whatever its length.
+    """
+    lengths = []
+
+    def counted_window_count(mask, k):
+        lengths.append(len(mask))
+        return window_count(mask, k)
+
+    monkeypatch.setattr(run_rules, "window_count", counted_window_count)
+    rng = np.random.default_rng(0)
+    check_rules(make_series(rng.normal(0, 1, 100)), 0, 1)
+    n_calls = len(lengths)
+    lengths.clear()
+
+    pd_ts = make_series(100 + np.cumsum(rng.normal(0, 0.05, 500_000)))
+    chart = Shewhart(pd_ts, None, "title", "x", "y", "label", "pound", window=1000)
+    violations = chart.violations()
+
+    assert n_calls > 0
+    assert lengths == [len(pd_ts)] * n_calls
+    assert set(violations) == set(RULES)
+    assert len(violations["8_same_side"]) > 0
+    assert violations["beyond_3_sigma"].isin(pd_ts.index).all()
@@ -0,0 +1,110 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from plotting.shewhart import P2Quantile, Shewhart, StreamingShewhart  # noqa: E402
+
+
+def make_series(periods):
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2023-01-01", periods=periods, freq="T")
+    return pd.Series(rng.normal(100, 5, periods), index=index)
+
+
+def test_streaming_statistics():
+    """Test the statistics of StreamingShewhart.
+
+    We test the average and deviation updated by batches are the same as on the full series.
+    """
+    pd_ts = make_series(1000)
+    chart = StreamingShewhart()
+    for start in range(0, 1000, 300):
+        chart.update(pd_ts.iloc[start : start + 300])
+
+    assert chart.count == 1000
+    assert np.isclose(chart.mean, pd_ts.mean())
+    assert np.isclose(chart.std, pd_ts.std())
+
+
+def test_p2_quantile():
+    """Test P2Quantile.
+
+    We test the streaming estimate is close to the exact quantile.
+    """
+    values = make_series(20000).to_numpy()
+    quantile = P2Quantile(0.75)
+    for x in values:
+        quantile.add(x)
+
+    assert abs(quantile.value() - np.quantile(values, 0.75)) < 0.1
+
+
+def test_p2_warm_start():
+    """Test the warm start of P2Quantile.
+
+    We test the markers start on the exact quantiles of the first batch, and the estimate
+    stays close to the exact quantile with the next points.
+    """
+    values = make_series(20000).to_numpy()
+    quantile = P2Quantile(0.25)
+    quantile.warm_start(values[:10000])
+    assert quantile.value() == np.quantile(values[:10000], 0.25)
+
+    quantile.warm_start(values[10000:])
+    assert abs(quantile.value() - np.quantile(values, 0.25)) < 0.1
+
+
+def test_keep_points():
+    """Test the points kept by StreamingShewhart.
+
+    We test only the latest points are kept, and the statistics use all the points.
+    """
+    pd_ts = make_series(1000)
+    chart = StreamingShewhart(keep_points=100)
+    for start in range(0, 1000, 50):
+        chart.update(pd_ts.iloc[start : start + 50])
+
+    assert chart.n_kept <= 200
+    assert chart.series().equals(pd_ts.iloc[-100:])
+    assert np.isclose(chart.mean, pd_ts.mean())
+
+
+def test_events():
+    """Test the events of StreamingShewhart.
+
+    We test the points beyond the lines are reported, and the figure is built on request.
+    """
+    pd_ts = make_series(1000)
+    chart = StreamingShewhart(filter_iqr=True)
+    chart.update(pd_ts)
+
+    new_points = pd.Series(
+        [100.0, 112.0, 70.0], index=pd.date_range("2023-02-01", periods=3, freq="T")
+    )
+    events = chart.update(new_points)
+
+    assert list(events["limit"]) == ["warning", "action"]
+    assert list(events["side"]) == ["upper", "lower"]
+    assert len(chart.events) >= 2
+    # the outlier is not used in the statistics
+    assert chart.count < 1000 + 3
+    assert len(chart.figure(None, "title", "x", "y", "label", "pound").fig.data) == 1
+
+
+def test_lazy_figure():
+    """Test the figure of Shewhart is lazy.
+
+    We test the limits are computed without building the figure.
+    """
+    pd_ts = make_series(1000)
+    chart = Shewhart(pd_ts, None, "title", "x", "y", "label", "pound")
+
+    assert chart._fig is None
+    assert np.isclose(chart.average, pd_ts.mean())
+    assert np.isclose(chart.std, pd_ts.std())
+    assert len(chart.fig.layout.shapes) == 5
+    assert chart._fig is not None
@@ -0,0 +1,85 @@
+import os
+import sys
+
+import pandas as pd
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from data.store import LocalStore  # noqa: E402
+
+
+def make_bars(start, periods):
+    index = pd.date_range(start, periods=periods, freq="D", tz="America/New_York")
+    return pd.DataFrame(
+        {"Open": range(periods), "Close": range(periods)}, index=index, dtype=float
+    )
+
+
+def test_load_empty(tmp_path):
+    """Test load on an empty store.
+
+    We test load and last_timestamp when nothing is saved.
+    """
+    store = LocalStore(tmp_path)
+
+    assert store.load("test", "1d") is None
+    assert store.last_timestamp("test", "1d") is None
+
+
+def test_append(tmp_path):
+    """Test append.
+
+    We test append keeps the newest version of a bar saved twice.
+    """
+    store = LocalStore(tmp_path)
+    store.append("test", "1d", make_bars("2023-01-01", 5))
+
+    new_bars = make_bars("2023-01-05", 3) + 100
+    store.append("test", "1d", new_bars)
+    data = store.load("test", "1d")
+
+    assert data.shape[0] == 7
+    assert data.index.is_monotonic_increasing
+    assert data.loc["2023-01-05", "Open"].item() == 100
+    assert store.last_timestamp("test", "1d") == new_bars.index.max()
+    assert store.load("test", "1m") is None
+
+
+def test_append_partitions(tmp_path):
+    """Test append with partitions.
+
+    We test append only writes the partitions of the new bars.
+    """
+    store = LocalStore(tmp_path)
+    store.append("test", "1m", make_bars("2023-01-01", 60))
+    partitions = store.partitions("test", "1m")
+    modified = {path: os.stat(path).st_mtime_ns for path in partitions}
+
+    store.append("test", "1m", make_bars("2023-03-01", 40) + 100)
+
+    assert [os.path.basename(path) for path in store.partitions("test", "1m")] == [
+        "2023-01.parquet",
+        "2023-02.parquet",
+        "2023-03.parquet",
+        "2023-04.parquet",
+    ]
+    assert os.stat(partitions[0]).st_mtime_ns == modified[partitions[0]]
+    data = store.load("test", "1m")
+    assert data.shape[0] == 99
+    assert data.index.is_unique and data.index.is_monotonic_increasing
+    assert data.loc["2023-03-01", "Open"].item() == 100
+
+
+def test_migrate(tmp_path):
+    """Test the previous layout of the store.
+
+    We test a store saved in one file per company is split in partitions.
+    """
+    bars = make_bars("2022-12-01", 100)
+    os.makedirs(os.path.join(tmp_path, "1d"))
+    bars.to_parquet(os.path.join(tmp_path, "1d", "test.parquet"))
+    store = LocalStore(tmp_path)
+
+    assert store.last_timestamp("test", "1d") == bars.index.max()
+    assert len(store.partitions("test", "1d")) == 2
+    assert store.load("test", "1d").equals(bars)
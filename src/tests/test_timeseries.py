@@ -0,0 +1,81 @@
+import os
+import sys
+
+import numpy as np
+import plotly.graph_objects as go
+
+# Add the parent directory of this file to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from plotting.ewma import Ewma  # noqa: E402
+from plotting.timeseries import (  # noqa: E402
+    TimeSeries,
+    lttb_positions,
+    minmax_positions,
+)
+
+
+def test_lttb_positions(make_series):
+    """Test lttb_positions.
+
+    We test the number of points kept, and that the first and last points are kept.
+    """
+    pd_ts = make_series(100000, start="2023-01-01", freq="T")
+    positions = lttb_positions(pd_ts.index.asi8.astype(float), pd_ts.to_numpy(), 1000)
+
+    assert len(positions) == 1000
+    assert positions[0] == 0 and positions[-1] == len(pd_ts) - 1
+    assert (np.diff(positions) > 0).all()
+
+
+def test_minmax_positions(make_series):
+    """Test minmax_positions.
+
+    We test the extrema of the series are kept, with at most the number of points asked.
+    """
+    pd_ts = make_series(100000, start="2023-01-01", freq="T")
+    positions = minmax_positions(pd_ts.to_numpy(), 1000)
+
+    assert len(positions) <= 1002
+    assert pd_ts.to_numpy().argmax() in positions
+    assert pd_ts.to_numpy().argmin() in positions
+    assert (np.diff(positions) > 0).all()
+
+
+def test_downsampling(make_series):
+    """Test the downsampling of the figure.
+
+    We test the traces are downsampled, with WebGL for large series, and the figure is smaller.
+    """
+    pd_ts = make_series(50000, start="2023-01-01", freq="T")
+    full = TimeSeries(pd_ts, None, "title", "x", "y", "label", "pound")
+    small = TimeSeries(pd_ts, None, "title", "x", "y", "label", "pound", max_points=500)
+
+    assert isinstance(full.fig.data[0], go.Scattergl)
+    assert isinstance(small.fig.data[0], go.Scatter)
+    assert len(small.fig.data[0].y) == 500
+    assert small.payload_size()["points_drawn"] == 500
+    assert small.payload_size()["bytes"] * 10 < full.payload_size()["bytes"]
+
+
+def test_downsampling_ewma(make_series):
+    """Test the downsampling of the EWMA controls.
+
+    We test the controls are drawn at the same positions as the EWMA, also after an update.
+    """
+    pd_ts = make_series(5000, start="2023-01-01", freq="H")
+    ewma = Ewma(
+        pd_ts.iloc[:4000],
+        None,
+        "title",
+        "x",
+        "y",
+        "label",
+        "pound",
+        max_points=300,
+        downsample="minmax",
+    )
+    assert len(ewma.fig.data[1].x) == len(ewma.fig.data[0].x)
+    ewma.update(pd_ts.iloc[4000:])
+
+    assert ewma.fig.data[0].x[-1] == pd_ts.index[-1]
+    assert len(ewma.fig.data[1].x) == len(ewma.fig.data[0].x) <= 302